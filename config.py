@@ -26,7 +26,21 @@ AI_CONFIG = {
     'model': 'deepseek-chat',
     'max_tokens': 2000,
     'temperature': 0.7,
-    'timeout': 30
+    'timeout': 30,
+    # 客户端限流（所有线程/工作者共享同一令牌桶）
+    'requests_per_minute': 60,
+    'tokens_per_minute': 120000,
+    'rate_limit_wait': 120,
+    'max_retries': 2,
+    # 分析数据部分的提示词token预算，超出时自动抽样压缩
+    'prompt_token_budget': 1500,
+    # 后台AI任务的工作线程数
+    'job_workers': 2,
+    # 结构化(JSON)响应校验失败时的重试次数
+    'structured_retries': 1,
+    # 令牌计费（元/千tokens），用于统计每份报告的成本
+    'prompt_token_price': 0.002,
+    'completion_token_price': 0.008
 }
 
 # 应用配置
@@ -36,7 +50,9 @@ APP_CONFIG = {
     'author': 'AI Development Team',
     'window_title': 'AI社交媒体营销分析系统',
     'window_size': (1200, 800),
-    'min_window_size': (800, 600)
+    'min_window_size': (800, 600),
+    # 显示登录界面后在后台线程预加载分析、绘图和报告模块
+    'startup_warm_up': True
 }
 
 # 界面配置
@@ -58,7 +74,47 @@ ANALYSIS_CONFIG = {
     'sentiment_sample_size': 1000,
     'wordcloud_width': 800,
     'wordcloud_height': 400,
-    'chart_dpi': 100
+    # 词云字体文件（为空时自动查找系统中文字体）
+    'wordcloud_font_path': None,
+    'chart_dpi': 100,
+    # 导出图表的分辨率及并行渲染进程数（None表示按CPU核数）
+    'chart_export_dpi': 300,
+    'chart_render_workers': None,
+    # 导出图表和报告图表的格式（svg/pdf为矢量图，png为位图）
+    'chart_export_format': 'svg',
+    'report_chart_format': 'svg',
+    # 批量报告的工作进程数（None表示CPU核数）
+    'batch_report_workers': None,
+    # PDF表格导出：中文字体（reportlab内置CID字体，无需字体文件）和单元格最多显示的字符数
+    'pdf_font': 'STSong-Light',
+    'pdf_max_cell_chars': 300,
+    # 自定义报告模板目录（其中的同名模板优先于assets/report_templates，为空时只用内置模板）
+    'report_template_dir': None,
+    # 长时间序列的降采样方法（lttb / minmax）
+    'downsample_method': 'lttb',
+    # 渲染图表磁盘缓存（temp/chart_cache）的大小上限
+    'chart_cache_max_mb': 200,
+    # 相关性热力图：分块列数、显著相关阈值和最多显示的字段数
+    'correlation_chunk_size': 256,
+    'correlation_threshold': 0.3,
+    'correlation_max_columns': 30
+}
+
+# 启动性能预算（毫秒），scripts/profile_startup.py 在全新进程中测量，超出时返回非零退出码
+STARTUP_BUDGET = {
+    # 从启动进程到登录界面、主界面显示完成
+    'login_window_ms': 1000,
+    'main_view_ms': 4000,
+    # 各模块的累计导入耗时（登录前导入的模块预算应保持很小）
+    'imports_ms': {
+        'controllers.main_controller': 150,
+        'views.login_view': 200,
+        'models.data_analyzer': 1000,
+        'models.report_generator': 1000,
+        'views.main_view': 1500,
+        'views.data_import_view': 1200,
+        'views.data_analysis_view': 1200
+    }
 }
 
 # 文件路径配置
@@ -68,6 +124,7 @@ PATHS = {
     'logs_dir': PROJECT_ROOT / 'logs',
     'temp_dir': PROJECT_ROOT / 'temp',
     'sample_data': PROJECT_ROOT / 'assets' / 'sample_data.csv',
+    'report_templates': PROJECT_ROOT / 'assets' / 'report_templates',
     'database': PROJECT_ROOT / 'assets' / 'social_media_analysis.db'
 }
 
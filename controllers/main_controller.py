@@ -1,37 +1,52 @@
 from views.login_view import LoginView
 from views.register_view import RegisterView
-from views.main_view import MainView
-from views.data_import_view import DataImportView
-from views.data_analysis_view import DataAnalysisView
-from views.marketing_strategy_view import MarketingStrategyView
-from views.trend_prediction_view import TrendPredictionView
-from views.content_optimization_view import ContentOptimizationView
-from views.report_management_view import ReportManagementView
-from views.system_settings_view import SystemSettingsView
 from models.database import DatabaseManager
-from models.social_media_data import SocialMediaData
-from models.deepseek_api import DeepSeekAPI
-from models.report_generator import ReportGenerator
+from models.job_queue import AIJobQueue
 import hashlib
 import json
 import time
 import os
+import threading
+import importlib
 from datetime import datetime
+from functools import cached_property
 import sys
-import pandas as pd
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QMessageBox, QFileDialog, 
                              QInputDialog, QProgressDialog, QVBoxLayout, QHBoxLayout,
                              QWidget, QLabel, QPushButton, QTextEdit, QTabWidget,
                              QScrollArea, QFrame, QSplitter, QGroupBox, QGridLayout,
-                             QTableWidgetItem)
-from PyQt6.QtCore import Qt, QTimer, QThread, pyqtSignal
-from PyQt6.QtGui import QFont, QPixmap, QIcon
-from models.data_analyzer import DataAnalyzer
-import matplotlib.pyplot as plt
-import numpy as np
+                             QTableWidgetItem, QSizePolicy)
+from PyQt6.QtCore import Qt, QTimer, QThread, QObject, pyqtSignal
+from PyQt6.QtGui import QFont, QPixmap, QIcon, QTextCursor
+from config import ANALYSIS_CONFIG, APP_CONFIG
+
+# 主界面、数据分析、绘图和报告相关的模块在第一次使用时才导入，登录界面无需等待它们加载；
+# 显示登录界面后由后台线程预先导入以下模块（不含需要在主线程创建界面的模块）
+WARM_UP_MODULES = [
+    'pandas',
+    'numpy',
+    'requests',
+    'models.social_media_data',
+    'models.deepseek_api',
+    'models.data_analyzer',
+    'models.report_generator',
+    'models.chart_renderer'
+]
+
+
+def warm_up_modules(modules=WARM_UP_MODULES):
+    """在后台线程中依次导入模块（导入失败不影响启动，使用时再报告错误）"""
+    for module in modules:
+        try:
+            importlib.import_module(module)
+        except Exception as e:
+            print(f"预加载模块失败: {module}: {e}")
 
 def convert_pandas_types(obj):
     """将pandas数据类型转换为JSON可序列化的类型"""
+    import numpy as np
+    import pandas as pd
+    
     if isinstance(obj, np.ndarray):
         return obj.tolist()
     elif isinstance(obj, (pd.Timestamp, pd.DatetimeTZDtype)):
@@ -51,18 +66,42 @@ def convert_pandas_types(obj):
 
 class MainController:
     def __init__(self):
-        self.app = QApplication(sys.argv)
+        self.app = QApplication.instance() or QApplication(sys.argv)
         self.current_user = None
         self.db = DatabaseManager()
-        self.social_media_data = SocialMediaData()
-        self.api = DeepSeekAPI("sk-dfc4e38245414faf8290bb291db1a35e")
-        self.data_analyzer = DataAnalyzer()
+        
+        # 后台AI任务队列，完成事件通过Qt信号切回主线程
+        self.job_signals = AIJobSignals()
+        self.job_signals.job_finished.connect(self.on_ai_job_finished)
+        self.job_queue = AIJobQueue(self.db, self._create_job_api)
+        self.job_queue.subscribe(self.job_signals.job_finished.emit)
+        self.job_queue.start()
         
         # 设置应用程序样式
         self.app.setStyle('Fusion')
         
-        # 显示登录界面
+        # 显示登录界面，随后在后台预加载分析和报告模块
         self.show_login_view()
+        if APP_CONFIG.get('startup_warm_up', True):
+            threading.Thread(target=warm_up_modules, name="warm-up", daemon=True).start()
+        
+    @cached_property
+    def social_media_data(self):
+        """数据处理（第一次使用时创建）"""
+        from models.social_media_data import SocialMediaData
+        return SocialMediaData()
+    
+    @cached_property
+    def api(self):
+        """DeepSeek API客户端（第一次使用时创建，保存设置时整体替换）"""
+        from models.deepseek_api import DeepSeekAPI
+        return DeepSeekAPI("sk-dfc4e38245414faf8290bb291db1a35e")
+    
+    @cached_property
+    def data_analyzer(self):
+        """数据分析器（第一次使用时创建）"""
+        from models.data_analyzer import DataAnalyzer
+        return DataAnalyzer()
         
     def show_login_view(self):
         """显示登录界面"""
@@ -87,6 +126,11 @@ class MainController:
             
     def show_main_view(self):
         """显示主界面"""
+        from views.main_view import MainView
+        from models.chart_backend import apply_style
+        
+        # 仪表板画布与导出图表使用同一套样式
+        apply_style()
         self.main_view = MainView(self)
         
         # 连接信号
@@ -122,8 +166,12 @@ class MainController:
             
         self.main_view.show()
         
+        # 处理后台已完成但尚未展示的AI任务
+        self.deliver_pending_ai_jobs()
+        
     def show_marketing_strategy_view(self):
         """显示营销策略界面"""
+        from views.marketing_strategy_view import MarketingStrategyView
         self.marketing_strategy_view = MarketingStrategyView(self.main_view)
         
         # 连接信号
@@ -135,6 +183,7 @@ class MainController:
         
     def show_trend_prediction_view(self):
         """显示趋势预测界面"""
+        from views.trend_prediction_view import TrendPredictionView
         self.trend_prediction_view = TrendPredictionView(self.main_view)
         
         # 连接信号
@@ -145,6 +194,7 @@ class MainController:
         
     def show_content_optimization_view(self):
         """显示内容优化界面"""
+        from views.content_optimization_view import ContentOptimizationView
         self.content_optimization_view = ContentOptimizationView(self.main_view)
         
         # 连接信号
@@ -155,16 +205,19 @@ class MainController:
         
     def show_report_management_view(self):
         """显示报告管理界面"""
+        from views.report_management_view import ReportManagementView
         self.report_management_view = ReportManagementView(self.main_view)
         
         # 连接信号
         self.report_management_view.report_generated_signal.connect(self.generate_report)
         self.report_management_view.report_exported_signal.connect(self.export_report_file)
         
+        self.report_management_view.set_token_costs(self.get_token_cost_summary())
         self.report_management_view.show()
         
     def show_system_settings_view(self):
         """显示系统设置界面"""
+        from views.system_settings_view import SystemSettingsView
         self.system_settings_view = SystemSettingsView(self.main_view)
         
         # 连接信号
@@ -181,6 +234,8 @@ class MainController:
         user = self.db.get_user(username, hashed_password)
         if user:
             self.current_user = user
+            # 记录该用户的AI token用量
+            self.api.set_usage_context(self.db, user[0])
             return True, "登录成功"
         else:
             return False, "用户名或密码错误"
@@ -369,38 +424,31 @@ class MainController:
         except Exception as e:
             print(f"更新仪表盘图表失败: {e}")
     
+    def _dashboard_charts(self):
+        """获取仪表盘图表管理器（主界面重建后重新绑定画布）"""
+        from models.chart_manager import DashboardChartManager
+        
+        trends_canvas = getattr(self.main_view, 'trends_chart', None)
+        platform_canvas = getattr(self.main_view, 'platform_chart', None)
+        if trends_canvas is None or platform_canvas is None:
+            return None
+        
+        manager = getattr(self, 'dashboard_chart_manager', None)
+        if manager is None or not manager.owns(trends_canvas, platform_canvas):
+            if manager is not None:
+                manager.close()
+            manager = DashboardChartManager(trends_canvas, platform_canvas)
+            self.dashboard_chart_manager = manager
+        return manager
+    
     def create_empty_dashboard_charts(self):
         """创建空的仪表盘图表"""
         if not hasattr(self, 'main_view'):
             return
-            
-        # 创建空的趋势图表
-        fig, ax = plt.subplots(figsize=(6, 4))
-        ax.text(0.5, 0.5, '暂无数据', ha='center', va='center', transform=ax.transAxes, fontsize=14)
-        ax.set_title('粉丝增长趋势')
-        ax.set_xlim(0, 1)
-        ax.set_ylim(0, 1)
-        ax.axis('off')
-        
-        # 清除旧图表并添加新图表
-        if hasattr(self.main_view, 'trends_chart'):
-            self.main_view.trends_chart.figure.clear()
-            self.main_view.trends_chart.figure = fig
-            self.main_view.trends_chart.draw()
-        
-        # 创建空的平台分布图表
-        fig2, ax2 = plt.subplots(figsize=(6, 4))
-        ax2.text(0.5, 0.5, '暂无数据', ha='center', va='center', transform=ax2.transAxes, fontsize=14)
-        ax2.set_title('平台分布')
-        ax2.set_xlim(0, 1)
-        ax2.set_ylim(0, 1)
-        ax2.axis('off')
-        
-        # 清除旧图表并添加新图表
-        if hasattr(self.main_view, 'platform_chart'):
-            self.main_view.platform_chart.figure.clear()
-            self.main_view.platform_chart.figure = fig2
-            self.main_view.platform_chart.draw()
+        
+        manager = self._dashboard_charts()
+        if manager:
+            manager.show_empty()
     
     def create_trends_chart(self, data_imports):
         """创建趋势图表"""
@@ -420,24 +468,10 @@ class MainController:
                 self.create_empty_dashboard_charts()
                 return
             
-            # 创建趋势图表
-            fig, ax = plt.subplots(figsize=(6, 4))
-            
-            dates = list(date_counts.keys())
-            counts = list(date_counts.values())
-            
-            ax.plot(dates, counts, marker='o', linewidth=2, markersize=6)
-            ax.set_title('数据导入趋势')
-            ax.set_xlabel('日期')
-            ax.set_ylabel('导入次数')
-            ax.tick_params(axis='x', rotation=45)
-            ax.grid(True, alpha=0.3)
-            
-            # 清除旧图表并添加新图表
-            if hasattr(self.main_view, 'trends_chart'):
-                self.main_view.trends_chart.figure.clear()
-                self.main_view.trends_chart.figure = fig
-                self.main_view.trends_chart.draw()
+            # 原地更新趋势图数据
+            manager = self._dashboard_charts()
+            if manager:
+                manager.update_trends(list(date_counts.keys()), list(date_counts.values()))
                 
         except Exception as e:
             print(f"创建趋势图表失败: {e}")
@@ -459,23 +493,10 @@ class MainController:
                 self.create_empty_dashboard_charts()
                 return
             
-            # 创建平台分布图表
-            fig, ax = plt.subplots(figsize=(6, 4))
-            
-            platforms = list(platform_counts.keys())
-            counts = list(platform_counts.values())
-            
-            # 使用饼图显示平台分布
-            colors = plt.cm.Set3(np.linspace(0, 1, len(platforms)))
-            wedges, texts, autotexts = ax.pie(counts, labels=platforms, autopct='%1.1f%%', 
-                                             colors=colors, startangle=90)
-            ax.set_title('平台数据分布')
-            
-            # 清除旧图表并添加新图表
-            if hasattr(self.main_view, 'platform_chart'):
-                self.main_view.platform_chart.figure.clear()
-                self.main_view.platform_chart.figure = fig
-                self.main_view.platform_chart.draw()
+            # 原地更新平台分布图数据
+            manager = self._dashboard_charts()
+            if manager:
+                manager.update_platforms(list(platform_counts.keys()), list(platform_counts.values()))
                 
         except Exception as e:
             print(f"创建平台分布图表失败: {e}")
@@ -611,10 +632,15 @@ class MainController:
         
     def create_and_display_charts(self, df, platform):
         """创建并显示图表"""
+        from views.chart_image_widget import ChartImageWidget
+        from views.lazy_chart_loader import LazyChartLoader
+        
         if not hasattr(self, 'main_view'):
             return
             
         # 清除现有的图表
+        if hasattr(self, 'chart_loader'):
+            self.chart_loader.reset()
         if hasattr(self.main_view, 'chart_layout'):
             # 清除现有图表
             while self.main_view.chart_layout.count():
@@ -634,81 +660,39 @@ class MainController:
             if hasattr(self.main_view, 'analysis_tab_layout'):
                 self.main_view.analysis_tab_layout.addWidget(self.main_view.chart_scroll_area)
         
+        # 图表滚动到视口附近才在后台渲染，远离视口后释放位图
+        if not hasattr(self, 'chart_loader'):
+            self.chart_loader = LazyChartLoader(self.main_view.chart_scroll_area, self.data_analyzer.render_chart)
+        
         try:
-            # 创建综合仪表板
-            dashboard_fig = self.data_analyzer.create_summary_dashboard(df, platform)
-            dashboard_canvas = self.data_analyzer.get_chart_canvas(dashboard_fig)
-            
-            # 创建标题标签
-            dashboard_label = QLabel("综合数据分析仪表板")
-            dashboard_label.setFont(QFont("Arial", 14, QFont.Weight.Bold))
-            dashboard_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            dashboard_label.setStyleSheet("color: #2c3e50; margin: 10px;")
-            
-            self.main_view.chart_layout.addWidget(dashboard_label)
-            self.main_view.chart_layout.addWidget(dashboard_canvas)
-            
-            # 创建互动量趋势图
-            trend_fig = self.data_analyzer.create_engagement_trend_chart(df, platform)
-            trend_canvas = self.data_analyzer.get_chart_canvas(trend_fig)
-            
-            trend_label = QLabel("互动量趋势分析")
-            trend_label.setFont(QFont("Arial", 12, QFont.Weight.Bold))
-            trend_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            trend_label.setStyleSheet("color: #34495e; margin: 10px;")
-            
-            self.main_view.chart_layout.addWidget(trend_label)
-            self.main_view.chart_layout.addWidget(trend_canvas)
-            
-            # 创建平台对比图
-            if df['platform'].nunique() > 1:
-                comparison_fig = self.data_analyzer.create_platform_comparison_chart(df)
-                comparison_canvas = self.data_analyzer.get_chart_canvas(comparison_fig)
-                
-                comparison_label = QLabel("平台对比分析")
-                comparison_label.setFont(QFont("Arial", 12, QFont.Weight.Bold))
-                comparison_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                comparison_label.setStyleSheet("color: #34495e; margin: 10px;")
-                
-                self.main_view.chart_layout.addWidget(comparison_label)
-                self.main_view.chart_layout.addWidget(comparison_canvas)
-            
-            # 创建情感分析图
-            sentiment_fig = self.data_analyzer.create_sentiment_analysis_chart(df)
-            sentiment_canvas = self.data_analyzer.get_chart_canvas(sentiment_fig)
-            
-            sentiment_label = QLabel("情感分析")
-            sentiment_label.setFont(QFont("Arial", 12, QFont.Weight.Bold))
-            sentiment_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            sentiment_label.setStyleSheet("color: #34495e; margin: 10px;")
+            # 所有图表共用同一个聚合立方体
+            cube = self.data_analyzer.get_cube(df)
             
-            self.main_view.chart_layout.addWidget(sentiment_label)
-            self.main_view.chart_layout.addWidget(sentiment_canvas)
-            
-            # 创建内容类型分析图
-            content_fig = self.data_analyzer.create_content_type_analysis_chart(df)
-            content_canvas = self.data_analyzer.get_chart_canvas(content_fig)
-            
-            content_label = QLabel("内容类型分析")
-            content_label.setFont(QFont("Arial", 12, QFont.Weight.Bold))
-            content_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            content_label.setStyleSheet("color: #34495e; margin: 10px;")
-            
-            self.main_view.chart_layout.addWidget(content_label)
-            self.main_view.chart_layout.addWidget(content_canvas)
-            
-            # 创建相关性热力图
-            correlation_fig = self.data_analyzer.create_correlation_heatmap(df)
-            if correlation_fig:
-                correlation_canvas = self.data_analyzer.get_chart_canvas(correlation_fig)
-                
-                correlation_label = QLabel("数值字段相关性分析")
-                correlation_label.setFont(QFont("Arial", 12, QFont.Weight.Bold))
-                correlation_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                correlation_label.setStyleSheet("color: #34495e; margin: 10px;")
+            # (标题, 字号, 颜色, 图表方法, 参数, 占位高宽比)
+            charts = [
+                ("综合数据分析仪表板", 14, "#2c3e50", "create_summary_dashboard", (cube, platform), 0.75),
+                ("互动量趋势分析", 12, "#34495e", "create_engagement_trend_chart", (cube, platform), 0.6)
+            ]
+            if cube.nunique('platform') > 1:
+                charts.append(("平台对比分析", 12, "#34495e", "create_platform_comparison_chart", (cube,), 0.4))
+            charts.append(("情感分析", 12, "#34495e", "create_sentiment_analysis_chart", (cube,), 0.4))
+            charts.append(("内容类型分析", 12, "#34495e", "create_content_type_analysis_chart", (cube,), 0.4))
+            
+            # 相关系数矩阵在渲染线程中计算，这里只检查数值列数量
+            if sum(dtype.kind in 'iuf' for dtype in df.dtypes) >= 2:
+                charts.append(("数值字段相关性分析", 12, "#34495e", "create_correlation_heatmap", (df,), 0.75))
+            
+            for title, font_size, color, builder, args, aspect in charts:
+                label = QLabel(title)
+                label.setFont(QFont("Arial", font_size, QFont.Weight.Bold))
+                label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+                label.setStyleSheet(f"color: {color}; margin: 10px;")
                 
-                self.main_view.chart_layout.addWidget(correlation_label)
-                self.main_view.chart_layout.addWidget(correlation_canvas)
+                # 先放置占位控件，图片由chart_loader按需渲染（命中缓存时直接读取）
+                chart_widget = ChartImageWidget(aspect=aspect)
+                self.main_view.chart_layout.addWidget(label)
+                self.main_view.chart_layout.addWidget(chart_widget)
+                self.chart_loader.add_chart(chart_widget, builder, args)
             
             # 添加保存图表按钮
             save_charts_button = QPushButton("保存所有图表")
@@ -731,7 +715,7 @@ class MainController:
             
             # 添加弹性空间
             spacer = QWidget()
-            spacer.setSizePolicy(QWidget.SizePolicy.Expanding, QWidget.SizePolicy.Expanding)
+            spacer.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
             self.main_view.chart_layout.addWidget(spacer)
             
         except Exception as e:
@@ -741,6 +725,9 @@ class MainController:
             
     def save_all_charts(self, df, platform):
         """保存所有图表"""
+        import pandas as pd
+        from models.chart_renderer import ChartTask
+        
         try:
             # 选择保存目录
             save_dir = QFileDialog.getExistingDirectory(
@@ -755,32 +742,35 @@ class MainController:
             # 生成时间戳
             timestamp = pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")
             
-            # 保存各种图表
-            charts_to_save = [
-                ("综合仪表板", self.data_analyzer.create_summary_dashboard(df, platform)),
-                ("互动量趋势", self.data_analyzer.create_engagement_trend_chart(df, platform)),
-                ("平台对比", self.data_analyzer.create_platform_comparison_chart(df)),
-                ("情感分析", self.data_analyzer.create_sentiment_analysis_chart(df)),
-                ("内容类型分析", self.data_analyzer.create_content_type_analysis_chart(df))
+            # 工作进程只接收聚合立方体和相关系数矩阵，不传递原始数据
+            cube = self.data_analyzer.get_cube(df)
+            chart_args = [
+                ("综合仪表板", "create_summary_dashboard", (cube, platform)),
+                ("互动量趋势", "create_engagement_trend_chart", (cube, platform)),
+                ("平台对比", "create_platform_comparison_chart", (cube,)),
+                ("情感分析", "create_sentiment_analysis_chart", (cube,)),
+                ("内容类型分析", "create_content_type_analysis_chart", (cube,))
             ]
             
             # 添加相关性热力图
-            correlation_fig = self.data_analyzer.create_correlation_heatmap(df)
-            if correlation_fig:
-                charts_to_save.append(("相关性热力图", correlation_fig))
-            
-            saved_count = 0
-            for chart_name, fig in charts_to_save:
-                file_path = f"{save_dir}/{platform}_{chart_name}_{timestamp}.png"
-                if self.data_analyzer.save_chart(fig, file_path):
-                    saved_count += 1
-                plt.close(fig)  # 关闭图表释放内存
+            correlation_matrix = self.data_analyzer.correlation_matrix(df)
+            if correlation_matrix is not None:
+                chart_args.append(("相关性热力图", "plot_correlation_heatmap", (correlation_matrix,)))
+            
+            # 默认导出矢量图，体积小且打印清晰
+            export_format = ANALYSIS_CONFIG.get('chart_export_format', 'svg')
+            tasks = [
+                ChartTask(chart_name, builder, args, f"{save_dir}/{platform}_{chart_name}_{timestamp}.{export_format}")
+                for chart_name, builder, args in chart_args
+            ]
             
-            QMessageBox.information(
-                self.main_view, 
-                "保存成功", 
-                f"成功保存 {saved_count} 个图表到 {save_dir}"
+            # 在后台线程中驱动进程池渲染，界面保持响应
+            self.chart_export_thread = ChartExportThread(tasks)
+            self.chart_export_thread.finished_signal.connect(
+                lambda results: self._on_charts_saved(results, save_dir)
             )
+            self.chart_export_thread.start()
+            self.main_view.statusBar().showMessage(f"正在后台导出 {len(tasks)} 个图表...")
             
         except Exception as e:
             QMessageBox.critical(
@@ -789,8 +779,30 @@ class MainController:
                 f"保存图表时出错: {str(e)}"
             )
         
+    def _on_charts_saved(self, results, save_dir):
+        """图表导出完成"""
+        saved_count = sum(1 for _, file_path, error in results if file_path and not error)
+        errors = [f"{name}: {error}" for name, _, error in results if error]
+        self.main_view.statusBar().clearMessage()
+        
+        if errors:
+            QMessageBox.warning(
+                self.main_view, 
+                "部分图表保存失败", 
+                f"成功保存 {saved_count} 个图表到 {save_dir}\n\n失败:\n" + "\n".join(errors)
+            )
+        else:
+            QMessageBox.information(
+                self.main_view, 
+                "保存成功", 
+                f"成功保存 {saved_count} 个图表到 {save_dir}"
+            )
+        
     def generate_marketing_plan(self):
         """生成营销方案"""
+        import pandas as pd
+        from models.prompt_builder import PromptBuilder
+        
         if not hasattr(self, 'main_view'):
             return
             
@@ -825,29 +837,16 @@ class MainController:
             result_id, result_type, result_data, created_at = result
             analysis_data[result_type] = json.loads(result_data)
             
-        # 准备AI分析数据
-        ai_data = f"平台: {platform}\n"
-        ai_data += f"数据名称: {data_name}\n"
-        ai_data += f"分析时间: {latest_task[4]}\n\n"
-        
-        # 添加基本统计
-        if 'overview' in analysis_data:
-            ai_data += "基本统计:\n"
-            for key, value in analysis_data['overview'].items():
-                ai_data += f"- {key}: {value}\n"
-            ai_data += "\n"
-        # 添加增长分析
-        if 'growth' in analysis_data:
-            ai_data += "增长分析:\n"
-            for key, value in analysis_data['growth'].items():
-                ai_data += f"- {key}: {value}\n"
-            ai_data += "\n"
-        # 添加相关性分析
-        if 'correlation' in analysis_data:
-            ai_data += "相关性分析:\n"
-            for key, value in analysis_data['correlation'].items():
-                ai_data += f"- {key}: {value}\n"
-            ai_data += "\n"
+        # 准备AI分析数据（超出token预算时自动压缩大块数据）
+        prompt_builder = PromptBuilder()
+        prompt_builder.add_line(f"平台: {platform}")
+        prompt_builder.add_line(f"数据名称: {data_name}")
+        prompt_builder.add_line(f"分析时间: {latest_task[4]}")
+        prompt_builder.add_section("基本统计", analysis_data.get('overview'))
+        prompt_builder.add_section("增长分析", analysis_data.get('growth'))
+        prompt_builder.add_section("相关性分析", analysis_data.get('correlation'))
+        prompt_builder.add_section("趋势分析", analysis_data.get('trends'))
+        ai_data, prompt_stats = prompt_builder.build()
             
         # 获取方案名称
         plan_name, ok = QInputDialog.getText(
@@ -859,110 +858,29 @@ class MainController:
         if not ok or not plan_name:
             return
             
-        # 创建进度对话框
-        progress_dialog = QMessageBox(self.main_view)
-        progress_dialog.setWindowTitle("生成营销方案")
-        progress_dialog.setText(f"正在基于 {platform} 平台数据分析生成营销方案...\n请稍候，这可能需要几分钟时间。")
-        progress_dialog.setStandardButtons(QMessageBox.StandardButton.NoButton)
-        progress_dialog.setIcon(QMessageBox.Icon.Information)
-        
-        # 设置对话框样式
-        progress_dialog.setStyleSheet("""
-            QMessageBox {
-                background-color: #f8f9fa;
-                border: 2px solid #0071e3;
-                border-radius: 10px;
-                padding: 20px;
-            }
-            QMessageBox QLabel {
-                color: #2c3e50;
-                font-size: 14px;
-                font-weight: bold;
-                padding: 10px;
-            }
-        """)
+        # 提交到后台任务队列，完成后由 on_ai_job_finished 处理
+        self.job_queue.submit(
+            self.current_user[0],
+            'marketing_plan',
+            {'analysis_data': ai_data, 'plan_name': plan_name, 'platform': platform},
+            task_id=task_id
+        )
         
-        progress_dialog.show()
+        status_text = f"正在后台基于 {platform} 平台数据分析生成营销方案「{plan_name}」，完成后将自动通知"
+        if prompt_stats['saved_tokens'] > 0:
+            status_text += f"（分析数据已压缩，节省约 {prompt_stats['saved_tokens']} tokens）"
+        self.main_view.statusBar().showMessage(status_text)
         
-        # 强制处理事件
-        self.main_view.app.processEvents()
+    def _finish_marketing_plan_job(self, task_id, payload, status, result):
+        """营销方案任务完成后保存并展示方案"""
+        plan_name = payload.get('plan_name', '营销方案')
         
-        # 调用API生成营销方案
-        try:
-            # 显示生成进度
-            progress_dialog.setText("正在分析数据特征...")
-            self.main_view.app.processEvents()
-            
-            # 调用API
-            plan_content = self.api.generate_marketing_plan(ai_data)
-            
-            # 检查API响应
-            if plan_content.startswith("错误："):
-                progress_dialog.close()
-                QMessageBox.critical(self.main_view, "生成失败", plan_content)
-                return
-            
-            # 保存营销方案
-            progress_dialog.setText("正在保存营销方案...")
-            self.main_view.app.processEvents()
-            
-            plan_id = self.db.add_marketing_plan(
-                self.current_user[0],
-                task_id,
-                plan_name,
-                plan_content
-            )
-            
-            progress_dialog.close()
-            
-            # 显示成功消息
-            success_dialog = QMessageBox(self.main_view)
-            success_dialog.setWindowTitle("生成成功")
-            success_dialog.setText(f"营销方案 '{plan_name}' 已成功生成！")
-            success_dialog.setInformativeText("方案已保存到您的营销方案列表中，您可以查看、编辑或导出该方案。")
-            success_dialog.setStandardButtons(QMessageBox.StandardButton.Ok)
-            success_dialog.setIcon(QMessageBox.Icon.Information)
-            
-            # 设置成功对话框样式
-            success_dialog.setStyleSheet("""
-                QMessageBox {
-                    background-color: #d4edda;
-                    border: 2px solid #28a745;
-                    border-radius: 10px;
-                    padding: 20px;
-                }
-                QMessageBox QLabel {
-                    color: #155724;
-                    font-size: 14px;
-                    font-weight: bold;
-                    padding: 10px;
-                }
-            """)
-            
-            success_dialog.exec()
-            
-            # 刷新营销方案列表
-            self.load_marketing_plans()
-            
-            # 自动切换到营销方案标签页并显示新生成的方案
-            self.main_view.tabs.setCurrentIndex(2)  # 假设营销方案是第3个标签页
-            if plan_id:
-                # 找到并选中新生成的方案
-                for i in range(self.main_view.plans_list.count()):
-                    item = self.main_view.plans_list.item(i)
-                    if plan_name in item.text():
-                        self.main_view.plans_list.setCurrentItem(item)
-                        self.load_marketing_plan(plan_id)
-                        break
-            
-        except Exception as e:
-            progress_dialog.close()
-            
+        if status != 'completed' or result.startswith("错误："):
             # 显示详细错误信息
             error_dialog = QMessageBox(self.main_view)
             error_dialog.setWindowTitle("生成失败")
             error_dialog.setText("生成营销方案时出现错误")
-            error_dialog.setInformativeText(f"错误详情: {str(e)}")
+            error_dialog.setInformativeText(f"错误详情: {result}")
             error_dialog.setDetailedText(f"""
 可能的解决方案:
 1. 检查网络连接是否正常
@@ -991,6 +909,57 @@ class MainController:
             """)
             
             error_dialog.exec()
+            return
+        
+        # 保存营销方案
+        plan_id = self.db.add_marketing_plan(
+            self.current_user[0],
+            task_id,
+            plan_name,
+            result
+        )
+        
+        self.main_view.statusBar().showMessage(f"营销方案「{plan_name}」已生成", 5000)
+        
+        # 显示成功消息
+        success_dialog = QMessageBox(self.main_view)
+        success_dialog.setWindowTitle("生成成功")
+        success_dialog.setText(f"营销方案 '{plan_name}' 已成功生成！")
+        success_dialog.setInformativeText("方案已保存到您的营销方案列表中，您可以查看、编辑或导出该方案。")
+        success_dialog.setStandardButtons(QMessageBox.StandardButton.Ok)
+        success_dialog.setIcon(QMessageBox.Icon.Information)
+        
+        # 设置成功对话框样式
+        success_dialog.setStyleSheet("""
+            QMessageBox {
+                background-color: #d4edda;
+                border: 2px solid #28a745;
+                border-radius: 10px;
+                padding: 20px;
+            }
+            QMessageBox QLabel {
+                color: #155724;
+                font-size: 14px;
+                font-weight: bold;
+                padding: 10px;
+            }
+        """)
+        
+        success_dialog.exec()
+        
+        # 刷新营销方案列表
+        self.load_marketing_plans()
+        
+        # 自动切换到营销方案标签页并显示新生成的方案
+        self.main_view.tabs.setCurrentIndex(2)  # 假设营销方案是第3个标签页
+        if plan_id:
+            # 找到并选中新生成的方案
+            for i in range(self.main_view.plans_list.count()):
+                item = self.main_view.plans_list.item(i)
+                if plan_name in item.text():
+                    self.main_view.plans_list.setCurrentItem(item)
+                    self.load_marketing_plan(plan_id)
+                    break
             
     def load_marketing_plan(self, plan_id):
         """加载营销方案"""
@@ -1032,25 +1001,19 @@ class MainController:
         请以结构化的方式呈现，语言简洁明了，可操作性强。
         """
         
-        # 显示进度对话框
-        progress_dialog = QMessageBox(self.main_view)
-        progress_dialog.setWindowTitle("预测中")
-        progress_dialog.setText(f"正在预测{time_range}内{platform}平台的{prediction_type}趋势，请稍候...")
-        progress_dialog.setStandardButtons(QMessageBox.StandardButton.NoButton)
-        progress_dialog.show()
+        # 提交到后台任务队列
+        self.job_queue.submit(self.current_user[0], 'trend_prediction', {'prompt': prompt})
+        self.main_view.trend_results.setText(f"正在后台预测{time_range}内{platform}平台的{prediction_type}趋势，请稍候...")
         
-        # 调用API预测趋势
-        try:
-            trend_prediction = self.api.predict_trends(prompt)
-            
-            progress_dialog.close()
-            
-            # 显示预测结果
-            self.main_view.trend_results.setText(trend_prediction)
-            
-        except Exception as e:
-            progress_dialog.close()
-            QMessageBox.critical(self.main_view, "预测失败", f"预测趋势时出错: {str(e)}")
+    def _finish_trend_prediction_job(self, status, result):
+        """趋势预测任务完成后显示结果"""
+        if status != 'completed':
+            self.main_view.trend_results.clear()
+            QMessageBox.critical(self.main_view, "预测失败", f"预测趋势时出错: {result}")
+            return
+        
+        # 显示预测结果
+        self.main_view.trend_results.setText(result)
             
     def optimize_content(self):
         """优化内容"""
@@ -1083,48 +1046,85 @@ class MainController:
         请以结构化的方式呈现，语言简洁明了，可操作性强。
         """
         
-        # 显示进度对话框
-        progress_dialog = QMessageBox(self.main_view)
-        progress_dialog.setWindowTitle("优化中")
-        progress_dialog.setText(f"正在优化{content_type}内容，请稍候...")
-        progress_dialog.setStandardButtons(QMessageBox.StandardButton.NoButton)
-        progress_dialog.show()
+        # 提交到后台任务队列
+        self.job_queue.submit(self.current_user[0], 'content_optimization',
+                              {'content': prompt, 'platform': platform})
+        self.main_view.optimized_content.setText(f"正在后台优化{content_type}内容，请稍候...")
+        self.main_view.suggestions_content.clear()
+        
+    def _finish_content_optimization_job(self, status, result):
+        """内容优化任务完成后解析并显示结果"""
+        from models.structured_output import parse_record
+        
+        if status != 'completed':
+            self.main_view.optimized_content.clear()
+            QMessageBox.critical(self.main_view, "优化失败", f"优化内容时出错: {result}")
+            return
         
-        # 调用API优化内容
         try:
-            optimized_content = self.api.optimize_content(prompt, platform)
-            
-            progress_dialog.close()
+            record = parse_record('content_optimization', result)
+        except ValueError:
+            # 兼容升级前以纯文本保存的任务结果
+            self.main_view.optimized_content.setText(result)
+            self.main_view.suggestions_content.setText("无法解析详细建议，请查看优化后的内容。")
+            return
+        
+        suggestions = []
+        if record.publish_time:
+            suggestions.append(f"发布时间建议：{record.publish_time}")
+        if record.hashtags:
+            suggestions.append("标签建议：" + " ".join(f"#{tag.lstrip('#')}" for tag in record.hashtags))
+        if record.visual_elements:
+            suggestions.append("视觉元素建议：\n" + "\n".join(f"- {item}" for item in record.visual_elements))
+        if record.expected_improvement:
+            suggestions.append(f"预期效果：{record.expected_improvement}")
+        
+        self.main_view.optimized_content.setText(record.optimized_content)
+        self.main_view.suggestions_content.setText("\n\n".join(suggestions))
+        
+    def on_ai_job_finished(self, job_id, job_type, status, result):
+        """后台AI任务完成（在主线程中调用）"""
+        if not self.current_user or not hasattr(self, 'main_view'):
+            # 未登录时保留结果，下次进入主界面时再处理
+            return
+        
+        job = self.db.get_ai_job(job_id)
+        if not job or job[1] != self.current_user[0]:
+            return
+        
+        self._deliver_ai_job(job)
+        
+    def deliver_pending_ai_jobs(self):
+        """处理上次退出或未登录期间完成的AI任务"""
+        for job in self.db.get_undelivered_ai_jobs(self.current_user[0]):
+            self._deliver_ai_job(job)
+        
+    def _deliver_ai_job(self, job):
+        """将任务结果分发到对应的界面"""
+        job_id, user_id, task_id, job_type, payload, status, result, error, created_at = job
+        
+        # 先认领，完成信号与登录补发同时到达时只处理一次
+        if not self.db.mark_ai_job_delivered(job_id):
+            return
+        
+        output = result if status == 'completed' else (error or "未知错误")
+        if job_type == 'marketing_plan':
+            self._finish_marketing_plan_job(task_id, json.loads(payload), status, output)
+        elif job_type == 'trend_prediction':
+            self._finish_trend_prediction_job(status, output)
+        elif job_type == 'content_optimization':
+            self._finish_content_optimization_job(status, output)
             
-            # 解析优化结果
-            try:
-                # 假设API返回的是结构化文本，尝试解析
-                sections = optimized_content.split('\n\n')
-                
-                optimized_text = ""
-                suggestions = ""
-                
-                for section in sections:
-                    if section.startswith("1."):
-                        optimized_text += section[3:].strip() + "\n\n"
-                    elif section.startswith("2.") or section.startswith("3.") or section.startswith("4.") or section.startswith("5."):
-                        suggestions += section + "\n\n"
-                
-                # 显示优化结果
-                self.main_view.optimized_content.setText(optimized_text)
-                self.main_view.suggestions_content.setText(suggestions)
-                
-            except:
-                # 如果解析失败，直接显示全部内容
-                self.main_view.optimized_content.setText(optimized_content)
-                self.main_view.suggestions_content.setText("无法解析详细建议，请查看优化后的内容。")
-                
-        except Exception as e:
-            progress_dialog.close()
-            QMessageBox.critical(self.main_view, "优化失败", f"优化内容时出错: {str(e)}")
+    def _create_job_api(self):
+        """为后台任务创建独立的API实例（共享限流器）"""
+        from models.deepseek_api import DeepSeekAPI
+        return DeepSeekAPI(self.api.api_key, self.api.base_url)
             
     def export_report(self):
         """导出报告"""
+        from models.report_generator import ReportGenerator
+        from models.report_writer import ReportWriter
+        
         if not hasattr(self, 'main_view'):
             return
             
@@ -1149,10 +1149,10 @@ class MainController:
         # 创建报告生成器
         report_generator = ReportGenerator()
         
-        # 生成报告内容
+        # 生成报告内容（逐行生成，写入文件的同时按章节刷新预览）
         try:
             if report_type == "分析报告":
-                report_content = report_generator.generate_analysis_report(
+                report_lines = report_generator.iter_analysis_report(
                     self.current_analysis_data, 
                     self.current_data, 
                     self.current_platform,
@@ -1168,7 +1168,7 @@ class MainController:
                     return
                 
                 plan_name, plan_data, created_at = latest_plan
-                report_content = report_generator.generate_marketing_plan_report(
+                report_lines = report_generator.iter_marketing_plan_report(
                     plan_data, plan_name, self.current_analysis_data
                 )
             else:  # 综合报告
@@ -1179,16 +1179,13 @@ class MainController:
                 if latest_plan:
                     plan_name, plan_data, created_at = latest_plan
                 
-                report_content = report_generator.generate_combined_report(
+                report_lines = report_generator.iter_combined_report(
                     self.current_analysis_data,
                     self.current_data,
                     self.current_platform,
                     plan_data=plan_data,
                     plan_name=plan_name
                 )
-        
-            # 显示预览
-            self.main_view.report_preview.setText(report_content)
 
             # 保存报告
             file_path, _ = QFileDialog.getSaveFileName(
@@ -1196,24 +1193,91 @@ class MainController:
                 f"{report_format}文件 (*.{report_format.lower()});;所有文件 (*)"
             )
 
-            if file_path:
-                # 根据格式确定保存类型
-                save_format = "markdown"
-                if report_format.lower() in ["html", "htm"]:
-                    save_format = "html"
-                elif report_format.lower() == "txt":
-                    save_format = "txt"
+            self.main_view.report_preview.clear()
+            if not file_path:
+                # 未保存时只显示预览
+                with ReportWriter(on_section=self._append_report_preview) as writer:
+                    writer.write_lines(report_lines)
+                return
+
+            # 根据格式确定保存类型
+            save_format = "markdown"
+            if report_format.lower() in ["html", "htm"]:
+                save_format = "html"
+            elif report_format.lower() == "txt":
+                save_format = "txt"
 
-                success = report_generator.save_report(report_content, file_path, save_format)
+            success = report_generator.write_report(report_lines, file_path, save_format,
+                                                    on_section=self._append_report_preview)
 
-                if success:
-                    QMessageBox.information(self.main_view, "导出成功", f"报告已成功导出到: {file_path}")
-                else:
-                    QMessageBox.critical(self.main_view, "导出失败", "保存报告文件时出错")
+            if success and include_charts and report_type == "分析报告" and save_format != "txt":
+                # 报告中引用的图表写到报告同目录，未变化的图表直接取自缓存
+                self._export_report_charts(file_path)
+            elif success:
+                QMessageBox.information(self.main_view, "导出成功", f"报告已成功导出到: {file_path}")
+            else:
+                QMessageBox.critical(self.main_view, "导出失败", "保存报告文件时出错")
                 
         except Exception as e:
             QMessageBox.critical(self.main_view, "导出失败", f"生成报告时出错: {str(e)}")
             
+    def _append_report_preview(self, section):
+        """追加一个报告章节到预览并立即刷新界面"""
+        preview = self.main_view.report_preview
+        preview.moveCursor(QTextCursor.MoveOperation.End)
+        preview.insertPlainText(section + "\n")
+        QApplication.processEvents()
+        
+    def _export_report_charts(self, report_path):
+        """在后台生成报告引用的图表文件"""
+        from models.chart_renderer import ChartTask
+        from models.report_generator import REPORT_CHARTS, report_chart_file
+        
+        report_dir = os.path.dirname(report_path)
+        cube = self.data_analyzer.get_cube(self.current_data)
+        tasks = [
+            ChartTask(title, builder, (cube, self.current_platform) if needs_platform else (cube,),
+                      os.path.join(report_dir, report_chart_file(name)))
+            for name, title, builder, needs_platform in REPORT_CHARTS
+        ]
+        
+        self.report_chart_thread = ChartExportThread(tasks)
+        self.report_chart_thread.finished_signal.connect(
+            lambda results: self._on_report_charts_saved(results, report_path)
+        )
+        self.report_chart_thread.start()
+        self.main_view.statusBar().showMessage("正在生成报告图表...")
+        
+    def _on_report_charts_saved(self, results, report_path):
+        """报告图表生成完成"""
+        self.main_view.statusBar().clearMessage()
+        errors = [f"{name}: {error}" for name, _, error in results if error]
+        if errors:
+            QMessageBox.warning(self.main_view, "导出完成", 
+                f"报告已导出到: {report_path}\n\n以下图表生成失败:\n" + "\n".join(errors))
+        else:
+            QMessageBox.information(self.main_view, "导出成功", f"报告已成功导出到: {report_path}")
+            
+    def get_token_cost_summary(self):
+        """按分析任务汇总AI token用量和估算费用"""
+        from models.rate_limiter import estimate_cost
+        
+        if not self.current_user:
+            return []
+        
+        summary = []
+        for task_id, task_name, calls, prompt_tokens, completion_tokens, total_tokens in \
+                self.db.get_token_usage_by_task(self.current_user[0]):
+            summary.append({
+                "任务": task_name or "未关联任务",
+                "调用次数": calls,
+                "输入tokens": prompt_tokens or 0,
+                "输出tokens": completion_tokens or 0,
+                "总tokens": total_tokens or 0,
+                "估算费用(元)": round(estimate_cost(prompt_tokens or 0, completion_tokens or 0), 4)
+            })
+        return summary
+            
     def test_api_connection(self):
         """测试API连接（异步，防卡死）"""
         if not hasattr(self, 'main_view'):
@@ -1247,6 +1311,8 @@ class MainController:
             
     def save_settings(self):
         """保存设置"""
+        from models.deepseek_api import DeepSeekAPI
+        
         if not hasattr(self, 'main_view'):
             return
             
@@ -1275,6 +1341,7 @@ class MainController:
             if success:
                 # 更新当前API实例
                 self.api = DeepSeekAPI(api_key, api_base)
+                self.api.set_usage_context(self.db, self.current_user[0])
                 QMessageBox.information(self.main_view, "保存成功", "设置已成功保存")
             else:
                 QMessageBox.critical(self.main_view, "保存失败", "保存设置时出错")
@@ -1370,8 +1437,6 @@ class MainController:
             
         from PyQt6.QtWidgets import QFileDialog, QMessageBox
         import pandas as pd
-        from datetime import datetime
-        import os
         
         try:
             # 获取用户的分析任务和结果
@@ -1395,7 +1460,7 @@ class MainController:
             file_path = format_dialog.selectedFiles()[0]
             
             # 准备导出数据
-            export_data = []
+            records = []
             
             for task in analysis_tasks:
                 task_id, task_name, platform, analysis_type, created_at = task
@@ -1412,24 +1477,35 @@ class MainController:
                     except:
                         result_dict = {"raw_data": result_data}
                     
-                    # 添加到导出数据
-                    export_data.append({
-                        "任务名称": task_name,
-                        "平台": platform,
-                        "分析类型": analysis_type,
-                        "结果类型": result_type,
-                        "创建时间": created_at,
-                        "结果时间": result_created_at,
-                        "结果数据": str(result_dict)
+                    records.append({
+                        "task_name": task_name,
+                        "platform": platform,
+                        "analysis_type": analysis_type,
+                        "result_type": result_type,
+                        "created_at": created_at,
+                        "result_created_at": result_created_at,
+                        "result": result_dict
                     })
             
-            # 创建DataFrame
-            df = pd.DataFrame(export_data)
-            
             # 根据选择的格式导出
             if "Excel" in selected_filter:
-                self._export_to_excel(df, file_path)
-            elif "CSV" in selected_filter:
+                # 每种结果类型一个工作表，结果字段按类型写成单独的列
+                self._export_to_excel(records, file_path)
+                QMessageBox.information(self.main_view, "导出成功", f"数据已成功导出到: {file_path}")
+                return
+            
+            # CSV和PDF导出为单表，结果数据合并为一列
+            df = pd.DataFrame([{
+                "任务名称": record["task_name"],
+                "平台": record["platform"],
+                "分析类型": record["analysis_type"],
+                "结果类型": record["result_type"],
+                "创建时间": record["created_at"],
+                "结果时间": record["result_created_at"],
+                "结果数据": str(record["result"])
+            } for record in records])
+            
+            if "CSV" in selected_filter:
                 self._export_to_csv(df, file_path)
             elif "PDF" in selected_filter:
                 self._export_to_pdf(df, file_path)
@@ -1439,13 +1515,18 @@ class MainController:
         except Exception as e:
             QMessageBox.critical(self.main_view, "导出失败", f"导出数据时出错: {str(e)}")
             
-    def _export_to_excel(self, df, file_path):
-        """导出到Excel"""
+    def _export_to_excel(self, records, file_path):
+        """导出到Excel（只写模式流式写出，每种结果类型一个工作表）"""
+        import pandas as pd
+        from models.excel_exporter import export_analysis_results
+        
         try:
-            df.to_excel(file_path, index=False, engine='openpyxl')
+            export_analysis_results(records, file_path)
         except ImportError:
             QMessageBox.warning(self.main_view, "Excel导出", 
                               "Excel导出需要安装openpyxl库。\n正在使用CSV格式导出...")
+            df = pd.DataFrame([{**{k: v for k, v in record.items() if k != 'result'}, **record['result']}
+                               for record in records])
             self._export_to_csv(df, file_path.replace('.xlsx', '.csv'))
         except Exception as e:
             raise Exception(f"Excel生成失败: {str(e)}")
@@ -1460,33 +1541,10 @@ class MainController:
     def _export_to_pdf(self, df, file_path):
         """导出到PDF"""
         try:
-            from reportlab.lib.pagesizes import letter
-            from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
-            from reportlab.lib import colors
-            
-            doc = SimpleDocTemplate(file_path, pagesize=letter)
-            story = []
-            
-            # 创建表格数据
-            table_data = [df.columns.tolist()] + df.values.tolist()
-            
-            # 创建表格
-            table = Table(table_data)
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('FONTSIZE', (0, 1), (-1, -1), 8),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
-            story.append(table)
-            
-            # 生成PDF
-            doc.build(story)
+            from models.pdf_exporter import PdfTableExporter
+            
+            # 逐页排版，每页重复表头，大量记录也只占用一页表格的内存
+            PdfTableExporter().export_dataframe(df, file_path, title="分析结果数据")
             
         except ImportError:
             # 如果没有reportlab，使用简单的文本格式
@@ -1513,6 +1571,9 @@ class MainController:
             
     def exit_application(self):
         """退出应用程序"""
+        self.job_queue.stop()
+        if hasattr(self, 'chart_loader'):
+            self.chart_loader.close()
         if hasattr(self, 'main_view'):
             self.main_view.close()
         elif hasattr(self, 'login_view'):
@@ -1702,10 +1763,33 @@ class MainController:
 
     def show_data_import_view(self):
         """显示数据导入界面"""
+        from views.data_import_view import DataImportView
         self.data_import_view = DataImportView(self.main_view)
         self.data_import_view.show()
 
 
+class AIJobSignals(QObject):
+    """后台AI任务完成信号"""
+    job_finished = pyqtSignal(int, str, str, str)
+
+
+class ChartExportThread(QThread):
+    """在后台并行渲染并保存图表"""
+    finished_signal = pyqtSignal(list)
+
+    def __init__(self, tasks):
+        super().__init__()
+        self.tasks = tasks
+
+    def run(self):
+        try:
+            from models.chart_renderer import render_charts
+            results = render_charts(self.tasks)
+        except Exception as e:
+            results = [(task.name, "", str(e)) for task in self.tasks]
+        self.finished_signal.emit(results)
+
+
 class ApiTestThread(QThread):
     result_signal = pyqtSignal(bool, str)
 
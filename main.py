@@ -1,6 +1,4 @@
 import sys
-import matplotlib
-matplotlib.use('qtagg')
 from PyQt6.QtWidgets import QApplication, QMessageBox
 import platform
 from PyQt6.QtCore import QTimer
@@ -13,7 +11,6 @@ sys.path.append(str(project_root))
 # 现在可以导入controllers模块
 from controllers.main_controller import MainController
 from PyQt6.QtCore import QThread, pyqtSignal
-import requests
 
 class ApiTestThread(QThread):
     result_signal = pyqtSignal(bool, str)
@@ -139,8 +136,9 @@ def main():
     theme_watcher = ThemeWatcher(app)
     theme_watcher.apply_theme()  # 启动时立即应用一次
     
-    controller = MainController()
-    controller.show_login_view()
+    # 控制器创建后即显示登录界面，主界面和分析模块按需加载；
+    # 挂在app上保持引用，事件循环运行期间控制器及其窗口不会被回收
+    app.controller = MainController()
     
     sys.exit(app.exec())
 
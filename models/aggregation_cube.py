@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+聚合立方体模块
+按 日期 × 平台 × 内容类型 × 情感 预先聚合互动量，供所有图表复用
+"""
+
+import hashlib
+from typing import Dict, Optional
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class AggregationCube:
+    """按维度预聚合的数据立方体"""
+
+    # 立方体的维度（数据中不存在的维度会被忽略）
+    DIMENSIONS = ('date', 'platform', 'content_type', 'sentiment')
+
+    def __init__(self, df: pd.DataFrame, value_column: str = 'engagement'):
+        """
+        构建聚合立方体
+
+        Args:
+            df: 原始数据
+            value_column: 聚合的数值列
+        """
+        self.value_column = value_column
+        self.row_count = len(df)
+        self.dimensions = [dim for dim in self.DIMENSIONS if dim in df.columns]
+        self.has_date = 'date' in self.dimensions
+
+        keys = {}
+        for dim in self.dimensions:
+            if dim == 'date':
+                # 日期统一到天，不修改原始数据
+                keys[dim] = pd.to_datetime(df[dim]).dt.date
+            else:
+                keys[dim] = df[dim]
+        values = df[value_column] if value_column in df.columns else pd.Series(np.nan, index=df.index)
+        frame = pd.DataFrame(keys, index=df.index)
+        frame['_value'] = values
+
+        if self.dimensions:
+            grouped = frame.groupby(self.dimensions, dropna=False, sort=True)['_value']
+            self.cells = grouped.agg(['size', 'count', 'sum', 'min', 'max']).reset_index()
+        else:
+            self.cells = pd.DataFrame({
+                'size': [len(frame)], 'count': [values.count()], 'sum': [values.sum()],
+                'min': [values.min()], 'max': [values.max()]
+            })
+        self.cells = self.cells.rename(columns={'size': 'rows'})
+
+        # 没有日期维度时趋势图按数据点绘制，保留数值序列
+        self.point_values = None if self.has_date else values.to_numpy()
+
+        self._fingerprint = None
+
+        logger.info(f"聚合立方体: {self.row_count} 行 -> {len(self.cells)} 个单元")
+
+    def fingerprint(self) -> str:
+        """立方体内容指纹（用于图表缓存键）"""
+        if self._fingerprint is None:
+            digest = hashlib.sha1()
+            digest.update(repr((self.value_column, list(self.cells.columns))).encode('utf-8'))
+            digest.update(pd.util.hash_pandas_object(self.cells, index=False).values.tobytes())
+            if self.point_values is not None:
+                digest.update(np.ascontiguousarray(self.point_values, dtype=np.float64).tobytes())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def rollup(self, *dims: str) -> pd.DataFrame:
+        """
+        按指定维度上卷
+
+        Args:
+            dims: 维度名称
+
+        Returns:
+            以维度为索引，包含 rows/count/sum/min/max/mean 列的DataFrame（不含空值维度）
+        """
+        for dim in dims:
+            if dim not in self.dimensions:
+                raise KeyError(dim)
+        result = self.cells.groupby(list(dims), sort=True).agg(
+            {'rows': 'sum', 'count': 'sum', 'sum': 'sum', 'min': 'min', 'max': 'max'}
+        )
+        result['mean'] = result['sum'] / result['count'].replace(0, np.nan)
+        return result
+
+    def mean_by(self, dim: str) -> pd.Series:
+        """各维度值的平均数值"""
+        return self.rollup(dim)['mean'].dropna()
+
+    def counts(self, dim: str) -> pd.Series:
+        """各维度值的记录数，按数量降序（与value_counts一致）"""
+        return self.rollup(dim)['rows'].sort_values(ascending=False, kind='stable')
+
+    def crosstab(self, index_dim: str, column_dim: str) -> pd.DataFrame:
+        """两个维度的记录数交叉表"""
+        return self.rollup(index_dim, column_dim)['rows'].unstack(fill_value=0)
+
+    def nunique(self, dim: str) -> int:
+        """维度的不同取值数"""
+        return len(self.rollup(dim))
+
+    def totals(self) -> Dict[str, Optional[float]]:
+        """整体统计"""
+        count = int(self.cells['count'].sum())
+        total = float(self.cells['sum'].sum())
+        return {
+            'rows': self.row_count,
+            'count': count,
+            'sum': total,
+            'mean': total / count if count else None,
+            'min': float(self.cells['min'].min()) if count else None,
+            'max': float(self.cells['max'].max()) if count else None
+        }
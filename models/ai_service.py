@@ -4,6 +4,11 @@ import pandas as pd
 from typing import Dict, List, Any, Optional
 import logging
 
+from config import AI_CONFIG
+from models.rate_limiter import get_rate_limiter, estimate_request_tokens, extract_usage, parse_retry_after
+from models.single_flight import ai_single_flight, make_request_key
+from models.structured_output import record_to_dict, request_record
+
 class AIService:
     """AI服务类，用于处理DeepSeek API调用"""
     
@@ -14,6 +19,18 @@ class AIService:
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
         }
+        self.rate_limiter = get_rate_limiter()
+        
+        # token用量记录（可选）
+        self.usage_db = None
+        self.user_id = None
+        self.task_id = None
+        
+    def set_usage_context(self, db, user_id, task_id=None):
+        """设置token用量记录上下文"""
+        self.usage_db = db
+        self.user_id = user_id
+        self.task_id = task_id
         
     def analyze_social_media_data(self, data: pd.DataFrame) -> Dict[str, Any]:
         """分析社交媒体数据"""
@@ -27,20 +44,15 @@ class AIService:
             数据摘要：
             {data_summary}
             
-            请提供以下分析：
-            1. 数据趋势分析
-            2. 用户行为洞察
-            3. 内容表现评估
-            4. 营销策略建议
-            5. 优化建议
-            
-            请用中文回答，格式要清晰易读。
+            请从数据趋势、用户行为、内容表现、机会与风险几个方面分析，并给出整体结论。
+            请用中文回答。
             """
             
-            response = self._call_api(prompt)
+            # 以JSON模式请求并校验为类型化记录，界面按字段显示
+            record = self.request_structured("analysis", prompt, request_type="analysis")
             return {
                 "success": True,
-                "analysis": response,
+                "record": record_to_dict(record),
                 "data_summary": data_summary
             }
         except Exception as e:
@@ -71,7 +83,7 @@ class AIService:
             请用中文回答，格式要清晰易读。
             """
             
-            response = self._call_api(prompt)
+            response = self._call_api(prompt, request_type="marketing_strategy")
             return {
                 "success": True,
                 "strategy": response
@@ -102,7 +114,7 @@ class AIService:
             请用中文回答，格式要清晰易读。
             """
             
-            response = self._call_api(prompt)
+            response = self._call_api(prompt, request_type="competitor_analysis")
             return {
                 "success": True,
                 "analysis": response
@@ -134,7 +146,7 @@ class AIService:
             请用中文回答，格式要清晰易读。
             """
             
-            response = self._call_api(prompt)
+            response = self._call_api(prompt, request_type="content_ideas")
             return {
                 "success": True,
                 "ideas": response
@@ -168,7 +180,7 @@ class AIService:
             请用中文回答，格式要清晰易读。
             """
             
-            response = self._call_api(prompt)
+            response = self._call_api(prompt, request_type="sentiment")
             return {
                 "success": True,
                 "sentiment": response
@@ -180,9 +192,18 @@ class AIService:
                 "error": str(e)
             }
     
-    def _call_api(self, prompt: str) -> str:
-        """调用DeepSeek API"""
+    def request_structured(self, schema_name: str, prompt: str, request_type: str = "chat"):
+        """以JSON模式请求并校验响应（见structured_output.request_record）"""
+        return request_record(
+            schema_name, prompt,
+            lambda structured_prompt: self._call_api(structured_prompt, request_type, json_mode=True),
+            AI_CONFIG.get('structured_retries', 1)
+        )
+    
+    def _call_api(self, prompt: str, request_type: str = "chat", json_mode: bool = False) -> str:
+        """调用DeepSeek API（json_mode为True时要求返回JSON对象）"""
         try:
+            max_tokens = AI_CONFIG.get('max_tokens', 2000)
             data = {
                 "model": "deepseek-chat",
                 "messages": [
@@ -191,10 +212,33 @@ class AIService:
                         "content": prompt
                     }
                 ],
-                "temperature": 0.7,
-                "max_tokens": 2000
+                "temperature": AI_CONFIG.get('temperature', 0.7),
+                "max_tokens": max_tokens
             }
+            if json_mode:
+                data["response_format"] = {"type": "json_object"}
+            
+            # 相同请求并发时只发送一次
+            request_key = make_request_key(self.api_key, self.base_url, data)
+            return ai_single_flight.do(request_key, lambda: self._post(data, request_type))
             
+        except Exception as e:
+            logging.error(f"API调用异常: {str(e)}")
+            raise e
+    
+    def _post(self, data: Dict[str, Any], request_type: str) -> str:
+        """在限流额度内发送请求并记录token用量"""
+        prompt = data["messages"][-1]["content"]
+        max_tokens = data["max_tokens"]
+        
+        # 与DeepSeekAPI共用同一个令牌桶
+        estimated_tokens = estimate_request_tokens(prompt, max_tokens)
+        if not self.rate_limiter.acquire(estimated_tokens, timeout=AI_CONFIG.get('rate_limit_wait', 120)):
+            raise Exception("等待API调用额度超时，请稍后重试")
+        
+        # 预扣的token额度无论成功、失败还是响应解析出错都要结算，否则会一直占用
+        settled = False
+        try:
             response = requests.post(
                 self.base_url,
                 headers=self.headers,
@@ -202,15 +246,34 @@ class AIService:
                 timeout=10
             )
             
-            if response.status_code == 200:
-                result = response.json()
-                return result["choices"][0]["message"]["content"]
-            else:
+            if response.status_code != 200:
+                self.rate_limiter.settle(estimated_tokens, 0)
+                settled = True
+                if response.status_code == 429:
+                    self.rate_limiter.penalize(parse_retry_after(response.headers.get('Retry-After'), 0))
                 raise Exception(f"API调用失败: {response.status_code} - {response.text}")
-                
+            
+            result = response.json()
+            usage = extract_usage(result)
+            self.rate_limiter.settle(estimated_tokens, usage['total_tokens'] or estimated_tokens)
+            settled = True
+            self._record_usage(request_type, data["model"], usage)
+            return result["choices"][0]["message"]["content"]
+        finally:
+            if not settled:
+                self.rate_limiter.settle(estimated_tokens, 0)
+    
+    def _record_usage(self, request_type: str, model: str, usage: Dict[str, int]):
+        """将token用量写入数据库（写入失败不影响已成功的API调用）"""
+        if self.usage_db is None or not usage['total_tokens']:
+            return
+        try:
+            self.usage_db.add_token_usage(
+                self.user_id, self.task_id, request_type, model,
+                usage['prompt_tokens'], usage['completion_tokens'], usage['total_tokens']
+            )
         except Exception as e:
-            logging.error(f"API调用异常: {str(e)}")
-            raise e
+            logging.error(f"记录token用量失败: {str(e)}")
     
     def _prepare_data_summary(self, data: pd.DataFrame) -> str:
         """准备数据摘要"""
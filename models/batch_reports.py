@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量报告模块
+按(数据集, 平台, 模板)任务列表在进程池中并行生成报告，输出到reports目录并写出清单文件
+"""
+
+import contextlib
+import io
+import json
+import math
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import logging
+
+from config import ANALYSIS_CONFIG, PATHS
+
+logger = logging.getLogger(__name__)
+
+# 报告模板
+TEMPLATES = ('analysis', 'combined', 'marketing')
+
+# 输出格式对应的文件扩展名
+FORMAT_EXTENSIONS = {
+    'markdown': 'md',
+    'html': 'html',
+    'txt': 'txt'
+}
+
+# 以 sample:<平台> 指定的数据集使用生成的示例数据
+SAMPLE_PREFIX = 'sample:'
+
+# 工作进程内复用的分析器和已加载的数据集
+_worker_analyzer = None
+_worker_datasets = {}
+
+
+class ReportJob:
+    """单个报告任务"""
+
+    def __init__(self, dataset: str, platform: str, template: str = 'analysis',
+                 format_type: str = 'markdown', name: Optional[str] = None,
+                 plan: Optional[str] = None, include_charts: bool = False):
+        """
+        Args:
+            dataset: 数据文件路径（csv/xlsx/json），或 sample:<平台> 使用示例数据
+            platform: 平台名称，数据有platform列时只使用该平台的记录（没有记录时任务失败）
+            template: 报告模板（analysis/combined/marketing）
+            format_type: 输出格式（markdown/html/txt）
+            name: 报告名称（用于文件名），默认取数据集文件名
+            plan: 营销方案文本文件路径（marketing模板必需，combined模板可选）
+            include_charts: 分析报告是否内嵌图表（txt格式忽略）
+        """
+        template = template.lower()
+        format_type = format_type.lower()
+        if template not in TEMPLATES:
+            raise ValueError(f"不支持的报告模板: {template}")
+        if format_type not in FORMAT_EXTENSIONS:
+            raise ValueError(f"不支持的报告格式: {format_type}")
+        if template == 'marketing' and not plan:
+            raise ValueError("marketing模板需要提供营销方案文件")
+
+        self.dataset = dataset
+        self.platform = platform
+        self.template = template
+        self.format_type = format_type
+        self.name = name or (Path(dataset).stem if not dataset.startswith(SAMPLE_PREFIX) else 'sample')
+        self.plan = plan
+        self.include_charts = include_charts
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ReportJob':
+        """从字典（任务文件中的一行或一项）创建任务"""
+        include_charts = data.get('include_charts', False)
+        if isinstance(include_charts, str):
+            include_charts = include_charts.strip().lower() in ('1', 'true', 'yes', 'y')
+        return cls(
+            dataset=str(data['dataset']),
+            platform=str(data['platform']),
+            template=data.get('template') or 'analysis',
+            format_type=data.get('format') or 'markdown',
+            name=data.get('name') or None,
+            plan=data.get('plan') or None,
+            include_charts=bool(include_charts)
+        )
+
+    def file_name(self, index: int) -> str:
+        """输出文件名（带任务序号，避免同名任务互相覆盖）"""
+        stem = re.sub(r'[\\/:*?"<>|\s]+', '_', f"{self.name}_{self.platform}_{self.template}")
+        return f"{index:04d}_{stem}.{FORMAT_EXTENSIONS[self.format_type]}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'dataset': self.dataset,
+            'platform': self.platform,
+            'template': self.template,
+            'format': self.format_type,
+            'name': self.name,
+            'plan': self.plan,
+            'include_charts': self.include_charts
+        }
+
+
+def load_dataset(dataset: str):
+    """
+    加载并标准化数据集
+
+    Args:
+        dataset: 数据文件路径，或 sample:<平台>
+
+    Returns:
+        标准化、清洗后的DataFrame
+    """
+    import pandas as pd
+    from models.social_media_data import SocialMediaData
+
+    social_media_data = SocialMediaData()
+    # 数据导入会打印调试信息，批量生成时不输出
+    with contextlib.redirect_stdout(io.StringIO()):
+        if dataset.startswith(SAMPLE_PREFIX):
+            platform = dataset[len(SAMPLE_PREFIX):]
+            df = social_media_data.standardize_columns(social_media_data.generate_sample_data(platform))
+            df['platform'] = platform
+            return social_media_data.clean_data(df)
+
+        suffix = Path(dataset).suffix.lower()
+        if suffix == '.csv':
+            result = social_media_data.import_csv_data(dataset)
+            if not result['valid']:
+                raise ValueError(result['error'])
+            return result['data']
+
+        if suffix in ('.xlsx', '.xls'):
+            df = pd.read_excel(dataset)
+        elif suffix == '.json':
+            df = pd.read_json(dataset)
+        else:
+            raise ValueError(f"不支持的数据文件格式: {suffix}")
+        validation = social_media_data.validate_data_format(df)
+        if not validation['valid']:
+            raise ValueError(validation['error'])
+        return social_media_data.clean_data(social_media_data.standardize_columns(df))
+
+
+def _worker_dataset(dataset: str):
+    """工作进程内按文件修改时间缓存数据集，同一数据集的多个任务只加载一次"""
+    mtime = None if dataset.startswith(SAMPLE_PREFIX) else os.path.getmtime(dataset)
+    cached = _worker_datasets.get(dataset)
+    if cached is None or cached[0] != mtime:
+        _worker_datasets.clear()
+        cached = (mtime, load_dataset(dataset))
+        _worker_datasets[dataset] = cached
+    return cached[1]
+
+
+def _report_lines(job: ReportJob, df, analysis_data: Dict[str, Any], stats):
+    """按模板生成报告行"""
+    from models.report_generator import ReportGenerator, REPORT_CHARTS
+
+    generator = ReportGenerator()
+    plan_data, plan_name = None, None
+    if job.plan:
+        plan_data = Path(job.plan).read_text(encoding='utf-8')
+        plan_name = Path(job.plan).stem
+
+    if job.template == 'marketing':
+        return generator.iter_marketing_plan_report(plan_data, plan_name, analysis_data)
+    if job.template == 'combined':
+        return generator.iter_combined_report(analysis_data, df, job.platform, plan_data=plan_data,
+                                              plan_name=plan_name or "综合营销方案", stats=stats)
+
+    include_charts = job.include_charts and job.format_type != 'txt'
+    chart_images = None
+    if include_charts:
+        # 图表以SVG内嵌到报告中，单个报告文件即可分发；相同数据的图表复用磁盘缓存
+        chart_images = {}
+        for name, _, builder, needs_platform in REPORT_CHARTS:
+            args = (df, job.platform) if needs_platform else (df,)
+            image = _worker_analyzer.render_chart(builder, *args, fmt='svg')
+            if image is not None:
+                chart_images[name] = image
+    return generator.iter_analysis_report(analysis_data, df, job.platform, include_charts=include_charts,
+                                          chart_format='svg', chart_images=chart_images, stats=stats)
+
+
+def _run_job(job: ReportJob, file_path: str) -> Dict[str, Any]:
+    """在工作进程中生成一份报告"""
+    global _worker_analyzer
+    from models.data_analyzer import DataAnalyzer
+    from models.report_statistics import ReportStatistics
+    from models.report_writer import ReportWriter
+
+    if _worker_analyzer is None:
+        _worker_analyzer = DataAnalyzer()
+
+    start = time.perf_counter()
+    df = _worker_dataset(job.dataset)
+    # 有platform列的数据集只保留该平台（多账号数据集），没有该列时视为单平台数据集整体使用
+    if 'platform' in df.columns:
+        df = df[df['platform'] == job.platform].reset_index(drop=True)
+        if df.empty:
+            raise ValueError(f"数据集 {job.dataset} 中没有平台 {job.platform} 的数据")
+
+    analysis_data = _worker_analyzer.analyze_data(df, job.platform)
+    stats = ReportStatistics(df)
+    report_lines = _report_lines(job, df, analysis_data, stats)
+
+    # 写入临时文件后再替换，中断的任务不会留下不完整的报告
+    tmp_path = f"{file_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            with ReportWriter(f, job.format_type) as writer:
+                writer.write_lines(report_lines)
+        os.replace(tmp_path, file_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return {
+        'rows': len(df),
+        'bytes': os.path.getsize(file_path),
+        'seconds': round(time.perf_counter() - start, 3)
+    }
+
+
+def _run_chunk(chunk: List[tuple]) -> List[tuple]:
+    """
+    在工作进程中依次执行一组任务（同一数据集），单个任务失败不影响其他任务
+
+    Returns:
+        [(任务序号, 结果, 错误信息)]
+    """
+    results = []
+    for index, job, file_path in chunk:
+        try:
+            results.append((index, _run_job(job, file_path), None))
+        except Exception as e:
+            results.append((index, None, f"{type(e).__name__}: {e}"))
+    return results
+
+
+def _init_worker():
+    """工作进程初始化：切换到无界面的Agg后端"""
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+
+
+def _make_chunks(items: List[tuple], workers: int) -> List[List[tuple]]:
+    """
+    按数据集分组任务，同一组的任务在一个进程中依次执行，数据集只加载一次；
+    每个进程约分到4组，大的分组再拆分以保持负载均衡
+    """
+    groups = {}
+    for item in items:
+        groups.setdefault(item[1].dataset, []).append(item)
+
+    size = max(1, math.ceil(len(items) / (workers * 4)))
+    chunks = []
+    for group in groups.values():
+        chunks.extend(group[i:i + size] for i in range(0, len(group), size))
+    # 先提交大的分组，缩短尾部等待
+    chunks.sort(key=len, reverse=True)
+    return chunks
+
+
+def run_batch(jobs: List[ReportJob], output_dir: Optional[str] = None,
+              max_workers: Optional[int] = None, progress=None) -> Dict[str, Any]:
+    """
+    并行生成批量报告
+
+    Args:
+        jobs: 报告任务列表
+        output_dir: 输出目录，默认 reports/batch_<时间戳>
+        max_workers: 进程数，默认读取ANALYSIS_CONFIG
+        progress: 进度回调 progress(已完成数, 总数)
+
+    Returns:
+        清单字典（同时写入输出目录的manifest.json），reports按任务顺序排列
+    """
+    started_at = datetime.now()
+    start = time.perf_counter()
+    if output_dir is None:
+        output_dir = Path(PATHS['reports_dir']) / f"batch_{started_at.strftime('%Y%m%d_%H%M%S')}"
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    items = [(i, job, str(output_dir / job.file_name(i))) for i, job in enumerate(jobs, 1)]
+    results = {}
+
+    if items:
+        max_workers = max_workers or ANALYSIS_CONFIG.get('batch_report_workers') or os.cpu_count() or 1
+        max_workers = min(max_workers, len(items))
+        chunks = _make_chunks(items, max_workers)
+        logger.info(f"批量生成 {len(items)} 份报告，{max_workers} 个进程，{len(chunks)} 个任务组")
+
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as executor:
+            futures = {executor.submit(_run_chunk, chunk): chunk for chunk in chunks}
+            for future in as_completed(futures):
+                try:
+                    chunk_results = future.result()
+                except Exception as e:
+                    # 工作进程异常退出时整组任务记为失败
+                    chunk_results = [(index, None, f"{type(e).__name__}: {e}") for index, _, _ in futures[future]]
+                for index, result, error in chunk_results:
+                    results[index] = (result, error)
+                    if error:
+                        logger.error(f"报告任务 {index} 失败: {error}")
+                if progress is not None:
+                    progress(len(results), len(items))
+
+    reports = []
+    for index, job, file_path in items:
+        result, error = results[index]
+        entry = {'index': index, **job.to_dict()}
+        if error is None:
+            entry.update(status='success', file=os.path.basename(file_path), **result)
+        else:
+            entry.update(status='failed', error=error)
+        reports.append(entry)
+
+    succeeded = sum(1 for entry in reports if entry['status'] == 'success')
+    manifest = {
+        'created_at': started_at.strftime('%Y-%m-%d %H:%M:%S'),
+        'output_dir': str(output_dir),
+        'total': len(reports),
+        'succeeded': succeeded,
+        'failed': len(reports) - succeeded,
+        'seconds': round(time.perf_counter() - start, 3),
+        'reports': reports
+    }
+
+    manifest_path = output_dir / 'manifest.json'
+    tmp_path = output_dir / 'manifest.json.tmp'
+    tmp_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding='utf-8')
+    os.replace(tmp_path, manifest_path)
+    return manifest
+
+
+def load_jobs(file_path: str) -> List[ReportJob]:
+    """
+    读取任务文件
+
+    Args:
+        file_path: CSV（列: dataset,platform,template,format,name,plan,include_charts）
+                   或JSON（任务对象数组）文件；相对路径的数据集和方案文件相对于任务文件所在目录
+
+    Returns:
+        任务列表
+    """
+    path = Path(file_path)
+    if path.suffix.lower() == '.json':
+        rows = json.loads(path.read_text(encoding='utf-8'))
+    else:
+        import csv
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            rows = [row for row in csv.DictReader(f) if any((value or '').strip() for value in row.values())]
+
+    jobs = []
+    for row in rows:
+        row = {key.strip(): value.strip() if isinstance(value, str) else value for key, value in row.items() if key}
+        for key in ('dataset', 'plan'):
+            value = row.get(key)
+            if value and not value.startswith(SAMPLE_PREFIX) and not Path(value).is_absolute():
+                row[key] = str(path.parent / value)
+        jobs.append(ReportJob.from_dict(row))
+    return jobs
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+图表后端模块
+统一使用matplotlib绘制图表，所有绘图库都在第一次绘图时才加载，导入分析器本身不加载任何绘图库
+
+matplotlib的全局状态（rcParams、字体和文字排版缓存）不是线程安全的：
+界面进程内的绘图（后台线程的离屏渲染、主线程的画布重绘）都要持有draw_lock
+"""
+
+import sys
+import threading
+from typing import Any, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 中文字体候选（按优先级）
+CJK_FONT_FAMILIES = ['SimHei', 'Microsoft YaHei', 'Arial Unicode MS', 'Noto Sans CJK SC',
+                     'WenQuanYi Micro Hei', 'DejaVu Sans']
+
+_style_applied = False
+
+# 界面进程内所有matplotlib绘图共用的锁（可重入：画布重绘时会回调位块传输等绘图代码）
+draw_lock = threading.RLock()
+
+_canvas_class = None
+
+
+def apply_style():
+    """应用统一的图表样式和中文字体（只执行一次）"""
+    global _style_applied
+    if _style_applied:
+        return
+    import matplotlib
+    import matplotlib.style
+
+    matplotlib.style.use('seaborn-v0_8')
+    # 样式表会重置字体，中文字体需在样式之后设置
+    matplotlib.rcParams['font.sans-serif'] = CJK_FONT_FAMILIES
+    matplotlib.rcParams['axes.unicode_minus'] = False
+    _style_applied = True
+
+
+def new_figure(figsize: Optional[Tuple[float, float]] = None, **kwargs):
+    """
+    创建Figure
+
+    Figure不注册到pyplot，不依赖GUI后端，不再引用时即可被回收
+
+    Args:
+        figsize: 画布尺寸（英寸）
+        kwargs: 传给matplotlib.figure.Figure的其他参数
+
+    Returns:
+        matplotlib Figure
+    """
+    apply_style()
+    from matplotlib.figure import Figure
+    return Figure(figsize=figsize, **kwargs)
+
+
+def subplots(nrows: int = 1, ncols: int = 1, figsize: Optional[Tuple[float, float]] = None, **kwargs):
+    """创建Figure及子图，用法同pyplot.subplots"""
+    fig = new_figure(figsize)
+    return fig, fig.subplots(nrows, ncols, **kwargs)
+
+
+def palette(name: str, count: int):
+    """
+    从颜色映射中均匀取色
+
+    Args:
+        name: 颜色映射名称（如Set3、Pastel1）
+        count: 颜色数量
+
+    Returns:
+        (count, 4) RGBA数组
+    """
+    import numpy as np
+    import matplotlib
+    return matplotlib.colormaps[name](np.linspace(0, 1, count))
+
+
+def seaborn() -> Any:
+    """按需加载seaborn（仅热力图使用）"""
+    apply_style()
+    import seaborn as sns
+    return sns
+
+
+def canvas_class() -> Any:
+    """按需加载Qt画布类（重绘时持有draw_lock，与后台线程的离屏渲染互斥）"""
+    global _canvas_class
+    if _canvas_class is None:
+        from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
+
+        class LockedFigureCanvas(FigureCanvasQTAgg):
+            def draw(self):
+                with draw_lock:
+                    super().draw()
+
+        _canvas_class = LockedFigureCanvas
+    return _canvas_class
+
+
+# 矢量格式的导出参数：SVG文字保留为<text>而不转成路径，去掉时间戳使相同图表输出相同字节
+_VECTOR_RC = {
+    'svg': {'svg.fonttype': 'none', 'svg.hashsalt': 'social-media-analysis'},
+    'pdf': {}
+}
+_VECTOR_METADATA = {
+    'svg': {'Date': None},
+    'pdf': {'CreationDate': None}
+}
+
+
+def is_vector(fmt: str) -> bool:
+    """是否为矢量格式"""
+    return fmt in _VECTOR_RC
+
+
+def save_figure(fig, target, fmt: str = 'png', dpi: int = 100):
+    """
+    保存Figure（矢量格式使用紧凑、可复现的导出参数）
+
+    Args:
+        fig: matplotlib Figure
+        target: 文件路径或可写的二进制流
+        fmt: 图片格式（png/svg/pdf）
+        dpi: 分辨率（矢量格式只影响其中嵌入的位图）
+    """
+    import matplotlib
+    with matplotlib.rc_context(_VECTOR_RC.get(fmt, {})):
+        fig.savefig(target, format=fmt, dpi=dpi, bbox_inches='tight',
+                    metadata=_VECTOR_METADATA.get(fmt))
+
+
+def close_figure(fig):
+    """释放Figure（只有已加载pyplot时才需要从pyplot注销）"""
+    pyplot = sys.modules.get('matplotlib.pyplot')
+    if pyplot is not None:
+        pyplot.close(fig)
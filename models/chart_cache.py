@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+图表缓存模块
+以数据集内容指纹 + 图表类型 + 参数为键，将渲染好的PNG/SVG/PDF字节缓存在磁盘上，按总大小做LRU淘汰
+"""
+
+import hashlib
+import io
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Optional
+import logging
+
+import numpy as np
+import pandas as pd
+
+from config import ANALYSIS_CONFIG, PATHS
+from models.chart_backend import close_figure, save_figure
+
+logger = logging.getLogger(__name__)
+
+# 图表绘制代码变化时递增，使旧缓存失效
+CACHE_VERSION = 4
+
+
+def data_fingerprint(data: Any) -> str:
+    """
+    计算数据内容指纹
+
+    Args:
+        data: DataFrame、Series、numpy数组、带fingerprint()方法的对象或普通值
+
+    Returns:
+        十六进制摘要
+    """
+    if hasattr(data, 'fingerprint'):
+        return data.fingerprint()
+
+    digest = hashlib.sha1()
+    if isinstance(data, pd.DataFrame):
+        digest.update(json.dumps([str(c) for c in data.columns], ensure_ascii=False).encode('utf-8'))
+        digest.update(json.dumps([str(t) for t in data.dtypes], ensure_ascii=False).encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(data, index=True).values.tobytes())
+    elif isinstance(data, (pd.Series, pd.Index)):
+        digest.update(str(data.dtype).encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(data).values.tobytes())
+    elif isinstance(data, np.ndarray):
+        digest.update(str(data.dtype).encode('utf-8'))
+        digest.update(np.ascontiguousarray(data).tobytes())
+    else:
+        digest.update(repr(data).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def render_figure_bytes(fig, fmt: str = 'png', dpi: int = 100) -> bytes:
+    """将Figure渲染为图片字节并关闭Figure"""
+    buffer = io.BytesIO()
+    try:
+        save_figure(fig, buffer, fmt, dpi)
+    finally:
+        close_figure(fig)
+    return buffer.getvalue()
+
+
+class ChartCache:
+    """磁盘图表缓存"""
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: Optional[int] = None):
+        """
+        初始化图表缓存
+
+        Args:
+            cache_dir: 缓存目录，默认为 temp/chart_cache
+            max_bytes: 缓存总大小上限，默认读取ANALYSIS_CONFIG
+        """
+        self.cache_dir = Path(cache_dir or PATHS['temp_dir'] / 'chart_cache')
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes or ANALYSIS_CONFIG.get('chart_cache_max_mb', 200) * 1024 * 1024
+        self.lock = threading.Lock()
+
+    def make_key(self, chart_type: str, *data: Any, fmt: str = 'png', dpi: int = 100, **params) -> str:
+        """
+        生成缓存键
+
+        Args:
+            chart_type: 图表类型（如DataAnalyzer的图表方法名）
+            data: 参与绘图的数据（逐个计算内容指纹）
+            fmt: 图片格式
+            dpi: 分辨率
+            params: 其他图表参数
+
+        Returns:
+            缓存键
+        """
+        parts = {
+            'version': CACHE_VERSION,
+            'chart_type': chart_type,
+            'data': [data_fingerprint(item) for item in data],
+            'fmt': fmt,
+            'dpi': dpi,
+            'params': params
+        }
+        raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str, fmt: str) -> Path:
+        return self.cache_dir / f"{key}.{fmt}"
+
+    def get(self, key: str, fmt: str = 'png') -> Optional[bytes]:
+        """读取缓存，命中时刷新访问时间"""
+        path = self._path(key, fmt)
+        try:
+            data = path.read_bytes()
+            os.utime(path, None)
+            return data
+        except OSError:
+            return None
+
+    def put(self, key: str, data: bytes, fmt: str = 'png'):
+        """写入缓存（先写临时文件再原子替换，多进程写同一键也安全）"""
+        path = self._path(key, fmt)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"写入图表缓存失败: {str(e)}")
+            tmp_path.unlink(missing_ok=True)
+            return
+        self._evict()
+
+    def get_or_render(self, key: str, render: Callable[[], Any], fmt: str = 'png', dpi: int = 100) -> Optional[bytes]:
+        """
+        读取缓存，未命中时渲染并写入
+
+        Args:
+            key: 缓存键
+            render: 返回matplotlib Figure的函数（可返回None）
+            fmt: 图片格式
+            dpi: 分辨率
+
+        Returns:
+            图片字节，render返回None时为None
+        """
+        data = self.get(key, fmt)
+        if data is not None:
+            return data
+
+        fig = render()
+        if fig is None:
+            return None
+        data = render_figure_bytes(fig, fmt, dpi)
+        self.put(key, data, fmt)
+        return data
+
+    def _evict(self):
+        """总大小超过上限时按最近访问时间淘汰"""
+        with self.lock:
+            entries = []
+            total = 0
+            for entry in os.scandir(self.cache_dir):
+                if not entry.is_file() or entry.name.endswith('.tmp'):
+                    continue
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+            if total <= self.max_bytes:
+                return
+
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+
+    def clear(self):
+        """清空缓存"""
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file():
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+
+# 进程内共享的图表缓存
+_chart_cache = None
+
+
+def get_chart_cache() -> ChartCache:
+    """获取进程内共享的图表缓存"""
+    global _chart_cache
+    if _chart_cache is None:
+        _chart_cache = ChartCache()
+    return _chart_cache
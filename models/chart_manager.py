@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+仪表盘图表管理模块
+复用画布上的Figure和图元，刷新时原地更新数据，避免每次重建Figure造成内存增长
+"""
+
+import math
+from typing import List, Optional, Sequence
+import logging
+
+import numpy as np
+
+from models import chart_backend
+
+logger = logging.getLogger(__name__)
+
+
+class BlitManager:
+    """
+    画布位块传输管理
+
+    完整重绘后缓存背景，之后只重绘动画图元并blit，适用于坐标轴不变的数据更新
+    """
+
+    def __init__(self, canvas, artists: Sequence = ()):
+        self.canvas = canvas
+        self.background = None
+        self.artists = []
+        for artist in artists:
+            self.add_artist(artist)
+        self.cid = canvas.mpl_connect('draw_event', self._on_draw)
+
+    def add_artist(self, artist):
+        """注册需要逐帧更新的图元"""
+        artist.set_animated(True)
+        self.artists.append(artist)
+
+    def _on_draw(self, event):
+        """完整重绘后缓存不含动画图元的背景"""
+        if event is not None and event.canvas is not self.canvas:
+            return
+        self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        """绘制动画图元"""
+        figure = self.canvas.figure
+        for artist in self.artists:
+            if artist.get_visible():
+                figure.draw_artist(artist)
+
+    def blit(self) -> bool:
+        """
+        只重绘动画图元
+
+        Returns:
+            背景尚未缓存（需要完整重绘）时返回False
+        """
+        if self.background is None:
+            return False
+        self.canvas.restore_region(self.background)
+        self._draw_animated()
+        self.canvas.blit(self.canvas.figure.bbox)
+        self.canvas.flush_events()
+        return True
+
+    def disconnect(self):
+        """断开绘制事件"""
+        self.canvas.mpl_disconnect(self.cid)
+
+
+class TrendPanel:
+    """折线图面板，刷新时更新Line2D数据"""
+
+    def __init__(self, canvas, title: str, empty_title: str, xlabel: str, ylabel: str):
+        self.canvas = canvas
+        self.title = title
+        self.empty_title = empty_title
+        self.figure = canvas.figure
+        self.figure.clear()
+        self.ax = self.figure.add_subplot(111)
+        self.ax.set_xlabel(xlabel)
+        self.ax.set_ylabel(ylabel)
+        self.ax.grid(True, alpha=0.3)
+        self.line, = self.ax.plot([], [], marker='o', linewidth=2, markersize=6)
+        self.empty_text = self.ax.text(0.5, 0.5, '暂无数据', ha='center', va='center',
+                                       transform=self.ax.transAxes, fontsize=14)
+        self.blitter = BlitManager(canvas, [self.line])
+        self.labels: Optional[List[str]] = None
+        self.values: Optional[List[float]] = None
+        self.show_empty()
+
+    def show_empty(self):
+        """显示空状态"""
+        if self.labels is None and self.values is None and not self.line.get_visible():
+            return
+        self.labels = None
+        self.values = None
+        self.line.set_data([], [])
+        self.line.set_visible(False)
+        self.empty_text.set_visible(True)
+        self.ax.set_title(self.empty_title)
+        self.ax.set_xticks([])
+        self.canvas.draw_idle()
+
+    def update(self, labels: List[str], values: List[float]):
+        """
+        更新折线数据
+
+        横轴标签不变且新数据在当前纵轴范围内时只blit折线，否则重新计算坐标轴并完整重绘
+        """
+        labels = list(labels)
+        values = list(values)
+        if labels == self.labels and values == self.values:
+            return
+
+        same_axis = labels == self.labels and self.line.get_visible()
+        x = np.arange(len(labels))
+        self.line.set_data(x, values)
+        self.labels = labels
+        self.values = values
+
+        if same_axis:
+            bottom, top = self.ax.get_ylim()
+            if values and bottom <= min(values) and max(values) <= top and self.blitter.blit():
+                return
+
+        self.line.set_visible(True)
+        self.empty_text.set_visible(False)
+        self.ax.set_title(self.title)
+        self.ax.set_xticks(x)
+        self.ax.set_xticklabels(labels, rotation=45, ha='right')
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.canvas.draw_idle()
+
+
+class PiePanel:
+    """饼图面板，类别不变时原地调整扇区角度"""
+
+    def __init__(self, canvas, title: str, empty_title: str):
+        self.canvas = canvas
+        self.title = title
+        self.empty_title = empty_title
+        self.figure = canvas.figure
+        self.figure.clear()
+        self.ax = self.figure.add_subplot(111)
+        self.labels: Optional[List[str]] = None
+        self.values: Optional[List[float]] = None
+        self.wedges = []
+        self.texts = []
+        self.autotexts = []
+        self.empty = False
+        self.show_empty()
+
+    def show_empty(self):
+        """显示空状态"""
+        if self.empty:
+            return
+        self.ax.cla()
+        self.ax.text(0.5, 0.5, '暂无数据', ha='center', va='center', transform=self.ax.transAxes, fontsize=14)
+        self.ax.set_title(self.empty_title)
+        self.ax.axis('off')
+        self.labels = None
+        self.values = None
+        self.wedges, self.texts, self.autotexts = [], [], []
+        self.empty = True
+        self.canvas.draw_idle()
+
+    def update(self, labels: List[str], values: List[float]):
+        """更新饼图数据"""
+        labels = list(labels)
+        values = list(values)
+        if labels == self.labels and values == self.values:
+            return
+
+        if labels == self.labels and self.wedges:
+            self._update_angles(values)
+        else:
+            self._rebuild(labels, values)
+        self.labels = labels
+        self.values = values
+        self.canvas.draw_idle()
+
+    def _rebuild(self, labels: List[str], values: List[float]):
+        """类别变化时在同一坐标轴上重新绘制"""
+        self.ax.cla()
+        colors = chart_backend.palette('Set3', len(labels))
+        self.wedges, self.texts, self.autotexts = self.ax.pie(
+            values, labels=labels, autopct='%1.1f%%', colors=colors, startangle=90
+        )
+        self.ax.set_title(self.title)
+        self.empty = False
+
+    def _update_angles(self, values: List[float]):
+        """按新数值调整扇区角度及标签位置（与Axes.pie的布局一致）"""
+        total = float(sum(values)) or 1.0
+        theta1 = 90.0
+        for wedge, text, autotext, value in zip(self.wedges, self.texts, self.autotexts, values):
+            theta2 = theta1 + 360.0 * value / total
+            wedge.set_theta1(theta1)
+            wedge.set_theta2(theta2)
+
+            mid = math.radians((theta1 + theta2) / 2)
+            radius = wedge.r
+            text.set_position((1.1 * radius * math.cos(mid), 1.1 * radius * math.sin(mid)))
+            text.set_horizontalalignment('left' if math.cos(mid) > 0 else 'right')
+            autotext.set_position((0.6 * radius * math.cos(mid), 0.6 * radius * math.sin(mid)))
+            autotext.set_text(f"{100.0 * value / total:.1f}%")
+            theta1 = theta2
+
+
+class DashboardChartManager:
+    """主界面仪表盘图表管理器"""
+
+    def __init__(self, trends_canvas, platform_canvas):
+        """
+        Args:
+            trends_canvas: 趋势图画布
+            platform_canvas: 平台分布图画布
+        """
+        self.trends_canvas = trends_canvas
+        self.platform_canvas = platform_canvas
+        self.trends = TrendPanel(trends_canvas, '数据导入趋势', '粉丝增长趋势', '日期', '导入次数')
+        self.platforms = PiePanel(platform_canvas, '平台数据分布', '平台分布')
+
+    def owns(self, trends_canvas, platform_canvas) -> bool:
+        """是否绑定在给定的画布上（主界面重建后需要新的管理器）"""
+        return self.trends_canvas is trends_canvas and self.platform_canvas is platform_canvas
+
+    def show_empty(self):
+        """两个图表都显示空状态"""
+        with chart_backend.draw_lock:
+            self.trends.show_empty()
+            self.platforms.show_empty()
+
+    def update_trends(self, dates: List[str], counts: List[float]):
+        """更新趋势图（与后台图表渲染互斥）"""
+        with chart_backend.draw_lock:
+            if not dates:
+                self.trends.show_empty()
+                return
+            self.trends.update(dates, counts)
+
+    def update_platforms(self, platforms: List[str], counts: List[float]):
+        """更新平台分布图（与后台图表渲染互斥）"""
+        with chart_backend.draw_lock:
+            if not platforms:
+                self.platforms.show_empty()
+                return
+            self.platforms.update(platforms, counts)
+
+    def close(self):
+        """释放绘制事件连接"""
+        self.trends.blitter.disconnect()
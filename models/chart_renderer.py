@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+离屏图表渲染模块
+在进程池中使用Agg后端并行渲染图表，工作进程只接收预聚合数据，已缓存的图表直接复用
+
+工作进程以spawn方式启动：渲染由界面进程的后台线程发起，此时AI任务线程、预加载线程等可能持有锁，
+fork出的子进程会继承这些锁而死锁
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Tuple, Optional, Any
+import logging
+
+from config import ANALYSIS_CONFIG
+from models.chart_cache import get_chart_cache
+
+logger = logging.getLogger(__name__)
+
+# 工作进程内复用的分析器
+_worker_analyzer = None
+
+
+class ChartTask:
+    """单个图表渲染任务"""
+
+    def __init__(self, name: str, builder: str, args: Tuple[Any, ...], file_path: str):
+        """
+        Args:
+            name: 图表名称
+            builder: DataAnalyzer上的图表方法名
+            args: 图表方法参数（聚合立方体、相关系数矩阵等，需可pickle，spawn启动的工作进程通过pickle接收）
+            file_path: 输出文件路径
+        """
+        self.name = name
+        self.builder = builder
+        self.args = args
+        self.file_path = file_path
+        self.fmt = os.path.splitext(file_path)[1].lstrip('.').lower() or 'png'
+
+
+def _init_worker():
+    """工作进程初始化：切换到无界面的Agg后端（spawn启动的进程尚未加载matplotlib，在导入绘图模块前设置）"""
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+
+
+def _render_task(task: ChartTask, dpi: int) -> Tuple[str, str]:
+    """在工作进程中渲染（或从缓存读取）并保存一个图表"""
+    global _worker_analyzer
+    from models.data_analyzer import DataAnalyzer
+
+    if _worker_analyzer is None:
+        _worker_analyzer = DataAnalyzer()
+
+    data = _worker_analyzer.render_chart(task.builder, *task.args, fmt=task.fmt, dpi=dpi)
+    if data is None:
+        return task.name, ""
+    with open(task.file_path, 'wb') as f:
+        f.write(data)
+    return task.name, task.file_path
+
+
+def render_charts(tasks: List[ChartTask], dpi: Optional[int] = None,
+                  max_workers: Optional[int] = None) -> List[Tuple[str, str, Optional[str]]]:
+    """
+    并行渲染图表
+
+    Args:
+        tasks: 渲染任务列表
+        dpi: 输出分辨率
+        max_workers: 进程数，默认读取ANALYSIS_CONFIG
+
+    Returns:
+        [(图表名称, 文件路径, 错误信息)]，按任务顺序排列；成功时错误信息为None
+    """
+    if not tasks:
+        return []
+
+    dpi = dpi or ANALYSIS_CONFIG.get('chart_export_dpi', 300)
+    results = {}
+
+    # 已缓存的图表直接写出，只把未命中的任务交给进程池
+    cache = get_chart_cache()
+    pending = []
+    for task in tasks:
+        data = cache.get(cache.make_key(task.builder, *task.args, fmt=task.fmt, dpi=dpi), task.fmt)
+        if data is None:
+            pending.append(task)
+            continue
+        try:
+            with open(task.file_path, 'wb') as f:
+                f.write(data)
+            results[task.name] = (task.name, task.file_path, None)
+        except OSError as e:
+            results[task.name] = (task.name, "", str(e))
+
+    if pending:
+        logger.info(f"图表缓存命中 {len(tasks) - len(pending)} 个，渲染 {len(pending)} 个")
+        _render_pending(pending, dpi, max_workers, results)
+
+    return [results[task.name] for task in tasks]
+
+
+def _render_pending(tasks: List[ChartTask], dpi: int, max_workers: Optional[int], results: dict):
+    """在进程池中渲染未命中缓存的任务"""
+    max_workers = max_workers or ANALYSIS_CONFIG.get('chart_render_workers') or os.cpu_count() or 1
+    max_workers = min(max_workers, len(tasks))
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                             mp_context=multiprocessing.get_context('spawn')) as executor:
+        futures = {executor.submit(_render_task, task, dpi): task for task in tasks}
+        for future in as_completed(futures):
+            task = futures[future]
+            try:
+                name, file_path = future.result()
+                results[task.name] = (name, file_path, None)
+            except Exception as e:
+                logger.error(f"渲染图表 {task.name} 失败: {str(e)}")
+                results[task.name] = (task.name, "", str(e))
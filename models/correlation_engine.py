@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+相关性分析引擎
+分块float32计算缺失值感知的两两Pearson相关系数，支持强相关字段对提取、聚类排序和显著子矩阵筛选
+"""
+
+import warnings
+from typing import List, Optional, Tuple
+import logging
+
+import numpy as np
+import pandas as pd
+
+from config import ANALYSIS_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class CorrelationEngine:
+    """宽数值表的相关系数计算引擎"""
+
+    def __init__(self, chunk_size: Optional[int] = None, min_periods: int = 3):
+        """
+        初始化相关性引擎
+
+        Args:
+            chunk_size: 每块的列数，默认读取ANALYSIS_CONFIG
+            min_periods: 两列同时非空的最少样本数，不足时相关系数为NaN
+        """
+        self.chunk_size = chunk_size or ANALYSIS_CONFIG.get('correlation_chunk_size', 256)
+        self.min_periods = min_periods
+
+    def compute(self, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """
+        计算数值列的相关系数矩阵（按两列同时非空的行计算，常量列不参与）
+
+        Args:
+            df: 原始数据
+
+        Returns:
+            相关系数矩阵，数值列不足两列时返回None
+        """
+        numeric = df.select_dtypes(include=[np.number])
+        if numeric.shape[1] < 2:
+            return None
+
+        values = numeric.to_numpy(dtype=np.float64, na_value=np.nan)
+        # 常量列和全空列没有相关性可言，直接跳过
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            std = np.nanstd(values, axis=0)
+        keep = np.isfinite(std) & (std > 0)
+        if keep.sum() < 2:
+            return None
+
+        columns = numeric.columns[keep]
+        matrix = self.pairwise(values[:, keep])
+        return pd.DataFrame(matrix, index=columns, columns=columns)
+
+    def pairwise(self, values: np.ndarray) -> np.ndarray:
+        """
+        分块计算两两Pearson相关系数
+
+        Args:
+            values: (行数, 列数) 数值数组，缺失值为NaN
+
+        Returns:
+            (列数, 列数) float32相关系数矩阵
+        """
+        # 先按列标准化（float64统计量）再转float32，避免大数值求和时精度丢失
+        mean = np.nanmean(values, axis=0)
+        std = np.nanstd(values, axis=0)
+        std[~np.isfinite(std) | (std == 0)] = 1.0
+        z = ((values - mean) / std).astype(np.float32)
+
+        mask = ~np.isnan(z)
+        has_missing = not mask.all()
+        if has_missing:
+            z[~mask] = 0.0
+            present = mask.astype(np.float32)
+
+        n_cols = z.shape[1]
+        result = np.empty((n_cols, n_cols), dtype=np.float32)
+        starts = range(0, n_cols, self.chunk_size)
+
+        for i in starts:
+            a = slice(i, min(i + self.chunk_size, n_cols))
+            for j in starts:
+                if j < i:
+                    continue
+                b = slice(j, min(j + self.chunk_size, n_cols))
+                if has_missing:
+                    block = self._block_with_missing(z[:, a], z[:, b], present[:, a], present[:, b])
+                else:
+                    block = self._block_complete(z[:, a], z[:, b])
+                result[a, b] = block
+                result[b, a] = block.T
+
+        np.fill_diagonal(result, 1.0)
+        return result
+
+    def _block_complete(self, za: np.ndarray, zb: np.ndarray) -> np.ndarray:
+        """无缺失值的块：标准化后相关系数即内积"""
+        n = za.shape[0]
+        if n < self.min_periods:
+            return np.full((za.shape[1], zb.shape[1]), np.nan, dtype=np.float32)
+        block = (za.T @ zb) / np.float32(n)
+        return np.clip(block, -1.0, 1.0)
+
+    def _block_with_missing(self, za: np.ndarray, zb: np.ndarray,
+                            pa: np.ndarray, pb: np.ndarray) -> np.ndarray:
+        """有缺失值的块：按两列同时非空的行重新计算均值和方差"""
+        count = pa.T @ pb
+        sum_a = za.T @ pb
+        sum_b = pa.T @ zb
+        sum_aa = (za * za).T @ pb
+        sum_bb = pa.T @ (zb * zb)
+        sum_ab = za.T @ zb
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = count * sum_ab - sum_a * sum_b
+            var_a = count * sum_aa - sum_a * sum_a
+            var_b = count * sum_bb - sum_b * sum_b
+            block = cov / np.sqrt(var_a * var_b)
+        block[(count < self.min_periods) | (var_a <= 0) | (var_b <= 0)] = np.nan
+        return np.clip(block, -1.0, 1.0)
+
+    @staticmethod
+    def top_pairs(matrix: pd.DataFrame, n: int = 20, min_abs: float = 0.0) -> List[Tuple[str, str, float]]:
+        """
+        提取相关系数绝对值最大的字段对
+
+        Args:
+            matrix: 相关系数矩阵
+            n: 返回的字段对数量
+            min_abs: 相关系数绝对值下限
+
+        Returns:
+            [(字段A, 字段B, 相关系数)]，按绝对值降序排列
+        """
+        values = matrix.to_numpy()
+        rows, cols = np.triu_indices(len(values), k=1)
+        strength = np.abs(values[rows, cols])
+        strength = np.where(np.isnan(strength), -1.0, strength)
+
+        n = min(n, len(strength))
+        if n <= 0:
+            return []
+        # 只对前n个做排序
+        candidates = np.argpartition(-strength, n - 1)[:n]
+        candidates = candidates[np.argsort(-strength[candidates], kind='stable')]
+
+        labels = matrix.columns
+        return [(labels[rows[k]], labels[cols[k]], float(values[rows[k], cols[k]]))
+                for k in candidates if strength[k] >= min_abs]
+
+    @staticmethod
+    def cluster_order(matrix: pd.DataFrame) -> List[str]:
+        """
+        按相关性聚类排序字段，使强相关的字段相邻
+
+        Args:
+            matrix: 相关系数矩阵
+
+        Returns:
+            排序后的字段列表
+        """
+        labels = list(matrix.columns)
+        if len(labels) < 3:
+            return labels
+
+        distance = 1.0 - np.abs(np.nan_to_num(matrix.to_numpy(dtype=np.float64), nan=0.0))
+        np.fill_diagonal(distance, 0.0)
+        distance = (distance + distance.T) / 2
+
+        try:
+            from scipy.cluster.hierarchy import linkage, leaves_list, optimal_leaf_ordering
+            from scipy.spatial.distance import squareform
+            condensed = squareform(np.clip(distance, 0.0, None), checks=False)
+            tree = optimal_leaf_ordering(linkage(condensed, method='average'), condensed)
+            return [labels[i] for i in leaves_list(tree)]
+        except ImportError:
+            pass
+
+        # 没有scipy时用最近邻贪心排序
+        order = [int(np.argmin(distance.sum(axis=1)))]
+        remaining = set(range(len(labels))) - set(order)
+        while remaining:
+            last = order[-1]
+            nearest = min(remaining, key=lambda k: distance[last, k])
+            order.append(nearest)
+            remaining.remove(nearest)
+        return [labels[i] for i in order]
+
+    def significant_subset(self, matrix: pd.DataFrame, threshold: Optional[float] = None,
+                           max_columns: Optional[int] = None) -> pd.DataFrame:
+        """
+        筛选显著相关的子矩阵并按聚类顺序排列
+
+        Args:
+            matrix: 相关系数矩阵
+            threshold: 相关系数绝对值阈值，默认读取ANALYSIS_CONFIG
+            max_columns: 最多保留的字段数，默认读取ANALYSIS_CONFIG
+
+        Returns:
+            子矩阵（没有字段超过阈值时保留最强的字段）
+        """
+        threshold = ANALYSIS_CONFIG.get('correlation_threshold', 0.3) if threshold is None else threshold
+        max_columns = max_columns or ANALYSIS_CONFIG.get('correlation_max_columns', 30)
+
+        # 每个字段与其他字段的最强相关（不含自身）
+        strength = np.nan_to_num(np.abs(matrix.to_numpy(dtype=np.float64)), nan=0.0)
+        np.fill_diagonal(strength, 0.0)
+        best = pd.Series(strength.max(axis=1), index=matrix.columns)
+
+        selected = best[best >= threshold]
+        if len(selected) < 2:
+            selected = best
+        selected = selected.sort_values(ascending=False, kind='stable').head(max_columns)
+
+        if len(selected) < len(matrix.columns):
+            logger.info(f"相关性热力图: {len(matrix.columns)} 个字段 -> {len(selected)} 个显著字段")
+
+        subset = matrix.loc[selected.index, selected.index]
+        order = self.cluster_order(subset)
+        return subset.loc[order, order]
+
+
+# 进程内共享的相关性引擎
+_correlation_engine = None
+
+
+def get_correlation_engine() -> CorrelationEngine:
+    """获取进程内共享的相关性引擎"""
+    global _correlation_engine
+    if _correlation_engine is None:
+        _correlation_engine = CorrelationEngine()
+    return _correlation_engine
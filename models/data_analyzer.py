@@ -1,23 +1,22 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from wordcloud import WordCloud
-from textblob import TextBlob
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 from typing import Dict, List, Any, Tuple
+import os
 import re
 from collections import Counter
 import warnings
 warnings.filterwarnings('ignore')
-import matplotlib
-matplotlib.use('qtagg')
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from datetime import datetime, timedelta
 import json
 
+from config import ANALYSIS_CONFIG
+from models import chart_backend
+from models.aggregation_cube import AggregationCube
+from models.chart_cache import data_fingerprint, get_chart_cache, render_figure_bytes
+from models.wordcloud_service import get_wordcloud_service
+from models.correlation_engine import get_correlation_engine
+from models.downsampling import plot_downsampled
+
 class DataAnalyzer:
     """数据分析类，用于社交媒体数据分析"""
     
@@ -25,17 +24,17 @@ class DataAnalyzer:
         self.data = None
         self.analysis_results = {}
         
-        # 设置中文字体
-        plt.rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei', 'Arial Unicode MS']
-        plt.rcParams['axes.unicode_minus'] = False
+        # 关键词频率缓存（load_data时清空）
+        self._keyword_cache = {}
         
-        # 设置图表样式
-        sns.set_style("whitegrid")
-        plt.style.use('seaborn-v0_8')
+        # 图表共用的聚合立方体（按数据内容指纹缓存）
+        self._cube = None
+        self._cube_key = None
         
     def load_data(self, data: pd.DataFrame):
         """加载数据"""
         self.data = data.copy()
+        self._keyword_cache = {}
         return True
         
     def basic_statistics(self) -> Dict[str, Any]:
@@ -158,17 +157,7 @@ class DataAnalyzer:
             }
             
             # 关键词分析（简化版本，不使用jieba）
-            all_text = " ".join(text_data.astype(str))
-            # 使用简单的分词方法
-            words = re.findall(r'\b\w+\b', all_text.lower())
-            word_freq = Counter(words)
-            
-            # 过滤停用词和短词
-            stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them', 'my', 'your', 'his', 'her', 'its', 'our', 'their', 'mine', 'yours', 'hers', 'ours', 'theirs'}
-            filtered_words = {word: count for word, count in word_freq.items() 
-                            if len(word) > 2 and word not in stop_words and not word.isdigit()}
-            
-            top_keywords = dict(sorted(filtered_words.items(), key=lambda x: x[1], reverse=True)[:20])
+            top_keywords = dict(list(self.keyword_frequencies(text_column).items())[:20])
             
             return {
                 "文本长度统计": length_stats,
@@ -179,8 +168,40 @@ class DataAnalyzer:
         except Exception as e:
             return {"error": f"内容分析失败: {str(e)}"}
             
+    def keyword_frequencies(self, text_column: str, top_n: int = 100) -> Dict[str, int]:
+        """
+        统计关键词频率（按数据集和列缓存，供内容分析和词云共用）
+        
+        Args:
+            text_column: 文本列
+            top_n: 保留的关键词数量
+            
+        Returns:
+            按频率降序排列的 {关键词: 次数}
+        """
+        cache_key = (text_column, top_n)
+        if cache_key in self._keyword_cache:
+            return self._keyword_cache[cache_key]
+        
+        text_data = self.data[text_column].dropna()
+        all_text = " ".join(text_data.astype(str))
+        # 使用简单的分词方法
+        words = re.findall(r'\b\w+\b', all_text.lower())
+        word_freq = Counter(words)
+        
+        # 过滤停用词和短词
+        stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them', 'my', 'your', 'his', 'her', 'its', 'our', 'their', 'mine', 'yours', 'hers', 'ours', 'theirs'}
+        filtered_words = {word: count for word, count in word_freq.items() 
+                        if len(word) > 2 and word not in stop_words and not word.isdigit()}
+        
+        keywords = dict(sorted(filtered_words.items(), key=lambda x: x[1], reverse=True)[:top_n])
+        self._keyword_cache[cache_key] = keywords
+        return keywords
+        
     def sentiment_analysis(self, text_column: str) -> Dict[str, Any]:
         """情感分析"""
+        from textblob import TextBlob
+        
         if self.data is None or text_column not in self.data.columns:
             return {"error": "数据未加载或文本列不存在"}
             
@@ -243,20 +264,14 @@ class DataAnalyzer:
                 pd.to_datetime(self.data[date_column]).dt.date
             )[engagement_column].mean()
             
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(
-                x=daily_engagement.index,
-                y=daily_engagement.values,
-                mode='lines+markers',
-                name='平均互动数'
-            ))
-            
-            fig.update_layout(
-                title="互动趋势分析",
-                xaxis_title="日期",
-                yaxis_title="平均互动数",
-                template="plotly_white"
-            )
+            with chart_backend.draw_lock:
+                fig, ax = chart_backend.subplots(figsize=(10, 6))
+                plot_downsampled(ax, daily_engagement.index, daily_engagement.values,
+                                 marker='o', label='平均互动数')
+                ax.set_title("互动趋势分析")
+                ax.set_xlabel("日期")
+                ax.set_ylabel("平均互动数")
+                fig.tight_layout()
             
             return {
                 "chart_type": "engagement_trend",
@@ -271,16 +286,14 @@ class DataAnalyzer:
         try:
             value_counts = self.data[column].value_counts().head(10)
             
-            fig = go.Figure(data=[
-                go.Bar(x=value_counts.values, y=value_counts.index, orientation='h')
-            ])
-            
-            fig.update_layout(
-                title=f"{column}分布",
-                xaxis_title="数量",
-                yaxis_title=column,
-                template="plotly_white"
-            )
+            with chart_backend.draw_lock:
+                fig, ax = chart_backend.subplots(figsize=(10, 6))
+                ax.barh([str(label) for label in value_counts.index], value_counts.values)
+                ax.invert_yaxis()
+                ax.set_title(f"{column}分布")
+                ax.set_xlabel("数量")
+                ax.set_ylabel(column)
+                fig.tight_layout()
             
             return {
                 "chart_type": "content_distribution",
@@ -299,16 +312,11 @@ class DataAnalyzer:
                 
             sentiment_dist = sentiment_result["情感分布"]
             
-            fig = go.Figure(data=[go.Pie(
-                labels=list(sentiment_dist.keys()),
-                values=list(sentiment_dist.values()),
-                hole=0.3
-            )])
-            
-            fig.update_layout(
-                title="情感分布",
-                template="plotly_white"
-            )
+            with chart_backend.draw_lock:
+                fig, ax = chart_backend.subplots(figsize=(6, 6))
+                ax.pie(list(sentiment_dist.values()), labels=list(sentiment_dist.keys()),
+                       autopct='%1.1f%%', wedgeprops={'width': 0.7})
+                ax.set_title("情感分布")
             
             return {
                 "chart_type": "sentiment_pie",
@@ -318,31 +326,33 @@ class DataAnalyzer:
         except Exception as e:
             return {"error": f"情感饼图生成失败: {str(e)}"}
             
-    def _create_wordcloud_chart(self, text_column: str) -> Dict[str, Any]:
-        """创建词云图"""
+    def _create_wordcloud_chart(self, text_column: str = None, word_freq: Dict[str, int] = None,
+                                width: int = None, height: int = None) -> Dict[str, Any]:
+        """
+        创建词云图
+        
+        Args:
+            text_column: 文本列（未提供word_freq时据此统计关键词）
+            word_freq: 预先统计的关键词频率
+            width, height: 输出像素尺寸，默认读取ANALYSIS_CONFIG
+        """
         try:
-            content_result = self.content_analysis(text_column)
-            if "error" in content_result:
-                return content_result
-                
-            word_freq = content_result["关键词频率"]
-            
-            # 生成词云
-            wordcloud = WordCloud(
-                width=800,
-                height=400,
-                background_color='white',
-                font_path=None  # 使用默认字体
-            ).generate_from_frequencies(word_freq)
-            
-            # 转换为图像数据
-            fig = go.Figure()
-            fig.add_trace(go.Image(z=wordcloud.to_array()))
-            
-            fig.update_layout(
-                title="关键词词云",
-                template="plotly_white"
-            )
+            if word_freq is None:
+                if self.data is None or text_column not in self.data.columns:
+                    return {"error": "数据未加载或文本列不存在"}
+                word_freq = self.keyword_frequencies(text_column)
+            
+            # 相同频率向量复用已完成的排版，直接按目标分辨率渲染
+            wordcloud = get_wordcloud_service().generate(word_freq, width, height)
+            
+            # 按原始像素尺寸显示（关键词统计和排版在锁外完成）
+            dpi = ANALYSIS_CONFIG.get('chart_dpi', 100)
+            image = wordcloud.to_array()
+            with chart_backend.draw_lock:
+                fig = chart_backend.new_figure(figsize=(wordcloud.width / dpi, wordcloud.height / dpi), dpi=dpi)
+                ax = fig.add_axes([0, 0, 1, 1])
+                ax.imshow(image, interpolation='nearest')
+                ax.axis('off')
             
             return {
                 "chart_type": "wordcloud",
@@ -370,44 +380,71 @@ class DataAnalyzer:
             print(f"报告导出失败: {str(e)}")
             return False
 
+    def get_cube(self, df) -> AggregationCube:
+        """
+        获取数据的聚合立方体，数据内容不变时只构建一次
+        
+        按内容指纹判断，原地修改的DataFrame（清洗、填充、覆盖列）也会重新构建
+        
+        Args:
+            df: 原始数据
+            
+        Returns:
+            聚合立方体
+        """
+        key = data_fingerprint(df)
+        if self._cube is None or self._cube_key != key:
+            self._cube = AggregationCube(df)
+            self._cube_key = key
+        return self._cube
+    
+    def _as_cube(self, data) -> AggregationCube:
+        """图表方法同时接受DataFrame和聚合立方体"""
+        if isinstance(data, AggregationCube):
+            return data
+        return self.get_cube(data)
+    
     def create_engagement_trend_chart(self, df, platform):
         """创建互动量趋势图"""
-        fig, ax = plt.subplots(figsize=(10, 6))
+        cube = self._as_cube(df)
+        fig, ax = chart_backend.subplots(figsize=(10, 6))
         
-        # 按日期分组计算平均互动量
-        if 'date' in df.columns:
-            df['date'] = pd.to_datetime(df['date'])
-            daily_engagement = df.groupby(df['date'].dt.date)['engagement'].mean()
+        # 按日期计算平均互动量
+        if cube.has_date:
+            daily_engagement = cube.mean_by('date')
             
-            ax.plot(daily_engagement.index, daily_engagement.values, 
-                   marker='o', linewidth=2, markersize=6, color='#1f77b4')
+            plot_downsampled(ax, daily_engagement.index, daily_engagement.values, 
+                            marker='o', linewidth=2, markersize=6, color='#1f77b4')
             ax.set_title(f'{platform}平台互动量趋势', fontsize=14, fontweight='bold')
             ax.set_xlabel('日期', fontsize=12)
             ax.set_ylabel('平均互动量', fontsize=12)
             ax.grid(True, alpha=0.3)
             
             # 旋转x轴标签
-            plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+            for label in ax.get_xticklabels():
+                label.set_rotation(45)
+                label.set_horizontalalignment('right')
             
         else:
             # 如果没有日期字段，按索引显示
-            ax.plot(range(len(df)), df['engagement'], 
-                   marker='o', linewidth=2, markersize=6, color='#1f77b4')
+            plot_downsampled(ax, np.arange(len(cube.point_values)), cube.point_values, 
+                            marker='o', linewidth=2, markersize=6, color='#1f77b4')
             ax.set_title(f'{platform}平台互动量趋势', fontsize=14, fontweight='bold')
             ax.set_xlabel('数据点', fontsize=12)
             ax.set_ylabel('互动量', fontsize=12)
             ax.grid(True, alpha=0.3)
         
-        plt.tight_layout()
+        fig.tight_layout()
         return fig
     
     def create_platform_comparison_chart(self, df):
         """创建平台对比图"""
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+        cube = self._as_cube(df)
+        fig, (ax1, ax2) = chart_backend.subplots(1, 2, figsize=(15, 6))
         
         # 平台互动量对比
-        platform_engagement = df.groupby('platform')['engagement'].mean().sort_values(ascending=True)
-        colors = plt.cm.Set3(np.linspace(0, 1, len(platform_engagement)))
+        platform_engagement = cube.mean_by('platform').sort_values(ascending=True)
+        colors = chart_backend.palette('Set3', len(platform_engagement))
         
         bars1 = ax1.barh(platform_engagement.index, platform_engagement.values, color=colors)
         ax1.set_title('各平台平均互动量对比', fontsize=14, fontweight='bold')
@@ -420,22 +457,23 @@ class DataAnalyzer:
                     f'{width:.0f}', ha='left', va='center', fontweight='bold')
         
         # 平台内容类型分布
-        content_dist = df.groupby(['platform', 'content_type']).size().unstack(fill_value=0)
-        content_dist.plot(kind='bar', ax=ax2, color=plt.cm.Set3(np.linspace(0, 1, len(content_dist.columns))))
+        content_dist = cube.crosstab('platform', 'content_type')
+        content_dist.plot(kind='bar', ax=ax2, color=chart_backend.palette('Set3', len(content_dist.columns)))
         ax2.set_title('各平台内容类型分布', fontsize=14, fontweight='bold')
         ax2.set_xlabel('平台', fontsize=12)
         ax2.set_ylabel('内容数量', fontsize=12)
         ax2.legend(title='内容类型', bbox_to_anchor=(1.05, 1), loc='upper left')
         
-        plt.tight_layout()
+        fig.tight_layout()
         return fig
     
     def create_sentiment_analysis_chart(self, df):
         """创建情感分析图"""
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+        cube = self._as_cube(df)
+        fig, (ax1, ax2) = chart_backend.subplots(1, 2, figsize=(15, 6))
         
         # 情感分布饼图
-        sentiment_counts = df['sentiment'].value_counts()
+        sentiment_counts = cube.counts('sentiment')
         colors = ['#2ecc71', '#e74c3c', '#f39c12']  # 正面、负面、中性
         wedges, texts, autotexts = ax1.pie(sentiment_counts.values, labels=sentiment_counts.index, 
                                           autopct='%1.1f%%', colors=colors, startangle=90)
@@ -447,23 +485,24 @@ class DataAnalyzer:
             autotext.set_fontweight('bold')
         
         # 各平台情感分布
-        platform_sentiment = df.groupby(['platform', 'sentiment']).size().unstack(fill_value=0)
+        platform_sentiment = cube.crosstab('platform', 'sentiment')
         platform_sentiment.plot(kind='bar', ax=ax2, color=colors)
         ax2.set_title('各平台情感分布', fontsize=14, fontweight='bold')
         ax2.set_xlabel('平台', fontsize=12)
         ax2.set_ylabel('内容数量', fontsize=12)
         ax2.legend(title='情感倾向', bbox_to_anchor=(1.05, 1), loc='upper left')
         
-        plt.tight_layout()
+        fig.tight_layout()
         return fig
     
     def create_content_type_analysis_chart(self, df):
         """创建内容类型分析图"""
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+        cube = self._as_cube(df)
+        fig, (ax1, ax2) = chart_backend.subplots(1, 2, figsize=(15, 6))
         
         # 内容类型互动量对比
-        content_engagement = df.groupby('content_type')['engagement'].mean().sort_values(ascending=True)
-        colors = plt.cm.Pastel1(np.linspace(0, 1, len(content_engagement)))
+        content_engagement = cube.mean_by('content_type').sort_values(ascending=True)
+        colors = chart_backend.palette('Pastel1', len(content_engagement))
         
         bars = ax1.barh(content_engagement.index, content_engagement.values, color=colors)
         ax1.set_title('各内容类型平均互动量', fontsize=14, fontweight='bold')
@@ -476,64 +515,76 @@ class DataAnalyzer:
                     f'{width:.0f}', ha='left', va='center', fontweight='bold')
         
         # 内容类型分布
-        content_counts = df['content_type'].value_counts()
+        content_counts = cube.counts('content_type')
         ax2.pie(content_counts.values, labels=content_counts.index, autopct='%1.1f%%', 
-               colors=plt.cm.Pastel1(np.linspace(0, 1, len(content_counts))))
+               colors=chart_backend.palette('Pastel1', len(content_counts)))
         ax2.set_title('内容类型分布', fontsize=14, fontweight='bold')
         
-        plt.tight_layout()
+        fig.tight_layout()
         return fig
     
+    def correlation_matrix(self, df):
+        """计算数值列的相关系数矩阵，数值列不足两列时返回None"""
+        return get_correlation_engine().compute(df)
+    
     def create_correlation_heatmap(self, df):
         """创建相关性热力图"""
-        # 选择数值型列
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        if len(numeric_cols) < 2:
+        correlation_matrix = self.correlation_matrix(df)
+        if correlation_matrix is None:
             return None
-            
-        correlation_matrix = df[numeric_cols].corr()
-        
-        fig, ax = plt.subplots(figsize=(8, 6))
-        sns.heatmap(correlation_matrix, annot=True, cmap='coolwarm', center=0, 
-                   square=True, ax=ax, fmt='.2f')
+        return self.plot_correlation_heatmap(correlation_matrix)
+    
+    def plot_correlation_heatmap(self, correlation_matrix):
+        """根据相关系数矩阵绘制热力图（只绘制显著相关字段的下三角，按聚类顺序排列）"""
+        return self._draw_correlation_heatmap(get_correlation_engine().significant_subset(correlation_matrix))
+    
+    def _draw_correlation_heatmap(self, subset):
+        """绘制已筛选、排序的相关系数矩阵"""
+        size = len(subset)
+        # 字段较多时放大画布并省略数值标注
+        side = min(max(8, size * 0.4), 20)
+        fig, ax = chart_backend.subplots(figsize=(side, side * 0.75))
+        mask = np.triu(np.ones((size, size), dtype=bool), k=1)
+        chart_backend.seaborn().heatmap(subset, mask=mask, annot=size <= 15, cmap='coolwarm', center=0,
+                                        vmin=-1, vmax=1, square=True, ax=ax, fmt='.2f')
         ax.set_title('数值字段相关性热力图', fontsize=14, fontweight='bold')
         
-        plt.tight_layout()
+        fig.tight_layout()
         return fig
     
     def create_summary_dashboard(self, df, platform):
         """创建综合仪表板"""
-        fig = plt.figure(figsize=(16, 12))
+        cube = self._as_cube(df)
+        fig = chart_backend.new_figure(figsize=(16, 12))
         
         # 创建子图布局
         gs = fig.add_gridspec(3, 3, hspace=0.3, wspace=0.3)
         
         # 1. 互动量趋势 (左上角，占2x2)
         ax1 = fig.add_subplot(gs[0:2, 0:2])
-        if 'date' in df.columns:
-            df['date'] = pd.to_datetime(df['date'])
-            daily_engagement = df.groupby(df['date'].dt.date)['engagement'].mean()
-            ax1.plot(daily_engagement.index, daily_engagement.values, 
-                    marker='o', linewidth=2, markersize=6, color='#1f77b4')
+        if cube.has_date:
+            daily_engagement = cube.mean_by('date')
+            plot_downsampled(ax1, daily_engagement.index, daily_engagement.values, 
+                             marker='o', linewidth=2, markersize=6, color='#1f77b4')
         else:
-            ax1.plot(range(len(df)), df['engagement'], 
-                    marker='o', linewidth=2, markersize=6, color='#1f77b4')
+            plot_downsampled(ax1, np.arange(len(cube.point_values)), cube.point_values, 
+                             marker='o', linewidth=2, markersize=6, color='#1f77b4')
         ax1.set_title(f'{platform}平台互动量趋势', fontsize=12, fontweight='bold')
-        ax1.set_xlabel('日期' if 'date' in df.columns else '数据点')
+        ax1.set_xlabel('日期' if cube.has_date else '数据点')
         ax1.set_ylabel('互动量')
         ax1.grid(True, alpha=0.3)
         
         # 2. 平台对比 (右上角)
         ax2 = fig.add_subplot(gs[0, 2])
-        platform_engagement = df.groupby('platform')['engagement'].mean()
+        platform_engagement = cube.mean_by('platform')
         ax2.bar(platform_engagement.index, platform_engagement.values, 
-               color=plt.cm.Set3(np.linspace(0, 1, len(platform_engagement))))
+               color=chart_backend.palette('Set3', len(platform_engagement)))
         ax2.set_title('平台互动量对比', fontsize=10, fontweight='bold')
         ax2.tick_params(axis='x', rotation=45)
         
         # 3. 情感分布 (中右)
         ax3 = fig.add_subplot(gs[1, 2])
-        sentiment_counts = df['sentiment'].value_counts()
+        sentiment_counts = cube.counts('sentiment')
         colors = ['#2ecc71', '#e74c3c', '#f39c12']
         ax3.pie(sentiment_counts.values, labels=sentiment_counts.index, 
                autopct='%1.1f%%', colors=colors)
@@ -541,9 +592,9 @@ class DataAnalyzer:
         
         # 4. 内容类型分布 (下右)
         ax4 = fig.add_subplot(gs[2, 2])
-        content_counts = df['content_type'].value_counts()
+        content_counts = cube.counts('content_type')
         ax4.bar(content_counts.index, content_counts.values, 
-               color=plt.cm.Pastel1(np.linspace(0, 1, len(content_counts))))
+               color=chart_backend.palette('Pastel1', len(content_counts)))
         ax4.set_title('内容类型分布', fontsize=10, fontweight='bold')
         ax4.tick_params(axis='x', rotation=45)
         
@@ -553,15 +604,16 @@ class DataAnalyzer:
         ax5.axis('off')
         
         # 计算统计信息
+        totals = cube.totals()
         stats_data = [
-            ['总数据量', f"{len(df)} 条"],
-            ['平均互动量', f"{df['engagement'].mean():.0f}"],
-            ['最高互动量', f"{df['engagement'].max():.0f}"],
-            ['最低互动量', f"{df['engagement'].min():.0f}"],
-            ['平台数量', f"{df['platform'].nunique()} 个"],
-            ['内容类型', f"{df['content_type'].nunique()} 种"],
-            ['正面内容', f"{len(df[df['sentiment']=='正面'])} 条"],
-            ['负面内容', f"{len(df[df['sentiment']=='负面'])} 条"]
+            ['总数据量', f"{totals['rows']} 条"],
+            ['平均互动量', f"{totals['mean'] or 0:.0f}"],
+            ['最高互动量', f"{totals['max'] or 0:.0f}"],
+            ['最低互动量', f"{totals['min'] or 0:.0f}"],
+            ['平台数量', f"{cube.nunique('platform')} 个"],
+            ['内容类型', f"{cube.nunique('content_type')} 种"],
+            ['正面内容', f"{int(sentiment_counts.get('正面', 0))} 条"],
+            ['负面内容', f"{int(sentiment_counts.get('负面', 0))} 条"]
         ]
         
         table = ax5.table(cellText=stats_data, colLabels=['指标', '数值'], 
@@ -571,18 +623,66 @@ class DataAnalyzer:
         table.scale(1, 2)
         ax5.set_title('数据统计摘要', fontsize=12, fontweight='bold', pad=20)
         
-        plt.tight_layout()
+        fig.tight_layout()
         return fig
     
     def get_chart_canvas(self, fig):
         """将matplotlib图表转换为PyQt画布"""
-        canvas = FigureCanvas(fig)
+        canvas = chart_backend.canvas_class()(fig)
         return canvas
     
+    def render_chart(self, builder: str, *args, fmt: str = 'png', dpi: int = None):
+        """
+        渲染图表为图片字节，优先使用磁盘缓存
+        
+        Args:
+            builder: 图表方法名（如create_summary_dashboard）
+            args: 图表方法参数（DataFrame、聚合立方体等，参与缓存键计算）
+            fmt: 图片格式（png/svg/pdf）
+            dpi: 分辨率，默认读取ANALYSIS_CONFIG
+            
+        Returns:
+            图片字节，图表无法生成时返回None
+        """
+        dpi = dpi or ANALYSIS_CONFIG.get('chart_dpi', 100)
+        cache = get_chart_cache()
+        key = cache.make_key(builder, *args, fmt=fmt, dpi=dpi)
+        data = cache.get(key, fmt)
+        if data is not None:
+            return data
+        
+        # 数据准备在锁外完成，只有绘图和保存与主线程的画布重绘互斥
+        draw, draw_args = self._chart_inputs(builder, args)
+        if draw is None:
+            return None
+        with chart_backend.draw_lock:
+            fig = draw(*draw_args)
+            if fig is None:
+                return None
+            data = render_figure_bytes(fig, fmt, dpi)
+        cache.put(key, data, fmt)
+        return data
+    
+    def _chart_inputs(self, builder: str, args: Tuple[Any, ...]):
+        """
+        预先计算图表所需的数据（相关系数矩阵、聚合立方体）
+        
+        Returns:
+            (绘图函数, 参数)，没有可绘制的数据时绘图函数为None
+        """
+        if builder in ('create_correlation_heatmap', 'plot_correlation_heatmap'):
+            matrix = self.correlation_matrix(args[0]) if builder == 'create_correlation_heatmap' else args[0]
+            if matrix is None:
+                return None, ()
+            return self._draw_correlation_heatmap, (get_correlation_engine().significant_subset(matrix),)
+        args = tuple(self.get_cube(arg) if isinstance(arg, pd.DataFrame) else arg for arg in args)
+        return getattr(self, builder), args
+    
     def save_chart(self, fig, file_path, dpi=300):
-        """保存图表到文件"""
+        """保存图表到文件（格式由扩展名决定，.svg/.pdf输出矢量图）"""
         try:
-            fig.savefig(file_path, dpi=dpi, bbox_inches='tight')
+            fmt = os.path.splitext(file_path)[1].lstrip('.').lower() or 'png'
+            chart_backend.save_figure(fig, file_path, fmt, dpi)
             return True
         except Exception as e:
             print(f"保存图表失败: {str(e)}")
@@ -76,6 +76,42 @@ class DatabaseManager:
         )
         ''')
         
+        # AI token用量表
+        c.execute('''
+        CREATE TABLE IF NOT EXISTS token_usage (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            task_id INTEGER,
+            request_type TEXT NOT NULL,
+            model TEXT NOT NULL,
+            prompt_tokens INTEGER NOT NULL DEFAULT 0,
+            completion_tokens INTEGER NOT NULL DEFAULT 0,
+            total_tokens INTEGER NOT NULL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id),
+            FOREIGN KEY (task_id) REFERENCES analysis_tasks (id)
+        )
+        ''')
+        
+        # AI后台任务表（应用重启后继续执行未完成的任务）
+        c.execute('''
+        CREATE TABLE IF NOT EXISTS ai_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            task_id INTEGER,
+            job_type TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            result TEXT,
+            error TEXT,
+            delivered INTEGER NOT NULL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id),
+            FOREIGN KEY (task_id) REFERENCES analysis_tasks (id)
+        )
+        ''')
+        
         conn.commit()
         conn.close()
         
@@ -207,6 +243,139 @@ class DatabaseManager:
         conn.close()
         return imports
         
+    def add_token_usage(self, user_id, task_id, request_type, model,
+                        prompt_tokens, completion_tokens, total_tokens):
+        """记录一次AI调用的token用量"""
+        conn = sqlite3.connect(self.db_name)
+        c = conn.cursor()
+        c.execute("""
+            INSERT INTO token_usage (user_id, task_id, request_type, model,
+                                     prompt_tokens, completion_tokens, total_tokens)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (user_id, task_id, request_type, model,
+              prompt_tokens, completion_tokens, total_tokens))
+        conn.commit()
+        usage_id = c.lastrowid
+        conn.close()
+        return usage_id
+        
+    def get_token_usage_by_task(self, user_id):
+        """按分析任务汇总token用量，用于统计每份报告/方案的成本"""
+        conn = sqlite3.connect(self.db_name)
+        c = conn.cursor()
+        c.execute("""
+            SELECT tu.task_id, at.task_name, COUNT(*), SUM(tu.prompt_tokens),
+                   SUM(tu.completion_tokens), SUM(tu.total_tokens)
+            FROM token_usage tu
+            LEFT JOIN analysis_tasks at ON tu.task_id = at.id
+            WHERE tu.user_id = ?
+            GROUP BY tu.task_id
+            ORDER BY MAX(tu.created_at) DESC
+        """, (user_id,))
+        usage = c.fetchall()
+        conn.close()
+        return usage
+        
+    def add_ai_job(self, user_id, job_type, payload, task_id=None):
+        """添加AI后台任务，payload为JSON字符串"""
+        conn = sqlite3.connect(self.db_name)
+        c = conn.cursor()
+        c.execute("INSERT INTO ai_jobs (user_id, task_id, job_type, payload) VALUES (?, ?, ?, ?)", 
+                  (user_id, task_id, job_type, payload))
+        conn.commit()
+        job_id = c.lastrowid
+        conn.close()
+        return job_id
+        
+    def claim_next_ai_job(self):
+        """领取最早的待执行任务并标记为执行中（多线程安全）"""
+        conn = sqlite3.connect(self.db_name, timeout=30, isolation_level=None)
+        c = conn.cursor()
+        try:
+            c.execute("BEGIN IMMEDIATE")
+            c.execute("""
+                SELECT id, user_id, task_id, job_type, payload 
+                FROM ai_jobs 
+                WHERE status = 'pending' 
+                ORDER BY id 
+                LIMIT 1
+            """)
+            job = c.fetchone()
+            if job:
+                c.execute("UPDATE ai_jobs SET status = 'running', updated_at = CURRENT_TIMESTAMP WHERE id = ?", 
+                          (job[0],))
+            c.execute("COMMIT")
+            return job
+        except sqlite3.Error:
+            c.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        
+    def update_ai_job(self, job_id, status, result=None, error=None):
+        """更新AI任务状态和结果"""
+        conn = sqlite3.connect(self.db_name)
+        c = conn.cursor()
+        c.execute("""
+            UPDATE ai_jobs 
+            SET status = ?, result = ?, error = ?, updated_at = CURRENT_TIMESTAMP 
+            WHERE id = ?
+        """, (status, result, error, job_id))
+        conn.commit()
+        conn.close()
+        
+    def mark_ai_job_delivered(self, job_id):
+        """
+        认领任务结果的处理权（原子操作）
+
+        Returns:
+            是否认领成功；已被其他调用方标记时返回False，调用方不应再处理
+        """
+        conn = sqlite3.connect(self.db_name)
+        c = conn.cursor()
+        c.execute("UPDATE ai_jobs SET delivered = 1 WHERE id = ? AND delivered = 0", (job_id,))
+        claimed = c.rowcount == 1
+        conn.commit()
+        conn.close()
+        return claimed
+        
+    def get_ai_job(self, job_id):
+        """获取单个AI任务"""
+        conn = sqlite3.connect(self.db_name)
+        c = conn.cursor()
+        c.execute("""
+            SELECT id, user_id, task_id, job_type, payload, status, result, error, created_at 
+            FROM ai_jobs 
+            WHERE id = ?
+        """, (job_id,))
+        job = c.fetchone()
+        conn.close()
+        return job
+        
+    def get_undelivered_ai_jobs(self, user_id):
+        """获取已结束但结果尚未被界面处理的任务"""
+        conn = sqlite3.connect(self.db_name)
+        c = conn.cursor()
+        c.execute("""
+            SELECT id, user_id, task_id, job_type, payload, status, result, error, created_at 
+            FROM ai_jobs 
+            WHERE user_id = ? AND status IN ('completed', 'failed') AND delivered = 0 
+            ORDER BY id
+        """, (user_id,))
+        jobs = c.fetchall()
+        conn.close()
+        return jobs
+        
+    def reset_running_ai_jobs(self):
+        """将上次退出时仍在执行的任务重新置为待执行"""
+        conn = sqlite3.connect(self.db_name)
+        c = conn.cursor()
+        c.execute("UPDATE ai_jobs SET status = 'pending', updated_at = CURRENT_TIMESTAMP WHERE status = 'running'")
+        conn.commit()
+        count = c.rowcount
+        conn.close()
+        return count
+        
     def get_latest_marketing_plan(self, user_id):
         """获取用户最新的营销方案"""
         try:
@@ -6,11 +6,15 @@ DeepSeek AI API 服务模块
 """
 
 import requests
-import json
 import time
 from typing import Dict, List, Optional, Any
 import logging
 
+from config import AI_CONFIG
+from models.rate_limiter import get_rate_limiter, estimate_request_tokens, extract_usage, parse_retry_after
+from models.single_flight import ai_single_flight, make_request_key
+from models.structured_output import record_to_dict, request_record
+
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -29,6 +33,12 @@ class DeepSeekAPI:
         self.api_key = api_key
         self.base_url = base_url
         self.session = requests.Session()
+        self.rate_limiter = get_rate_limiter()
+        
+        # token用量记录（由控制器在登录后设置）
+        self.usage_db = None
+        self.user_id = None
+        self.task_id = None
         
         if api_key:
             self.session.headers.update({
@@ -44,196 +54,171 @@ class DeepSeekAPI:
             "Content-Type": "application/json"
         })
     
-    def analyze_social_media_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def set_usage_context(self, db, user_id, task_id=None):
         """
-        分析社交媒体数据
+        设置token用量记录上下文
         
         Args:
-            data: 社交媒体数据
-            
-        Returns:
-            分析结果
+            db: DatabaseManager实例
+            user_id: 当前用户ID
+            task_id: 关联的分析任务ID（用于按报告统计成本）
         """
-        if not self.api_key:
-            return {"error": "API密钥未设置"}
-        
-        try:
-            # 构建分析提示
-            prompt = self._build_analysis_prompt(data)
-            
-            # 调用API
-            response = self._call_api(prompt)
-            
-            return self._parse_analysis_response(response)
-            
-        except Exception as e:
-            logger.error(f"分析社交媒体数据时出错: {str(e)}")
-            return {"error": f"分析失败: {str(e)}"}
+        self.usage_db = db
+        self.user_id = user_id
+        self.task_id = task_id
     
-    def generate_marketing_strategy(self, analysis_result: Dict[str, Any], 
-                                  target_audience: str = None) -> Dict[str, Any]:
+    def generate_marketing_plan(self, analysis_data: str) -> str:
         """
-        生成营销策略
+        生成营销方案
         
         Args:
-            analysis_result: 数据分析结果
-            target_audience: 目标受众
+            analysis_data: 分析数据字符串
             
         Returns:
-            营销策略
+            营销方案内容，失败时为以"错误："或"生成营销方案失败"开头的提示
         """
-        if not self.api_key:
-            return {"error": "API密钥未设置"}
-        
         try:
-            # 构建策略生成提示
-            prompt = self._build_strategy_prompt(analysis_result, target_audience)
-            
-            # 调用API
-            response = self._call_api(prompt)
-            
-            return self._parse_strategy_response(response)
-            
+            return self.request_marketing_plan(analysis_data)
+        except ValueError as e:
+            return f"错误：{str(e)}"
         except Exception as e:
-            logger.error(f"生成营销策略时出错: {str(e)}")
-            return {"error": f"策略生成失败: {str(e)}"}
+            logger.error(f"生成营销方案时出错: {str(e)}")
+            return f"生成营销方案失败: {str(e)}"
     
-    def generate_content_suggestions(self, topic: str, platform: str, 
-                                   content_type: str = "post") -> Dict[str, Any]:
+    def request_marketing_plan(self, analysis_data: str) -> str:
         """
-        生成内容建议
+        生成营销方案（失败时抛出异常，供后台任务记录为失败）
         
         Args:
-            topic: 主题
-            platform: 平台
-            content_type: 内容类型
+            analysis_data: 分析数据字符串
             
         Returns:
-            内容建议
+            营销方案内容
+            
+        Raises:
+            ValueError: API密钥未设置或响应格式异常
+            requests.exceptions.RequestException: 请求失败
         """
         if not self.api_key:
-            return {"error": "API密钥未设置"}
+            raise ValueError("API密钥未设置，请先在设置中配置API密钥。")
         
-        try:
-            # 构建内容生成提示
-            prompt = self._build_content_prompt(topic, platform, content_type)
-            
-            # 调用API
-            response = self._call_api(prompt)
-            
-            return self._parse_content_response(response)
-            
-        except Exception as e:
-            logger.error(f"生成内容建议时出错: {str(e)}")
-            return {"error": f"内容生成失败: {str(e)}"}
+        # 构建营销方案生成提示
+        prompt = self._build_marketing_plan_prompt(analysis_data)
+        
+        # 调用API
+        response = self._call_api(prompt, model="deepseek-chat", request_type="marketing_plan")
+        return self._format_marketing_plan(self._response_content(response))
     
-    def generate_marketing_plan(self, analysis_data: str) -> str:
+    def predict_trends(self, prompt: str) -> str:
         """
-        生成营销方案
+        预测趋势
         
         Args:
-            analysis_data: 分析数据字符串
+            prompt: 预测提示词
             
         Returns:
-            营销方案内容
+            趋势预测结果，失败时为以"错误："或"趋势预测失败"开头的提示
         """
-        if not self.api_key:
-            return "错误：API密钥未设置，请先在设置中配置API密钥。"
-        
         try:
-            # 构建营销方案生成提示
-            prompt = self._build_marketing_plan_prompt(analysis_data)
-            
-            # 调用API
-            response = self._call_api(prompt, model="deepseek-chat")
-            
-            # 解析响应
-            if 'choices' in response and len(response['choices']) > 0:
-                content = response['choices'][0]['message']['content']
-                return self._format_marketing_plan(content)
-            else:
-                return "错误：API响应格式异常，请检查网络连接和API配置。"
-                
+            return self.request_trend_prediction(prompt)
+        except ValueError as e:
+            return f"错误：{str(e)}"
         except Exception as e:
-            logger.error(f"生成营销方案时出错: {str(e)}")
-            return f"生成营销方案失败: {str(e)}"
+            logger.error(f"预测趋势时出错: {str(e)}")
+            return f"趋势预测失败: {str(e)}"
     
-    def predict_trends(self, prompt: str) -> str:
+    def request_trend_prediction(self, prompt: str) -> str:
         """
-        预测趋势
+        预测趋势（失败时抛出异常，供后台任务记录为失败）
         
         Args:
             prompt: 预测提示词
             
         Returns:
             趋势预测结果
+            
+        Raises:
+            ValueError: API密钥未设置或响应格式异常
+            requests.exceptions.RequestException: 请求失败
         """
         if not self.api_key:
-            return "错误：API密钥未设置，请先在设置中配置API密钥。"
+            raise ValueError("API密钥未设置，请先在设置中配置API密钥。")
         
+        # 构建趋势预测提示
+        enhanced_prompt = self._build_trend_prediction_prompt(prompt)
+        
+        # 调用API
+        response = self._call_api(enhanced_prompt, model="deepseek-chat", request_type="trend_prediction")
+        return self._format_trend_prediction(self._response_content(response))
+    
+    def _response_content(self, response: Dict[str, Any]) -> str:
+        """取出响应中的回复文本，格式异常时抛出ValueError"""
         try:
-            # 构建趋势预测提示
-            enhanced_prompt = self._build_trend_prediction_prompt(prompt)
-            
-            # 调用API
-            response = self._call_api(enhanced_prompt, model="deepseek-chat")
-            
-            # 解析响应
-            if 'choices' in response and len(response['choices']) > 0:
-                content = response['choices'][0]['message']['content']
-                return self._format_trend_prediction(content)
-            else:
-                return "错误：API响应格式异常，请检查网络连接和API配置。"
-                
-        except Exception as e:
-            logger.error(f"预测趋势时出错: {str(e)}")
-            return f"趋势预测失败: {str(e)}"
+            return response['choices'][0]['message']['content']
+        except (KeyError, IndexError, TypeError):
+            raise ValueError("API响应格式异常，请检查网络连接和API配置。")
     
-    def optimize_content(self, content_data: str, platform: str) -> str:
+    def optimize_content_structured(self, content_data: str, platform: str) -> Dict[str, Any]:
         """
-        优化内容
+        优化内容（结构化输出）
         
         Args:
             content_data: 内容数据
             platform: 平台名称
             
         Returns:
-            优化建议
+            内容优化记录字典
+            
+        Raises:
+            ValueError: API密钥未设置或响应多次校验失败
         """
         if not self.api_key:
-            return "错误：API密钥未设置，请先在设置中配置API密钥。"
+            raise ValueError("API密钥未设置，请先在设置中配置API密钥。")
         
-        try:
-            # 构建内容优化提示
-            prompt = self._build_content_optimization_prompt(content_data, platform)
+        prompt = self._build_content_optimization_prompt(content_data, platform)
+        record = self.request_structured("content_optimization", prompt, request_type="content_optimization")
+        return record_to_dict(record)
+    
+    def request_structured(self, schema_name: str, prompt: str, request_type: str = "chat",
+                           model: str = "deepseek-chat"):
+        """
+        以JSON模式请求并校验响应，格式错误时重试
+        
+        Args:
+            schema_name: 结构名称（见structured_output.RECORD_TYPES）
+            prompt: 提示词
+            request_type: 请求类型（用于token用量统计）
+            model: 模型名称
             
-            # 调用API
-            response = self._call_api(prompt, model="deepseek-chat")
+        Returns:
+            类型化记录
             
-            # 解析响应
-            if 'choices' in response and len(response['choices']) > 0:
-                content = response['choices'][0]['message']['content']
-                return self._format_content_optimization(content)
-            else:
-                return "错误：API响应格式异常，请检查网络连接和API配置。"
-                
-        except Exception as e:
-            logger.error(f"优化内容时出错: {str(e)}")
-            return f"内容优化失败: {str(e)}"
+        Raises:
+            ValueError: 重试后响应仍不符合结构
+        """
+        def send(structured_prompt: str) -> str:
+            response = self._call_api(structured_prompt, model=model, request_type=request_type, json_mode=True)
+            return response.get('choices', [{}])[0].get('message', {}).get('content', '')
+        
+        return request_record(schema_name, prompt, send, AI_CONFIG.get('structured_retries', 1))
     
-    def _call_api(self, prompt: str, model: str = "deepseek-chat") -> Dict[str, Any]:
+    def _call_api(self, prompt: str, model: str = "deepseek-chat",
+                  request_type: str = "chat", json_mode: bool = False) -> Dict[str, Any]:
         """
         调用DeepSeek API
         
         Args:
             prompt: 提示词
             model: 模型名称
+            request_type: 请求类型（用于token用量统计）
+            json_mode: 是否要求返回JSON对象
             
         Returns:
             API响应
         """
         # 保证只拼接一次 /v1/chat/completions
         url = f"{self.base_url.rstrip('/')}/v1/chat/completions"
+        max_tokens = AI_CONFIG.get('max_tokens', 2000)
         
         payload = {
             "model": model,
@@ -243,147 +228,74 @@ class DeepSeekAPI:
                     "content": prompt
                 }
             ],
-            "temperature": 0.7,
-            "max_tokens": 2000
+            "temperature": AI_CONFIG.get('temperature', 0.7),
+            "max_tokens": max_tokens
         }
+        if json_mode:
+            payload["response_format"] = {"type": "json_object"}
         
-        try:
-            response = self.session.post(url, json=payload, timeout=30)
-            response.raise_for_status()
-            
-            result = response.json()
-            return result
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"API调用失败: {str(e)}")
-            raise
-    
-    def _build_analysis_prompt(self, data: Dict[str, Any]) -> str:
-        """构建数据分析提示"""
-        prompt = f"""
-请分析以下社交媒体数据，并提供详细的分析报告：
-
-数据概览：
-- 平台：{data.get('platform', '未知')}
-- 时间范围：{data.get('time_range', '未知')}
-- 数据量：{data.get('data_count', 0)} 条记录
-
-数据内容：
-{json.dumps(data.get('content', {}), ensure_ascii=False, indent=2)}
-
-请从以下角度进行分析：
-1. 数据趋势分析
-2. 用户行为分析
-3. 内容效果分析
-4. 竞品分析
-5. 机会与挑战识别
-
-请提供结构化的分析报告，包含具体的数据洞察和建议。
-"""
-        return prompt
+        # 相同密钥、地址和请求体的并发调用合并为一次HTTP请求
+        request_key = make_request_key(self.api_key, url, payload)
+        return ai_single_flight.do(
+            request_key,
+            lambda: self._post_with_limits(url, payload, request_type)
+        )
     
-    def _build_strategy_prompt(self, analysis_result: Dict[str, Any], 
-                              target_audience: str = None) -> str:
-        """构建策略生成提示"""
-        audience_info = f"目标受众：{target_audience}" if target_audience else "目标受众：未指定"
+    def _post_with_limits(self, url: str, payload: Dict[str, Any],
+                          request_type: str) -> Dict[str, Any]:
+        """在限流额度内发送请求，遇到429时按Retry-After重试"""
+        prompt = payload["messages"][-1]["content"]
+        model = payload["model"]
+        estimated_tokens = estimate_request_tokens(prompt, payload["max_tokens"])
+        max_retries = AI_CONFIG.get('max_retries', 2)
         
-        prompt = f"""
-基于以下数据分析结果，请生成详细的营销策略：
-
-{audience_info}
-
-分析结果：
-{json.dumps(analysis_result, ensure_ascii=False, indent=2)}
-
-请提供以下方面的营销策略：
-1. 目标市场定位
-2. 内容策略
-3. 推广策略
-4. 用户增长策略
-5. 品牌建设策略
-6. 效果评估方案
-
-请提供具体可执行的策略建议，包含时间安排和预期效果。
-"""
-        return prompt
-    
-    def _build_content_prompt(self, topic: str, platform: str, 
-                             content_type: str) -> str:
-        """构建内容生成提示"""
-        prompt = f"""
-请为以下要求生成社交媒体内容建议：
-
-主题：{topic}
-平台：{platform}
-内容类型：{content_type}
-
-请提供：
-1. 内容标题建议
-2. 内容正文建议
-3. 标签建议
-4. 发布时间建议
-5. 互动策略建议
-
-请确保内容符合{platform}平台的特点和用户习惯。
-"""
-        return prompt
-    
-    def _parse_analysis_response(self, response: Dict[str, Any]) -> Dict[str, Any]:
-        """解析分析响应"""
-        try:
-            content = response.get('choices', [{}])[0].get('message', {}).get('content', '')
+        for attempt in range(max_retries + 1):
+            # 先从共享令牌桶获取额度，避免触发服务端限流
+            if not self.rate_limiter.acquire(estimated_tokens, timeout=AI_CONFIG.get('rate_limit_wait', 120)):
+                raise requests.exceptions.RequestException("等待API调用额度超时，请稍后重试")
             
-            # 尝试解析JSON格式的响应
+            # 预扣的token额度无论成功、429还是异常都要结算，否则会一直占用
+            settled = False
             try:
-                return json.loads(content)
-            except json.JSONDecodeError:
-                # 如果不是JSON格式，返回原始内容
-                return {
-                    "analysis": content,
-                    "status": "success"
-                }
+                response = self.session.post(url, json=payload, timeout=AI_CONFIG.get('timeout', 30))
                 
-        except Exception as e:
-            logger.error(f"解析分析响应失败: {str(e)}")
-            return {"error": f"响应解析失败: {str(e)}"}
-    
-    def _parse_strategy_response(self, response: Dict[str, Any]) -> Dict[str, Any]:
-        """解析策略响应"""
-        try:
-            content = response.get('choices', [{}])[0].get('message', {}).get('content', '')
-            
-            # 尝试解析JSON格式的响应
-            try:
-                return json.loads(content)
-            except json.JSONDecodeError:
-                # 如果不是JSON格式，返回原始内容
-                return {
-                    "strategy": content,
-                    "status": "success"
-                }
+                if response.status_code == 429:
+                    # 退还未使用的token额度
+                    self.rate_limiter.settle(estimated_tokens, 0)
+                    settled = True
+                    if attempt < max_retries:
+                        # 按Retry-After（秒数或HTTP日期）等待后重试，缺失时指数退避
+                        retry_after = parse_retry_after(response.headers.get('Retry-After'), 2 ** (attempt + 1))
+                        self.rate_limiter.penalize(retry_after)
+                        continue
                 
-        except Exception as e:
-            logger.error(f"解析策略响应失败: {str(e)}")
-            return {"error": f"响应解析失败: {str(e)}"}
+                response.raise_for_status()
+                
+                result = response.json()
+                usage = extract_usage(result)
+                self.rate_limiter.settle(estimated_tokens, usage['total_tokens'] or estimated_tokens)
+                settled = True
+                self._record_usage(request_type, model, usage)
+                return result
+                
+            except requests.exceptions.RequestException as e:
+                logger.error(f"API调用失败: {str(e)}")
+                raise
+            finally:
+                if not settled:
+                    self.rate_limiter.settle(estimated_tokens, 0)
     
-    def _parse_content_response(self, response: Dict[str, Any]) -> Dict[str, Any]:
-        """解析内容响应"""
+    def _record_usage(self, request_type: str, model: str, usage: Dict[str, int]):
+        """将token用量写入数据库"""
+        if self.usage_db is None or not usage['total_tokens']:
+            return
         try:
-            content = response.get('choices', [{}])[0].get('message', {}).get('content', '')
-            
-            # 尝试解析JSON格式的响应
-            try:
-                return json.loads(content)
-            except json.JSONDecodeError:
-                # 如果不是JSON格式，返回原始内容
-                return {
-                    "content_suggestions": content,
-                    "status": "success"
-                }
-                
+            self.usage_db.add_token_usage(
+                self.user_id, self.task_id, request_type, model,
+                usage['prompt_tokens'], usage['completion_tokens'], usage['total_tokens']
+            )
         except Exception as e:
-            logger.error(f"解析内容响应失败: {str(e)}")
-            return {"error": f"响应解析失败: {str(e)}"}
+            logger.error(f"记录token用量失败: {str(e)}")
     
     def test_connection(self) -> bool:
         """测试API连接"""
@@ -393,7 +305,7 @@ class DeepSeekAPI:
             
             # 发送简单的测试请求
             test_prompt = "请回复'连接测试成功'"
-            response = self._call_api(test_prompt)
+            response = self._call_api(test_prompt, request_type="connection_test")
             
             content = response.get('choices', [{}])[0].get('message', {}).get('content', '')
             return '连接测试成功' in content
@@ -601,17 +513,6 @@ class DeepSeekAPI:
         
         return content
     
-    def _format_content_optimization(self, content: str) -> str:
-        """格式化内容优化建议"""
-        # 清理和格式化内容
-        content = content.strip()
-        
-        # 确保有适当的标题格式
-        if not content.startswith('#') and not content.startswith('##'):
-            content = f"# 内容优化建议\n\n{content}"
-        
-        return content
-
     def _build_prompt(self, content, platform, content_type):
         """
         构建AI提示词，内容更丰富，确保长度大于100
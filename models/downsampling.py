@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+时间序列降采样模块
+按画布像素宽度选择绘制点数（LTTB / 最小最大值）
+"""
+
+import math
+from typing import Optional, Sequence, Tuple
+import logging
+
+import numpy as np
+import pandas as pd
+
+from config import ANALYSIS_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# 每个像素绘制的点数（最小最大值法每个像素需要两个点）
+POINTS_PER_PIXEL = 2
+# 原始点数超过目标点数的该倍数时，LTTB前先用最小最大值法粗筛
+PREFILTER_FACTOR = 4
+# 原始点数不超过该值时保留数据点标记
+MARKER_THRESHOLD = 120
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Largest-Triangle-Three-Buckets降采样，保留视觉上的形状特征
+
+    Args:
+        x: 横坐标（单调递增）
+        y: 纵坐标
+        threshold: 输出点数
+
+    Returns:
+        降采样后的 (x, y)
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return x, y
+
+    every = (n - 2) / (threshold - 2)
+    # 第i个桶为 [edges[i], edges[i+1])，首尾两个点单独保留
+    edges = np.floor(np.arange(threshold - 1) * every).astype(np.int64) + 1
+    edges[-1] = n - 1
+    # 一次性计算所有桶的平均点，最后一个桶之后以末尾点代替
+    counts = np.diff(edges)
+    avg_x = np.append(np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / counts, x[n - 1])
+    avg_y = np.append(np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / counts, y[n - 1])
+
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    a = 0
+
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        # 当前桶中与上一个选中点、下一桶平均点构成最大三角形的点
+        areas = np.abs(
+            (x[a] - avg_x[i + 1]) * (y[start:end] - y[a]) -
+            (x[a] - x[start:end]) * (avg_y[i + 1] - y[a])
+        )
+        a = start + int(areas.argmax())
+        indices[i + 1] = a
+
+    indices[-1] = n - 1
+    return x[indices], y[indices]
+
+
+def _block_minmax_indices(y: np.ndarray, block: int) -> np.ndarray:
+    """每个分块保留最小值和最大值的下标（按原顺序）"""
+    n = len(y)
+    full = n // block * block
+    if full == 0:
+        return np.arange(n)
+
+    blocks = y[:full].reshape(-1, block)
+    offsets = np.arange(0, full, block)
+    lo = blocks.argmin(axis=1) + offsets
+    hi = blocks.argmax(axis=1) + offsets
+    pairs = np.sort(np.stack([lo, hi], axis=1), axis=1).ravel()
+
+    if full < n:
+        tail = y[full:]
+        tail_pair = np.sort([full + int(tail.argmin()), full + int(tail.argmax())])
+        pairs = np.concatenate([pairs, tail_pair])
+    return pairs
+
+
+def minmax(x: np.ndarray, y: np.ndarray, threshold: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    最小最大值降采样，保留每段的峰值
+
+    Args:
+        x: 横坐标（单调递增）
+        y: 纵坐标
+        threshold: 输出点数上限
+
+    Returns:
+        降采样后的 (x, y)
+    """
+    n = len(x)
+    if threshold >= n or threshold < 2:
+        return x, y
+    block = int(math.ceil(n / (threshold // 2)))
+    indices = _block_minmax_indices(y, block)
+    return x[indices], y[indices]
+
+
+DOWNSAMPLERS = {
+    'lttb': lttb,
+    'minmax': minmax
+}
+
+
+def _to_numeric_x(x: Sequence) -> Tuple[np.ndarray, bool]:
+    """将横坐标转换为浮点数组，日期类型转换为matplotlib日期数值"""
+    if isinstance(x, (pd.Index, pd.Series)):
+        values = x
+    else:
+        values = pd.Index(x)
+
+    if pd.api.types.is_datetime64_any_dtype(values) or (
+            len(values) and pd.api.types.is_object_dtype(values) and
+            pd.api.types.infer_dtype(values, skipna=True) in ('date', 'datetime', 'datetime64')):
+        import matplotlib.dates as mdates
+        return mdates.date2num(pd.to_datetime(values).to_pydatetime()), True
+    return np.asarray(values, dtype=np.float64), False
+
+
+def downsample(x: np.ndarray, y: np.ndarray, target: int, method: str = 'lttb') -> Tuple[np.ndarray, np.ndarray]:
+    """
+    去掉缺失值、按横坐标排序后降采样到目标点数
+
+    Args:
+        x: 浮点横坐标
+        y: 纵坐标
+        target: 目标点数
+        method: 降采样方法（lttb / minmax）
+
+    Returns:
+        降采样后的 (x, y)
+    """
+    # 求和结果不是NaN说明没有缺失值，省去生成掩码
+    if np.isnan(y.sum()):
+        mask = ~np.isnan(y)
+        x, y = x[mask], y[mask]
+    # 数据通常已按时间排序，只有乱序时才排序
+    if len(x) > 1 and not (x[1:] >= x[:-1]).all():
+        order = np.argsort(x, kind='stable')
+        x, y = x[order], y[order]
+    # 点数远超目标时，LTTB逐桶循环较慢，先用最小最大值法缩减到目标的若干倍
+    if method == 'lttb' and len(x) > target * PREFILTER_FACTOR:
+        x, y = minmax(x, y, target * PREFILTER_FACTOR)
+    return DOWNSAMPLERS[method](x, y, target)
+
+
+def plot_downsampled(ax, x: Sequence, y: Sequence, method: Optional[str] = None, **plot_kwargs):
+    """
+    按坐标轴像素宽度降采样后绘制折线
+
+    图表渲染为静态图片，只在绘制时按当前画布宽度采样一次
+
+    Args:
+        ax: matplotlib坐标轴
+        x: 横坐标（数值或日期）
+        y: 纵坐标
+        method: 降采样方法，默认读取ANALYSIS_CONFIG
+        plot_kwargs: 传给ax.plot的参数
+
+    Returns:
+        折线图元
+    """
+    method = method or ANALYSIS_CONFIG.get('downsample_method', 'lttb')
+    numeric_x, is_date = _to_numeric_x(x)
+    raw_count = len(numeric_x)
+    target = max(int(ax.bbox.width), 1) * POINTS_PER_PIXEL
+    line_x, line_y = downsample(numeric_x, np.asarray(y, dtype=np.float64), target, method)
+
+    # 原始点数较少时才保留数据点标记
+    marker = plot_kwargs.pop('marker', None)
+    line, = ax.plot(line_x, line_y, marker=marker if marker and raw_count <= MARKER_THRESHOLD else 'None',
+                    **plot_kwargs)
+    if is_date:
+        ax.xaxis_date()
+    return line
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Excel导出模块
+使用openpyxl的只写（write-only）模式逐行写出工作簿，内存占用与行数无关；
+分析结果中的数值、百分比和日期按类型写入单元格，便于在Excel中直接排序、筛选和计算
+"""
+
+import json
+import math
+import re
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Excel单个工作表的行数上限（含表头），超出后自动续写到新工作表
+MAX_SHEET_ROWS = 1048576
+# 单元格文本长度上限
+MAX_CELL_CHARS = 32767
+
+# 分析结果类型对应的工作表名称
+RESULT_SHEET_NAMES = {
+    'overview': '基本统计',
+    'growth': '增长分析',
+    'correlation': '相关性分析',
+    'trends': '趋势分析'
+}
+
+# 分析结果工作表的公共列（按原样写出，编号、电话等数字形式的名称不转换为数字）
+RESULT_BASE_COLUMNS = ['任务名称', '平台', '分析类型', '创建时间', '结果时间']
+
+# 数字字符串（不含前导0的编号，位数在Excel精度范围内）
+_NUMBER = re.compile(r'[-+]?(0|[1-9]\d{0,14})(\.\d+)?')
+_DATETIME = re.compile(r'\d{4}-\d{2}-\d{2}([ T]\d{2}:\d{2}(:\d{2}(\.\d+)?)?)?')
+_PERCENT = re.compile(r'([-+]?\d+(\.\d+)?)\s*%')
+_INVALID_SHEET_CHARS = re.compile(r'[\\/*?:\[\]]')
+
+
+class ExcelStreamWriter:
+    """只写模式的多工作表Excel写入器"""
+
+    def __init__(self, file_path: str):
+        """
+        Args:
+            file_path: 输出文件路径（.xlsx）
+        """
+        from openpyxl import Workbook
+        from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+        self.file_path = file_path
+        self.workbook = Workbook(write_only=True)
+        self.sheets: Dict[str, Any] = {}
+        self.columns: Dict[str, List[str]] = {}
+        self.parse_flags: Dict[str, List[bool]] = {}
+        self.row_counts: Dict[str, int] = {}
+        self.parts: Dict[str, int] = {}
+        self.current: Dict[str, str] = {}
+        self.illegal_characters = ILLEGAL_CHARACTERS_RE
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def add_sheet(self, name: str, columns: List[str], widths: Optional[List[float]] = None,
+                  text_columns: Sequence[str] = ()):
+        """
+        创建工作表并写入表头
+
+        Args:
+            name: 工作表名称（逻辑名称，超出行数上限时续写的工作表也用它追加）
+            columns: 列名
+            widths: 列宽（字符数），为空时按列名估算
+            text_columns: 字符串值按原样写出的列（不识别其中的数字、百分比和日期）
+        """
+        self.columns[name] = list(columns)
+        self.parse_flags[name] = [column not in text_columns for column in columns]
+        self.parts[name] = 1
+        self.current[name] = name
+        self._create_sheet(name, name, widths)
+
+    def append(self, name: str, values: Sequence[Any]):
+        """追加一行（值按类型转换，日期、百分比带单元格格式）"""
+        sheet = self.sheets[self.current[name]]
+        if self.row_counts[self.current[name]] >= MAX_SHEET_ROWS:
+            self.parts[name] += 1
+            part_name = f"{name}_{self.parts[name]}"
+            self.current[name] = part_name
+            self._create_sheet(name, part_name, None)
+            sheet = self.sheets[part_name]
+        sheet.append([self.cell(sheet, value, parse)
+                      for value, parse in zip(values, self.parse_flags[name])])
+        self.row_counts[self.current[name]] += 1
+
+    def cell(self, sheet, value: Any, parse_text: bool = True):
+        """
+        转换单元格的值：数字保持数字，日期设置格式；
+        parse_text为True时数字字符串转为数字，百分比和日期字符串设置格式，否则字符串按原样写出
+        """
+        if value is None or isinstance(value, bool):
+            return value
+        if isinstance(value, (int, float)):
+            return None if isinstance(value, float) and (math.isnan(value) or math.isinf(value)) else value
+        if isinstance(value, (datetime, date)):
+            if isinstance(value, datetime) and value.tzinfo is not None:
+                value = value.replace(tzinfo=None)
+            return self._formatted(sheet, value, 'yyyy-mm-dd hh:mm:ss' if isinstance(value, datetime) else 'yyyy-mm-dd')
+        if hasattr(value, 'item') and not isinstance(value, str):
+            # numpy标量
+            return self.cell(sheet, value.item(), parse_text)
+        if isinstance(value, (dict, list, tuple)):
+            value = json.dumps(value, ensure_ascii=False, default=str)
+        if not parse_text:
+            return self.illegal_characters.sub('', str(value))[:MAX_CELL_CHARS]
+        text = str(value).strip()
+        if _NUMBER.fullmatch(text):
+            return float(text) if '.' in text else int(text)
+        match = _PERCENT.fullmatch(text)
+        if match:
+            return self._formatted(sheet, float(match.group(1)) / 100, '0.0%')
+        if _DATETIME.fullmatch(text):
+            try:
+                return self.cell(sheet, datetime.fromisoformat(text) if len(text) > 10 else date.fromisoformat(text))
+            except ValueError:
+                pass
+        text = self.illegal_characters.sub('', str(value))
+        return text[:MAX_CELL_CHARS]
+
+    def close(self):
+        """保存工作簿"""
+        if self.closed:
+            return
+        self.closed = True
+        if not self.sheets:
+            self.workbook.create_sheet('Sheet1')
+        self.workbook.save(self.file_path)
+        logger.info(f"Excel导出完成: {len(self.sheets)} 个工作表 -> {self.file_path}")
+
+    def _create_sheet(self, name: str, title: str, widths: Optional[List[float]]):
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, PatternFill
+        from openpyxl.utils import get_column_letter
+
+        columns = self.columns[name]
+        sheet = self.workbook.create_sheet(self._sheet_title(title))
+        widths = widths or [max(10, min(40, len(str(column)) * 2 + 4)) for column in columns]
+        for i, width in enumerate(widths, 1):
+            sheet.column_dimensions[get_column_letter(i)].width = width
+        sheet.freeze_panes = 'A2'
+
+        header = []
+        for column in columns:
+            cell = WriteOnlyCell(sheet, value=str(column))
+            cell.font = Font(bold=True)
+            cell.fill = PatternFill('solid', fgColor='DDDDDD')
+            header.append(cell)
+        sheet.append(header)
+        self.sheets[title] = sheet
+        self.row_counts[title] = 1
+
+    def _sheet_title(self, title: str) -> str:
+        """工作表名称不能包含特殊字符，最长31个字符"""
+        return _INVALID_SHEET_CHARS.sub('_', str(title))[:31] or 'Sheet'
+
+    @staticmethod
+    def _formatted(sheet, value, number_format: str):
+        from openpyxl.cell import WriteOnlyCell
+        cell = WriteOnlyCell(sheet, value=value)
+        cell.number_format = number_format
+        return cell
+
+
+def export_analysis_results(records: Sequence[Dict[str, Any]], file_path: str) -> Dict[str, int]:
+    """
+    导出分析结果，每种结果类型一个工作表，结果字典的每个字段一列
+
+    Args:
+        records: 分析结果记录，包含 task_name/platform/analysis_type/created_at/
+                 result_created_at/result_type/result（结果字典）
+        file_path: 输出文件路径
+
+    Returns:
+        {工作表名称: 数据行数}
+    """
+    # 先收集每种结果类型的字段（只读取键），表头确定后再逐行写出
+    fields: Dict[str, List[str]] = {}
+    for record in records:
+        keys = fields.setdefault(record['result_type'], [])
+        result = record['result'] if isinstance(record['result'], dict) else {'结果数据': record['result']}
+        for key in result:
+            if key not in keys:
+                keys.append(key)
+
+    counts = {}
+    with ExcelStreamWriter(file_path) as writer:
+        for result_type, keys in fields.items():
+            sheet_name = RESULT_SHEET_NAMES.get(result_type, result_type)
+            widths = [20, 10, 12, 20, 20] + [max(12, min(40, len(str(key)) * 2 + 4)) for key in keys]
+            # 只有结果字段识别数字、百分比和日期
+            writer.add_sheet(sheet_name, RESULT_BASE_COLUMNS + [str(key) for key in keys], widths,
+                             text_columns=RESULT_BASE_COLUMNS)
+            counts[sheet_name] = 0
+
+        for record in records:
+            sheet_name = RESULT_SHEET_NAMES.get(record['result_type'], record['result_type'])
+            result = record['result'] if isinstance(record['result'], dict) else {'结果数据': record['result']}
+            values = [record.get('task_name'), record.get('platform'), record.get('analysis_type'),
+                      record.get('created_at'), record.get('result_created_at')]
+            values += [result.get(key) for key in fields[record['result_type']]]
+            writer.append(sheet_name, values)
+            counts[sheet_name] += 1
+    return counts
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AI后台任务队列模块
+任务状态持久化在SQLite中，由工作线程池执行，应用重启后自动恢复
+"""
+
+import json
+import threading
+from typing import Dict, Any, Callable, Optional
+import logging
+
+from config import AI_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+def _run_marketing_plan(api, payload: Dict[str, Any]) -> str:
+    """执行营销方案生成任务（失败时抛出异常，任务记录为failed）"""
+    return api.request_marketing_plan(payload['analysis_data'])
+
+
+def _run_trend_prediction(api, payload: Dict[str, Any]) -> str:
+    """执行趋势预测任务（失败时抛出异常，任务记录为failed）"""
+    return api.request_trend_prediction(payload['prompt'])
+
+
+def _run_content_optimization(api, payload: Dict[str, Any]) -> str:
+    """执行内容优化任务，结果为ContentOptimizationRecord的JSON"""
+    record = api.optimize_content_structured(payload['content'], payload['platform'])
+    return json.dumps(record, ensure_ascii=False)
+
+
+# 任务类型 -> 执行函数
+JOB_HANDLERS = {
+    'marketing_plan': _run_marketing_plan,
+    'trend_prediction': _run_trend_prediction,
+    'content_optimization': _run_content_optimization
+}
+
+
+class AIJobQueue:
+    """持久化的AI任务队列"""
+
+    def __init__(self, db, api_factory: Callable[[], Any], max_workers: Optional[int] = None):
+        """
+        初始化任务队列
+
+        Args:
+            db: DatabaseManager实例
+            api_factory: 返回DeepSeekAPI实例的函数（每个任务使用独立实例）
+            max_workers: 工作线程数
+        """
+        self.db = db
+        self.api_factory = api_factory
+        self.max_workers = max_workers or AI_CONFIG.get('job_workers', 2)
+        self.handlers = dict(JOB_HANDLERS)
+        self.listeners = []
+        self.workers = []
+        self.wakeup = threading.Condition()
+        self.running = False
+
+    def register_handler(self, job_type: str, handler: Callable[[Any, Dict[str, Any]], str]):
+        """注册自定义任务类型"""
+        self.handlers[job_type] = handler
+
+    def subscribe(self, listener: Callable[[int, str, str, str], None]):
+        """
+        订阅任务完成事件
+
+        回调参数为 (job_id, job_type, status, result_or_error)，在工作线程中调用，
+        界面层需要自行切换回主线程
+        """
+        self.listeners.append(listener)
+
+    def start(self):
+        """启动工作线程，恢复上次未完成的任务"""
+        if self.running:
+            return
+        self.running = True
+
+        recovered = self.db.reset_running_ai_jobs()
+        if recovered:
+            logger.info(f"恢复了 {recovered} 个未完成的AI任务")
+
+        for i in range(self.max_workers):
+            worker = threading.Thread(target=self._worker_loop, name=f"ai-job-worker-{i}", daemon=True)
+            worker.start()
+            self.workers.append(worker)
+
+    def stop(self):
+        """停止工作线程（执行中的任务会在下次启动时重新执行）"""
+        self.running = False
+        with self.wakeup:
+            self.wakeup.notify_all()
+
+    def submit(self, user_id: int, job_type: str, payload: Dict[str, Any],
+               task_id: Optional[int] = None) -> int:
+        """
+        提交任务
+
+        Returns:
+            任务ID
+        """
+        if job_type not in self.handlers:
+            raise ValueError(f"不支持的任务类型: {job_type}")
+
+        job_id = self.db.add_ai_job(user_id, job_type, json.dumps(payload, ensure_ascii=False), task_id)
+        with self.wakeup:
+            self.wakeup.notify()
+        return job_id
+
+    def _worker_loop(self):
+        """工作线程主循环"""
+        while self.running:
+            try:
+                job = self.db.claim_next_ai_job()
+            except Exception as e:
+                logger.error(f"领取AI任务失败: {str(e)}")
+                job = None
+
+            if job is None:
+                with self.wakeup:
+                    self.wakeup.wait(timeout=5)
+                continue
+
+            self._execute(job)
+
+    def _execute(self, job):
+        """执行单个任务并保存结果"""
+        job_id, user_id, task_id, job_type, payload = job
+        try:
+            handler = self.handlers[job_type]
+            api = self.api_factory()
+            api.set_usage_context(self.db, user_id, task_id)
+            result = handler(api, json.loads(payload))
+            self.db.update_ai_job(job_id, 'completed', result=result)
+            self._notify(job_id, job_type, 'completed', result)
+        except Exception as e:
+            logger.error(f"AI任务 {job_id} 执行失败: {str(e)}")
+            self.db.update_ai_job(job_id, 'failed', error=str(e))
+            self._notify(job_id, job_type, 'failed', str(e))
+
+    def _notify(self, job_id: int, job_type: str, status: str, result: str):
+        """通知所有订阅者"""
+        for listener in self.listeners:
+            try:
+                listener(job_id, job_type, status, result)
+            except Exception as e:
+                logger.error(f"AI任务回调失败: {str(e)}")
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Markdown渲染模块
+逐行渲染报告使用的Markdown子集（标题、表格、列表、引用、粗体/斜体/代码、图片和链接），
+每行只扫描一次，输出结构完整的HTML或对齐的纯文本
+"""
+
+import re
+import unicodedata
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+_HEADING = re.compile(r'(#{1,6})\s+(.*)')
+_UNORDERED_ITEM = re.compile(r'[-*+]\s+(.*)')
+_ORDERED_ITEM = re.compile(r'(\d+)[.)]\s+(.*)')
+_TABLE_SEPARATOR = re.compile(r'\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?')
+_HORIZONTAL_RULE = re.compile(r'(-\s*){3,}|(\*\s*){3,}|(_\s*){3,}')
+
+# 行内元素，一次扫描完成转义和替换：图片、链接、粗体、代码、斜体、需要转义的字符
+_INLINE = re.compile(
+    r'!\[(?P<alt>[^\]]*)\]\((?P<src>[^)\s]+)\)'
+    r'|\[(?P<text>[^\]]*)\]\((?P<href>[^)\s]+)\)'
+    r'|\*\*(?P<strong>.+?)\*\*'
+    r'|`(?P<code>[^`]+)`'
+    r'|\*(?P<em>[^*\s](?:[^*]*[^*\s])?)\*'
+    r'|(?P<char>[&<>"])'
+)
+
+_ESCAPES = {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'}
+_ESCAPE_TABLE = str.maketrans(_ESCAPES)
+
+
+def _split_row(line: str) -> List[str]:
+    """拆分表格行的单元格"""
+    line = line.strip()
+    if line.startswith('|'):
+        line = line[1:]
+    if line.endswith('|'):
+        line = line[:-1]
+    return [cell.strip() for cell in line.split('|')]
+
+
+def _is_table_separator(line: str) -> bool:
+    return '-' in line and _TABLE_SEPARATOR.fullmatch(line.strip()) is not None
+
+
+def display_width(text: str) -> int:
+    """文本的显示宽度（中文等全角字符占两列）"""
+    if text.isascii():
+        return len(text)
+    return sum(2 if unicodedata.east_asian_width(ch) in ('W', 'F') else 1 for ch in text)
+
+
+class _BlockRenderer:
+    """逐行渲染的公共部分：识别块级结构，子类负责输出"""
+
+    def __init__(self):
+        self.block: Optional[str] = None
+
+    def render(self, lines: Iterable[str]) -> Iterator[str]:
+        """逐行渲染，产出输出片段"""
+        for line in lines:
+            output = self.feed(line)
+            if output:
+                yield output
+        output = self.close()
+        if output:
+            yield output
+
+    def feed(self, line: str) -> str:
+        """
+        渲染一行Markdown
+
+        Returns:
+            这一行产生的输出（可能为空，例如表格或段落尚未结束）
+        """
+        stripped = line.strip()
+        if stripped.startswith('<svg'):
+            return self.end_block() + self.raw(stripped)
+        if '\n' in stripped:
+            # 营销方案等整段插入的内容按行拆开渲染
+            return "".join(self.feed(part) for part in line.split('\n'))
+        if not stripped:
+            return self.end_block() + self.blank()
+
+        # 按首字符分派，每行最多尝试一个块级正则
+        first = stripped[0]
+        if first == '|':
+            return self.table_row(stripped)
+
+        if first == '#':
+            match = _HEADING.fullmatch(stripped)
+            if match:
+                return self.end_block() + self.heading(len(match.group(1)), match.group(2).strip())
+        elif first in '-*+_':
+            if _HORIZONTAL_RULE.fullmatch(stripped):
+                return self.end_block() + self.rule()
+            match = _UNORDERED_ITEM.fullmatch(stripped)
+            if match:
+                return self.switch_block('ul') + self.list_item('ul', None, match.group(1))
+        elif first.isdigit():
+            match = _ORDERED_ITEM.fullmatch(stripped)
+            if match:
+                return self.switch_block('ol') + self.list_item('ol', match.group(1), match.group(2))
+        elif first == '>':
+            return self.switch_block('quote') + self.quote_line(stripped[1:].strip())
+
+        return self.switch_block('p') + self.paragraph_line(stripped)
+
+    def close(self) -> str:
+        """结束最后一个块"""
+        return self.end_block()
+
+    def switch_block(self, block: str) -> str:
+        """进入指定的块（已在该块中时继续）"""
+        if self.block == block:
+            return ""
+        output = self.end_block()
+        self.block = block
+        return output + self.start_block(block)
+
+    def end_block(self) -> str:
+        if self.block is None:
+            return ""
+        block, self.block = self.block, None
+        return self.finish_block(block)
+
+    def table_row(self, line: str) -> str:
+        raise NotImplementedError
+
+    def start_block(self, block: str) -> str:
+        return ""
+
+    def finish_block(self, block: str) -> str:
+        return ""
+
+
+class HtmlRenderer(_BlockRenderer):
+    """Markdown转HTML（输出<body>内的内容，标签全部闭合）"""
+
+    def __init__(self):
+        super().__init__()
+        self.paragraph_started = False
+        self.table_header: Optional[List[str]] = None
+
+    @staticmethod
+    def inline(text: str) -> str:
+        """渲染行内元素并转义HTML特殊字符"""
+        return _INLINE.sub(HtmlRenderer._inline_match, text)
+
+    @staticmethod
+    def _inline_match(match) -> str:
+        kind = match.lastgroup
+        if kind == 'char':
+            return _ESCAPES[match.group('char')]
+        if match.group('src') is not None:
+            return (f'<img src="{HtmlRenderer.inline(match.group("src"))}" '
+                    f'alt="{HtmlRenderer.inline(match.group("alt"))}" style="max-width: 100%;" />')
+        if match.group('href') is not None:
+            return f'<a href="{HtmlRenderer.inline(match.group("href"))}">{HtmlRenderer.inline(match.group("text"))}</a>'
+        if match.group('strong') is not None:
+            return f"<strong>{HtmlRenderer.inline(match.group('strong'))}</strong>"
+        if match.group('code') is not None:
+            return f"<code>{match.group('code').translate(_ESCAPE_TABLE)}</code>"
+        return f"<em>{HtmlRenderer.inline(match.group('em'))}</em>"
+
+    def raw(self, html: str) -> str:
+        return f"{html}\n"
+
+    def blank(self) -> str:
+        return ""
+
+    def heading(self, level: int, text: str) -> str:
+        return f"<h{level}>{self.inline(text)}</h{level}>\n"
+
+    def rule(self) -> str:
+        return "<hr />\n"
+
+    def list_item(self, block: str, number: Optional[str], text: str) -> str:
+        return f"<li>{self.inline(text)}</li>\n"
+
+    def quote_line(self, text: str) -> str:
+        return f"<p>{self.inline(text)}</p>\n"
+
+    def paragraph_line(self, text: str) -> str:
+        # 报告中连续的文本行（如“**数据平台**: xx”）各占一行，用<br />分隔
+        separator = "<br />\n" if self.paragraph_started else ""
+        self.paragraph_started = True
+        return separator + self.inline(text)
+
+    def table_row(self, line: str) -> str:
+        if self.block != 'table':
+            # 表头行要等到下一行才知道是否带分隔行
+            output = self.end_block()
+            self.block = 'table'
+            self.table_header = _split_row(self.inline(line))
+            return output
+
+        if self.table_header is not None:
+            header, self.table_header = self.table_header, None
+            if _is_table_separator(line):
+                return f"<table>\n<thead>\n<tr><th>{'</th><th>'.join(header)}</th></tr>\n</thead>\n<tbody>\n"
+            return "<table>\n<tbody>\n" + self._row(header) + self._row(_split_row(self.inline(line)))
+
+        if _is_table_separator(line):
+            return ""
+        return self._row(_split_row(self.inline(line)))
+
+    @staticmethod
+    def _row(cells: List[str]) -> str:
+        """输出表格行（单元格已渲染行内元素，整行只渲染一次）"""
+        return f"<tr><td>{'</td><td>'.join(cells)}</td></tr>\n"
+
+    def start_block(self, block: str) -> str:
+        if block == 'p':
+            self.paragraph_started = False
+            return "<p>"
+        return {'ul': "<ul>\n", 'ol': "<ol>\n", 'quote': "<blockquote>\n"}.get(block, "")
+
+    def finish_block(self, block: str) -> str:
+        if block == 'table':
+            if self.table_header is not None:
+                # 只有一行的表格
+                header, self.table_header = self.table_header, None
+                return "<table>\n<tbody>\n" + self._row(header) + "</tbody>\n</table>\n"
+            return "</tbody>\n</table>\n"
+        return {'p': "</p>\n", 'ul': "</ul>\n", 'ol': "</ol>\n", 'quote': "</blockquote>\n"}[block]
+
+
+class TextRenderer(_BlockRenderer):
+    """Markdown转纯文本（表格按显示宽度对齐）"""
+
+    def __init__(self):
+        super().__init__()
+        self.table_rows: List[List[Tuple[str, int]]] = []
+        self.table_has_header = False
+
+    @staticmethod
+    def inline(text: str) -> str:
+        """去掉行内标记，图片和链接保留文字"""
+        return _INLINE.sub(TextRenderer._inline_match, text)
+
+    @staticmethod
+    def _inline_match(match) -> str:
+        kind = match.lastgroup
+        if kind == 'char':
+            return match.group('char')
+        if match.group('src') is not None:
+            return f"[图片: {match.group('alt')}]"
+        if match.group('href') is not None:
+            href = match.group('href')
+            text = TextRenderer.inline(match.group('text'))
+            return text if href.startswith('data:') else f"{text} ({href})"
+        if match.group('strong') is not None:
+            return TextRenderer.inline(match.group('strong'))
+        if match.group('code') is not None:
+            return match.group('code')
+        return TextRenderer.inline(match.group('em'))
+
+    def raw(self, html: str) -> str:
+        return "[图表]\n"
+
+    def blank(self) -> str:
+        return "\n"
+
+    def heading(self, level: int, text: str) -> str:
+        text = self.inline(text)
+        if level <= 2:
+            underline = ('=' if level == 1 else '-') * display_width(text)
+            return f"{text}\n{underline}\n"
+        return f"{text}\n"
+
+    def rule(self) -> str:
+        return "-" * 40 + "\n"
+
+    def list_item(self, block: str, number: Optional[str], text: str) -> str:
+        marker = f"{number}." if number else "•"
+        return f"{marker} {self.inline(text)}\n"
+
+    def quote_line(self, text: str) -> str:
+        return f"    {self.inline(text)}\n"
+
+    def paragraph_line(self, text: str) -> str:
+        return f"{self.inline(text)}\n"
+
+    def table_row(self, line: str) -> str:
+        # 表格需要整体对齐，先缓存各行，表格结束时输出（内存只与单个表格的大小有关）
+        output = self.switch_block('table')
+        if _is_table_separator(line):
+            self.table_has_header = len(self.table_rows) == 1
+            return output
+        self.table_rows.append([(cell, display_width(cell)) for cell in _split_row(self.inline(line))])
+        return output
+
+    def start_block(self, block: str) -> str:
+        if block == 'table':
+            self.table_rows = []
+            self.table_has_header = False
+        return ""
+
+    def finish_block(self, block: str) -> str:
+        if block != 'table' or not self.table_rows:
+            return ""
+        columns = max(len(row) for row in self.table_rows)
+        widths = [0] * columns
+        for row in self.table_rows:
+            for i, (_, width) in enumerate(row):
+                if width > widths[i]:
+                    widths[i] = width
+
+        lines = []
+        for index, row in enumerate(self.table_rows):
+            cells = [cell + ' ' * (widths[i] - width) for i, (cell, width) in enumerate(row)]
+            lines.append("  ".join(cells).rstrip())
+            if index == 0 and self.table_has_header:
+                lines.append("  ".join('-' * width for width in widths))
+        self.table_rows = []
+        return "\n".join(lines) + "\n"
+
+
+RENDERERS = {
+    'html': HtmlRenderer,
+    'txt': TextRenderer
+}
+
+
+def render_markdown(lines: Iterable[str], format_type: str) -> Iterator[str]:
+    """
+    逐行渲染Markdown
+
+    Args:
+        lines: Markdown行
+        format_type: 输出格式（html/txt）
+
+    Yields:
+        输出片段，拼接后即为完整结果
+    """
+    return RENDERERS[format_type]().render(lines)
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PDF表格导出模块
+逐页把数据行排成页面大小的表格直接绘制到画布上，每页重复表头；
+同一时间只有一页的表格在内存中，排版耗时与行数成正比
+"""
+
+import itertools
+from typing import Iterable, List, Optional, Sequence
+import logging
+
+from config import ANALYSIS_CONFIG
+
+logger = logging.getLogger(__name__)
+
+_registered_fonts = set()
+
+
+def register_cjk_font(font_name: Optional[str] = None) -> str:
+    """
+    注册中文字体（reportlab内置的CID字体，PDF阅读器自带字形，不嵌入字体文件）
+
+    Returns:
+        字体名称
+    """
+    font_name = font_name or ANALYSIS_CONFIG.get('pdf_font', 'STSong-Light')
+    if font_name not in _registered_fonts:
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+        pdfmetrics.registerFont(UnicodeCIDFont(font_name))
+        _registered_fonts.add(font_name)
+    return font_name
+
+
+class _CharWidths(dict):
+    """按字符缓存的文字宽度表"""
+
+    def __init__(self, font_name: str, font_size: float):
+        super().__init__()
+        self.font_name = font_name
+        self.font_size = font_size
+
+    def __missing__(self, ch: str) -> float:
+        from reportlab.pdfbase.pdfmetrics import stringWidth
+        width = self[ch] = stringWidth(ch, self.font_name, self.font_size)
+        return width
+
+
+class PdfTableExporter:
+    """分页流式的PDF表格导出器"""
+
+    def __init__(self, landscape_page: bool = True, font_size: float = 8,
+                 max_cell_chars: Optional[int] = None, font_name: Optional[str] = None):
+        """
+        初始化导出器
+
+        Args:
+            landscape_page: 是否使用横向A4
+            font_size: 表格字号
+            max_cell_chars: 单元格最多显示的字符数（超出部分截断），默认读取ANALYSIS_CONFIG
+            font_name: 中文字体，默认读取ANALYSIS_CONFIG
+        """
+        from reportlab.lib.pagesizes import A4, landscape
+
+        self.page_size = landscape(A4) if landscape_page else A4
+        self.font_size = font_size
+        self.max_cell_chars = max_cell_chars or ANALYSIS_CONFIG.get('pdf_max_cell_chars', 300)
+        self.font_name = register_cjk_font(font_name)
+        self.margin = 36
+        self.row_height = font_size * 1.2 + 6
+        self._style = None
+        self._char_widths = _CharWidths(self.font_name, font_size)
+
+    def export_dataframe(self, df, file_path: str, title: Optional[str] = None) -> int:
+        """
+        导出DataFrame（按行迭代，不复制整表）
+
+        Returns:
+            导出的页数
+        """
+        columns = [str(column) for column in df.columns]
+        return self.export(df.itertuples(index=False, name=None), columns, file_path, title)
+
+    def export(self, rows: Iterable[Sequence], columns: List[str], file_path: str,
+               title: Optional[str] = None) -> int:
+        """
+        导出数据行
+
+        Args:
+            rows: 数据行（可以是生成器，逐页读取）
+            columns: 列名
+            file_path: 输出文件路径
+            title: 标题（绘制在每页页眉）
+
+        Returns:
+            导出的页数
+        """
+        from reportlab.pdfgen.canvas import Canvas
+
+        rows = iter(rows)
+        width, height = self.page_size
+        available_width = width - 2 * self.margin
+        # 页眉、页脚各占一行
+        available_height = height - 2 * self.margin - 2 * self.row_height
+
+        # 按第一页的数据估算列宽，之后各页保持一致
+        first_rows = [self._format_row(row) for row in itertools.islice(rows, self._rows_per_page(available_height))]
+        col_widths = self._column_widths(columns, first_rows, available_width)
+        header = [self._cell(column, col_widths[i]) for i, column in enumerate(columns)]
+        pending = [self._wrap_row(row, col_widths) for row in first_rows]
+
+        canvas = Canvas(file_path, pagesize=self.page_size, pageCompression=1)
+        canvas.setTitle(title or "数据导出")
+        formatted = (self._wrap_row(self._format_row(row), col_widths) for row in rows)
+        rows_per_page = self._rows_per_page(available_height)
+        page = 0
+
+        while pending or page == 0:
+            page += 1
+            drawn = self._draw_page(canvas, header, pending, col_widths, available_width,
+                                    available_height, title, page)
+            canvas.showPage()
+            # 放不下的行留到下一页，再补足一页的行数（一次只为一页建表）
+            del pending[:drawn]
+            pending.extend(itertools.islice(formatted, rows_per_page - len(pending)))
+
+        canvas.save()
+        logger.info(f"PDF导出完成: {page} 页 -> {file_path}")
+        return page
+
+    def _rows_per_page(self, available_height: float) -> int:
+        """单行高度下一页最多容纳的数据行数（多行单元格由表格拆分处理）"""
+        return max(1, int(available_height // self.row_height) - 1)
+
+    def _format_row(self, row: Sequence) -> List[str]:
+        """把一行数据转为字符串并截断过长的内容"""
+        limit = self.max_cell_chars
+        cells = []
+        for value in row:
+            text = "" if value is None else str(value)
+            if len(text) > limit:
+                text = text[:limit] + "…"
+            cells.append(text)
+        return cells
+
+    def _column_widths(self, columns: List[str], sample: List[List[str]], available_width: float) -> List[float]:
+        """按表头和样本数据的文字宽度分配列宽（单列不超过总宽的40%）"""
+        padding = 8
+        widths = []
+        for i, column in enumerate(columns):
+            texts = [column] + [row[i] for row in sample[:200] if i < len(row)]
+            natural = max(self._text_width(text) for text in texts) + padding
+            widths.append(min(natural, available_width * 0.4))
+        total = sum(widths)
+        return [w * available_width / total for w in widths]
+
+    def _text_width(self, text: str) -> float:
+        """文字宽度（逐字符查表，比reportlab对CID字体逐次计算快得多）"""
+        widths = self._char_widths
+        return sum(widths[ch] for ch in text)
+
+    def _cell(self, text: str, col_width: float) -> str:
+        """放不下的文字按字符折行（Table直接支持多行字符串，不需要开销大的Paragraph）"""
+        limit = col_width - 6
+        if self._text_width(text) <= limit:
+            return text
+        widths = self._char_widths
+        lines, line, line_width = [], [], 0.0
+        for ch in text:
+            w = widths[ch]
+            if line and line_width + w > limit:
+                lines.append(''.join(line))
+                line, line_width = [], 0.0
+            line.append(ch)
+            line_width += w
+        lines.append(''.join(line))
+        return '\n'.join(lines)
+
+    def _wrap_row(self, cells: List[str], col_widths: List[float]) -> list:
+        return [self._cell(text, col_widths[i]) for i, text in enumerate(cells[:len(col_widths)])]
+
+    def _table_style(self):
+        from reportlab.lib import colors
+        from reportlab.platypus import TableStyle
+
+        if self._style is None:
+            self._style = TableStyle([
+                ('FONTNAME', (0, 0), (-1, -1), self.font_name),
+                ('FONTSIZE', (0, 0), (-1, -1), self.font_size),
+                ('LEADING', (0, 0), (-1, -1), self.font_size * 1.2),
+                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.beige]),
+                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+                ('GRID', (0, 0), (-1, -1), 0.5, colors.black)
+            ])
+        return self._style
+
+    def _draw_page(self, canvas, header: list, rows: list, col_widths: List[float],
+                   available_width: float, available_height: float,
+                   title: Optional[str], page: int) -> int:
+        """
+        绘制一页：表头加尽可能多的数据行，放不下时只拆分这一页的表格
+
+        Returns:
+            本页绘制的数据行数
+        """
+        from reportlab.platypus import Table
+
+        width, height = self.page_size
+        canvas.setFont(self.font_name, self.font_size + 2)
+        if title:
+            canvas.drawString(self.margin, height - self.margin, title)
+        canvas.setFont(self.font_name, self.font_size)
+        canvas.drawRightString(width - self.margin, self.margin / 2, f"第 {page} 页")
+
+        table = Table([header] + rows, colWidths=col_widths, repeatRows=1, style=self._table_style())
+        _, table_height = table.wrap(available_width, available_height)
+        drawn = len(rows)
+        if table_height > available_height:
+            parts = table.split(available_width, available_height)
+            # 第一部分包含表头；一行都放不下时整表照画，保证每页至少前进一行
+            if parts and len(parts[0]._cellvalues) > 1:
+                table = parts[0]
+                _, table_height = table.wrap(available_width, available_height)
+                drawn = len(table._cellvalues) - 1
+        top = height - self.margin - self.row_height
+        table.drawOn(canvas, self.margin, top - table_height)
+        return drawn
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+提示词构建模块
+在发送给模型之前压缩大块分析数据，使提示词控制在token预算以内
+"""
+
+import re
+from typing import Dict, List, Any, Optional, Tuple
+import logging
+
+from config import AI_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# 中日韩字符（DeepSeek约0.6 token/字），其余字符约0.3 token/字
+_CJK_PATTERN = re.compile(r'[\u3000-\u303f\u3400-\u4dbf\u4e00-\u9fff\uff00-\uffef]')
+
+# 逐级收紧的列表保留条数，None表示不压缩
+_LIST_LIMITS = [None, 24, 12, 6, 3, 0]
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    本地快速估算文本的token数量
+
+    Args:
+        text: 文本内容
+
+    Returns:
+        估算的token数
+    """
+    if not text:
+        return 0
+    cjk_count = len(_CJK_PATTERN.findall(text))
+    other_count = len(text) - cjk_count
+    return int(cjk_count * 0.6 + other_count * 0.3) + 1
+
+
+def _format_scalar(value: Any) -> str:
+    """格式化单个值，浮点数保留两位小数"""
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return str(value)
+
+
+def _summarize_records(records: List[Any]) -> str:
+    """统计记录列表中各数值字段的最小/最大/平均值"""
+    numeric = {}
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+        for key, value in record.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                numeric.setdefault(key, []).append(value)
+
+    parts = []
+    for key, values in numeric.items():
+        parts.append(f"{key} 最小{min(values):.2f}/最大{max(values):.2f}/均值{sum(values) / len(values):.2f}")
+    return "；".join(parts)
+
+
+def _sample_evenly(items: List[Any], limit: int) -> List[Any]:
+    """均匀抽样，保留首尾两条记录"""
+    if limit <= 0:
+        return []
+    if len(items) <= limit:
+        return items
+    if limit == 1:
+        return [items[-1]]
+    step = (len(items) - 1) / (limit - 1)
+    return [items[round(i * step)] for i in range(limit)]
+
+
+def _format_record(record: Any) -> str:
+    """将一条记录格式化为单行文本"""
+    if isinstance(record, dict):
+        return ", ".join(f"{k}={_format_scalar(v)}" for k, v in record.items())
+    return _format_scalar(record)
+
+
+def _format_value(value: Any, list_limit: Optional[int], text_limit: Optional[int]) -> str:
+    """按当前压缩级别格式化一个值"""
+    if isinstance(value, list):
+        if list_limit is None or len(value) <= list_limit:
+            sampled = value
+            header = ""
+        else:
+            sampled = _sample_evenly(value, list_limit)
+            summary = _summarize_records(value)
+            header = f"共{len(value)}条记录，抽样{len(sampled)}条"
+            if summary:
+                header += f"（{summary}）"
+        lines = [header] if header else []
+        lines.extend(f"  · {_format_record(item)}" for item in sampled)
+        return "\n".join(lines) if lines else "无"
+
+    if isinstance(value, dict):
+        return "; ".join(f"{k}: {_format_scalar(v)}" for k, v in value.items())
+
+    text = _format_scalar(value)
+    if text_limit is not None and len(text) > text_limit:
+        text = text[:text_limit] + "…"
+    return text
+
+
+class PromptBuilder:
+    """按token预算构建分析数据提示词"""
+
+    def __init__(self, token_budget: Optional[int] = None):
+        """
+        初始化提示词构建器
+
+        Args:
+            token_budget: 分析数据部分的token预算，默认读取AI_CONFIG
+        """
+        self.token_budget = token_budget or AI_CONFIG.get('prompt_token_budget', 1500)
+        self.header_lines = []
+        self.sections = []
+        self.last_stats = {}
+
+    def add_line(self, text: str):
+        """添加不参与压缩的头部信息"""
+        self.header_lines.append(text)
+        return self
+
+    def add_section(self, title: str, data: Dict[str, Any]):
+        """添加一个分析数据块"""
+        if data:
+            self.sections.append((title, data))
+        return self
+
+    def _render(self, list_limit: Optional[int], text_limit: Optional[int]) -> str:
+        """按指定压缩级别渲染全部内容"""
+        lines = list(self.header_lines)
+        if lines:
+            lines.append("")
+        for title, data in self.sections:
+            lines.append(f"{title}:")
+            for key, value in data.items():
+                formatted = _format_value(value, list_limit, text_limit)
+                if "\n" in formatted:
+                    lines.append(f"- {key}:")
+                    lines.append(formatted)
+                else:
+                    lines.append(f"- {key}: {formatted}")
+            lines.append("")
+        return "\n".join(lines)
+
+    def build(self) -> Tuple[str, Dict[str, int]]:
+        """
+        构建提示词，逐级压缩直到满足token预算
+
+        Returns:
+            (提示词文本, 统计信息)
+        """
+        original = self._render(None, None)
+        original_tokens = estimate_tokens(original)
+        text, tokens = original, original_tokens
+
+        if original_tokens > self.token_budget:
+            for list_limit in _LIST_LIMITS[1:]:
+                text = self._render(list_limit, None)
+                tokens = estimate_tokens(text)
+                if tokens <= self.token_budget:
+                    break
+            else:
+                # 列表已压缩到最少仍超预算时截断长文本
+                text = self._render(0, 200)
+                tokens = estimate_tokens(text)
+
+        self.last_stats = {
+            "original_tokens": original_tokens,
+            "final_tokens": tokens,
+            "saved_tokens": original_tokens - tokens
+        }
+        if self.last_stats["saved_tokens"] > 0:
+            logger.info(f"提示词压缩: {original_tokens} -> {tokens} tokens，节省 {original_tokens - tokens} tokens")
+        return text, self.last_stats
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AI请求限流模块
+基于令牌桶算法，在客户端同时限制请求频率和token消耗速度
+
+限流器只在当前进程内共享（各线程和后台任务共用）；同时运行的多个应用进程各自计数，
+总请求速度可能超过配置的限额，此时依靠服务端429响应和Retry-After退避
+"""
+
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional
+import logging
+
+from config import AI_CONFIG
+from models.prompt_builder import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """线程安全的令牌桶"""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        """
+        初始化令牌桶
+
+        Args:
+            capacity: 桶容量（允许的突发量）
+            refill_per_second: 每秒补充的令牌数
+        """
+        self.capacity = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        """按流逝时间补充令牌（调用方需持有锁）"""
+        now = time.monotonic()
+        elapsed = now - self.updated_at
+        self.updated_at = now
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+
+    def try_acquire(self, amount: float) -> float:
+        """
+        尝试取出令牌
+
+        Returns:
+            0表示成功，否则为还需等待的秒数
+        """
+        # 超过容量的请求按容量处理，避免永远无法满足
+        amount = min(float(amount), self.capacity)
+        with self.lock:
+            self._refill()
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return 0.0
+            return (amount - self.tokens) / self.refill_per_second
+
+    def adjust(self, delta: float):
+        """
+        修正令牌数量（正数退还，负数追加扣除）
+
+        实际消耗超过预估时允许欠账，后续请求会等待补足
+        """
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens + delta)
+
+    def drain(self):
+        """清空令牌桶（收到服务端限流响应时使用）"""
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.tokens, 0.0)
+
+
+class AIRateLimiter:
+    """AI请求限流器，同时控制每分钟请求数和每分钟token数"""
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.request_bucket = TokenBucket(requests_per_minute, requests_per_minute / 60.0)
+        self.token_bucket = TokenBucket(tokens_per_minute, tokens_per_minute / 60.0)
+
+    def acquire(self, estimated_tokens: int, timeout: Optional[float] = None) -> bool:
+        """
+        阻塞直到请求额度和token额度都可用
+
+        Args:
+            estimated_tokens: 预估的token消耗（提示词 + 最大输出）
+            timeout: 最长等待秒数，None表示一直等待
+
+        Returns:
+            是否成功获取额度
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            wait = self.request_bucket.try_acquire(1)
+            if wait == 0:
+                token_wait = self.token_bucket.try_acquire(estimated_tokens)
+                if token_wait == 0:
+                    return True
+                # token额度不足时归还请求额度，避免占用
+                self.request_bucket.adjust(1)
+                wait = token_wait
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+
+            time.sleep(max(wait, 0.01))
+
+    def settle(self, estimated_tokens: int, actual_tokens: int):
+        """用响应中的实际用量修正预扣的token"""
+        self.token_bucket.adjust(estimated_tokens - actual_tokens)
+
+    def penalize(self, retry_after: float = 0):
+        """服务端返回429时清空额度并等待"""
+        logger.warning(f"触发服务端限流，等待 {retry_after:.1f} 秒后重试")
+        self.request_bucket.drain()
+        self.token_bucket.drain()
+        if retry_after > 0:
+            time.sleep(retry_after)
+
+
+def parse_retry_after(value: Optional[str], default: float) -> float:
+    """
+    解析Retry-After响应头
+
+    Args:
+        value: 响应头的值，秒数或HTTP日期（如 "Wed, 21 Oct 2026 07:28:00 GMT"）
+        default: 缺失或无法解析时的等待秒数
+
+    Returns:
+        需要等待的秒数
+    """
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def estimate_request_tokens(prompt: str, max_tokens: int) -> int:
+    """预估一次请求的token消耗（提示词估算值 + 最大输出）"""
+    return estimate_tokens(prompt) + int(max_tokens)
+
+
+def extract_usage(response: Dict[str, Any]) -> Dict[str, int]:
+    """从API响应中提取usage字段"""
+    usage = response.get('usage') or {}
+    prompt_tokens = int(usage.get('prompt_tokens', 0) or 0)
+    completion_tokens = int(usage.get('completion_tokens', 0) or 0)
+    total_tokens = int(usage.get('total_tokens', 0) or (prompt_tokens + completion_tokens))
+    return {
+        'prompt_tokens': prompt_tokens,
+        'completion_tokens': completion_tokens,
+        'total_tokens': total_tokens
+    }
+
+
+def estimate_cost(prompt_tokens: int, completion_tokens: int) -> float:
+    """按配置的单价估算费用（元）"""
+    return (prompt_tokens / 1000.0 * AI_CONFIG.get('prompt_token_price', 0) +
+            completion_tokens / 1000.0 * AI_CONFIG.get('completion_token_price', 0))
+
+
+_shared_limiter = None
+_shared_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> AIRateLimiter:
+    """获取进程内共享的限流器（本进程的所有线程和工作者共用，不跨进程）"""
+    global _shared_limiter
+    if _shared_limiter is None:
+        with _shared_limiter_lock:
+            if _shared_limiter is None:
+                _shared_limiter = AIRateLimiter(
+                    AI_CONFIG.get('requests_per_minute', 60),
+                    AI_CONFIG.get('tokens_per_minute', 120000)
+                )
+    return _shared_limiter
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+报告统计模块
+每份报告只计算一次的统计量，供报告的各个章节共用
+"""
+
+from functools import cached_property
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from models.aggregation_cube import AggregationCube
+
+
+class ReportStatistics:
+    """报告共用的统计量（按需计算并缓存）"""
+
+    def __init__(self, df: pd.DataFrame, cube: Optional[AggregationCube] = None):
+        """
+        初始化报告统计
+
+        Args:
+            df: 原始数据
+            cube: 已构建的聚合立方体（如DataAnalyzer.get_cube的结果），提供时直接从立方体上卷
+        """
+        self.df = df
+        self._cube = cube
+        self.row_count = len(df)
+        self.has_platform = 'platform' in df.columns
+        self.has_content_type = 'content_type' in df.columns
+        self.has_sentiment = 'sentiment' in df.columns
+        self.has_date = 'date' in df.columns
+        self._rollups = {}
+
+    def rollup(self, dim: str) -> pd.DataFrame:
+        """
+        按维度汇总互动量（每个维度只计算一次）
+
+        Returns:
+            以维度为索引，包含 rows/count/sum/min/max/mean 列的DataFrame
+        """
+        if dim not in self._rollups:
+            if self._cube is not None:
+                # 已有聚合立方体时直接上卷，不再扫描原始数据
+                self._rollups[dim] = self._cube.rollup(dim)
+            else:
+                grouped = self.df.groupby(dim, sort=True)['engagement']
+                table = grouped.agg(['size', 'count', 'sum', 'min', 'max']).rename(columns={'size': 'rows'})
+                table['mean'] = table['sum'] / table['count'].replace(0, np.nan)
+                self._rollups[dim] = table
+        return self._rollups[dim]
+
+    @cached_property
+    def engagement(self) -> dict:
+        """互动量整体统计：mean/max/min/std"""
+        values = self.df['engagement']
+        return {
+            'mean': values.mean(),
+            'max': values.max(),
+            'min': values.min(),
+            'std': values.std()
+        }
+
+    @cached_property
+    def platform_count(self) -> int:
+        """平台数量"""
+        return len(self.rollup('platform')) if self.has_platform else 0
+
+    @cached_property
+    def platform_table(self) -> pd.DataFrame:
+        """各平台 count/mean/max（取整）"""
+        return self.rollup('platform')[['count', 'mean', 'max']].round(0)
+
+    @cached_property
+    def content_table(self) -> pd.DataFrame:
+        """各内容类型 count/mean（取整）"""
+        return self.rollup('content_type')[['count', 'mean']].round(0)
+
+    @cached_property
+    def best_platform(self) -> Optional[str]:
+        """平均互动量最高的平台"""
+        if not self.has_platform:
+            return None
+        means = self.rollup('platform')['mean'].dropna()
+        return means.idxmax() if len(means) else None
+
+    @cached_property
+    def best_content_type(self) -> Optional[str]:
+        """平均互动量最高的内容类型"""
+        if not self.has_content_type:
+            return None
+        means = self.rollup('content_type')['mean'].dropna()
+        return means.idxmax() if len(means) else None
+
+    @cached_property
+    def sentiment_counts(self) -> pd.Series:
+        """各情感倾向的记录数（降序）"""
+        return self.rollup('sentiment')['rows'].sort_values(ascending=False, kind='stable')
+
+    @cached_property
+    def dominant_sentiment(self) -> Optional[Tuple[str, float]]:
+        """占比最高的情感倾向及其百分比"""
+        counts = self.sentiment_counts if self.has_sentiment else None
+        if counts is None or not len(counts):
+            return None
+        return counts.index[0], counts.iloc[0] / counts.sum() * 100
+
+    @cached_property
+    def date_range(self) -> Tuple[str, str]:
+        """数据时间范围"""
+        if not self.has_date:
+            return '未知', '未知'
+        return self.df['date'].min(), self.df['date'].max()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+报告模板模块
+Markdown报告模板在第一次使用时解析并编译为Python生成器，之后按文件修改时间缓存复用；
+被关闭的章节（section）连同其中的计算一起跳过
+
+模板语法（每行一条）:
+    普通行                      原样输出，{表达式} 和 {表达式:格式} 替换为值，{{ }} 输出花括号
+    {% if 条件 %} / {% elif 条件 %} / {% else %} / {% endif %}
+    {% for 变量 in 表达式 %} / {% endfor %}
+    {% section 名称 %} / {% endsection %}   章节开关（sections中为False时整段跳过）
+    {% include 模板名 %}                     插入另一个模板（共用同一组变量）
+    {# 注释 #}
+"""
+
+import builtins
+import os
+import re
+import string
+import threading
+from pathlib import Path
+from types import CodeType, FunctionType
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import logging
+
+from config import ANALYSIS_CONFIG, PATHS
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_SUFFIX = '.md'
+
+_DIRECTIVE = re.compile(r'\{%\s*(\w+)\s*(.*?)\s*%\}')
+_COMMENT = re.compile(r'\{#.*#\}')
+_FOR_TARGET = re.compile(r'(.+?)\s+in\s+(.+)')
+_BLOCK_ENDS = {'if': 'endif', 'for': 'endfor', 'section': 'endsection'}
+
+
+class TemplateError(Exception):
+    """模板语法错误"""
+
+
+def _compile_text(line: str, lineno: int, name: str) -> str:
+    """把一行文本编译为生成字符串的Python表达式"""
+    parts = []
+    try:
+        parsed = list(string.Formatter().parse(line))
+    except ValueError as e:
+        raise TemplateError(f"{name}:{lineno} 花括号不匹配: {e}")
+
+    for literal, field, spec, conversion in parsed:
+        if literal:
+            parts.append(repr(literal))
+        if field is None:
+            continue
+        if not field.strip():
+            raise TemplateError(f"{name}:{lineno} 空的表达式")
+        value = f"({field})"
+        if conversion:
+            value = {'r': 'repr', 's': 'str', 'a': 'ascii'}[conversion] + value
+        elif not spec:
+            value = 'str' + value
+        parts.append(f"format({value}, {spec!r})" if spec else value)
+
+    if not parts:
+        return "''"
+    if len(parts) == 1:
+        return parts[0]
+    return "''.join((" + ", ".join(parts) + ",))"
+
+
+def compile_template(source: str, name: str = '<template>') -> CodeType:
+    """
+    编译模板
+
+    Args:
+        source: 模板文本
+        name: 模板名称（用于错误信息）
+
+    Returns:
+        生成器函数的代码对象，执行时的全局变量即模板变量
+    """
+    # 第二行保证模板为空时函数仍是生成器
+    lines = ["def _render():", "    if False: yield ''"]
+    stack: List[Tuple[str, int]] = []
+    # 生成代码的每一行对应的模板行号，用于报告表达式错误的位置
+    line_map = [1, 1]
+
+    lineno = 0
+    for lineno, raw in enumerate(source.splitlines(), 1):
+        # 上一行模板生成的代码行
+        line_map.extend([lineno - 1] * (len(lines) - len(line_map)))
+        indent = "    " * (len(stack) + 1)
+        if _COMMENT.fullmatch(raw.strip()):
+            continue
+        match = _DIRECTIVE.fullmatch(raw.strip())
+        if match is None:
+            lines.append(f"{indent}yield {_compile_text(raw, lineno, name)}")
+            continue
+
+        keyword, argument = match.group(1), match.group(2)
+        if keyword == 'if':
+            lines.append(f"{indent}if {argument}:")
+            stack.append(('if', lineno))
+        elif keyword in ('elif', 'else'):
+            if not stack or stack[-1][0] != 'if':
+                raise TemplateError(f"{name}:{lineno} {keyword} 没有对应的 if")
+            outer = "    " * len(stack)
+            lines.append(f"{outer}    pass")
+            lines.append(f"{outer}elif {argument}:" if keyword == 'elif' else f"{outer}else:")
+        elif keyword == 'for':
+            target = _FOR_TARGET.fullmatch(argument)
+            if target is None:
+                raise TemplateError(f"{name}:{lineno} for 语法应为: for 变量 in 表达式")
+            lines.append(f"{indent}for {target.group(1)} in {target.group(2)}:")
+            stack.append(('for', lineno))
+        elif keyword == 'section':
+            if not argument.isidentifier():
+                raise TemplateError(f"{name}:{lineno} 章节名称无效: {argument}")
+            lines.append(f"{indent}if sections.get({argument!r}, True):")
+            stack.append(('section', lineno))
+        elif keyword == 'include':
+            lines.append(f"{indent}yield from include({argument!r})")
+        elif keyword in ('endif', 'endfor', 'endsection'):
+            if not stack or _BLOCK_ENDS[stack[-1][0]] != keyword:
+                raise TemplateError(f"{name}:{lineno} {keyword} 没有对应的开始标记")
+            # 空的块需要占位语句
+            lines.append(f"{indent}pass")
+            stack.pop()
+        else:
+            raise TemplateError(f"{name}:{lineno} 未知的模板指令: {keyword}")
+
+    line_map.extend([lineno] * (len(lines) - len(line_map)))
+    if stack:
+        keyword, lineno = stack[-1]
+        raise TemplateError(f"{name}:{lineno} {keyword} 缺少 {_BLOCK_ENDS[keyword]}")
+
+    try:
+        module = compile("\n".join(lines), f"<report template {name}>", 'exec')
+    except SyntaxError as e:
+        lineno = line_map[min(e.lineno or 1, len(line_map)) - 1]
+        raise TemplateError(f"{name}:{lineno} 模板表达式语法错误: {e.msg}")
+    # 取出生成器函数的代码对象
+    return next(const for const in module.co_consts if isinstance(const, CodeType))
+
+
+class ReportTemplates:
+    """报告模板加载器：按目录优先级查找模板，编译结果按文件修改时间缓存"""
+
+    def __init__(self, search_dirs: Optional[List[Path]] = None):
+        """
+        Args:
+            search_dirs: 模板目录（按优先级），默认为ANALYSIS_CONFIG中的自定义目录和内置模板目录
+        """
+        if search_dirs is None:
+            search_dirs = []
+            custom_dir = ANALYSIS_CONFIG.get('report_template_dir')
+            if custom_dir:
+                search_dirs.append(Path(custom_dir))
+            search_dirs.append(Path(PATHS['report_templates']))
+        self.search_dirs = search_dirs
+        self._compiled: Dict[str, Tuple[str, float, CodeType]] = {}
+        self._lock = threading.Lock()
+
+    def find(self, name: str) -> Path:
+        """查找模板文件"""
+        for directory in self.search_dirs:
+            path = directory / f"{name}{TEMPLATE_SUFFIX}"
+            if path.is_file():
+                return path
+        raise TemplateError(f"找不到报告模板: {name}")
+
+    def get(self, name: str) -> CodeType:
+        """获取编译后的模板（文件未修改时直接复用）"""
+        path = self.find(name)
+        mtime = os.path.getmtime(path)
+        cached = self._compiled.get(name)
+        if cached is not None and cached[0] == str(path) and cached[1] == mtime:
+            return cached[2]
+        with self._lock:
+            code = compile_template(path.read_text(encoding='utf-8'), name)
+            self._compiled[name] = (str(path), mtime, code)
+        logger.debug(f"已编译报告模板: {path}")
+        return code
+
+    def render(self, name: str, context: Dict[str, Any], sections: Optional[Dict[str, bool]] = None) -> Iterator[str]:
+        """
+        渲染模板
+
+        Args:
+            name: 模板名称
+            context: 模板变量
+            sections: 章节开关，未列出的章节默认输出
+
+        Yields:
+            报告的Markdown行
+        """
+        namespace = dict(context)
+        # FunctionType不会自动补充__builtins__（Python 3.9及更早版本中模板无法使用str、len等）
+        namespace['__builtins__'] = builtins
+        namespace['sections'] = sections or {}
+        namespace['include'] = lambda include_name: FunctionType(self.get(include_name), namespace)()
+        return FunctionType(self.get(name), namespace)()
+
+
+_templates = None
+
+
+def get_report_templates() -> ReportTemplates:
+    """获取共享的模板加载器（同一进程内的报告共用编译结果）"""
+    global _templates
+    if _templates is None:
+        _templates = ReportTemplates()
+    return _templates
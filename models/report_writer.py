@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+报告流式写入模块
+逐行把Markdown报告渲染为目标格式写入文件，并按章节回调预览，内存占用与报告长度无关
+"""
+
+from typing import Callable, Iterable, List, Optional, TextIO
+
+from models.markdown_renderer import RENDERERS
+
+HTML_HEAD = """
+<!DOCTYPE html>
+<html lang=\"zh-CN\">
+<head>
+    <meta charset=\"UTF-8\">
+    <meta name=\"viewport\" content=\"width=device-width, initial-scale=1.0\">
+    <title>社交媒体营销分析报告</title>
+    <style>
+        body { font-family: 'Microsoft YaHei', Arial, sans-serif; line-height: 1.6; margin: 40px; }
+        h1 { color: #2c3e50; border-bottom: 2px solid #3498db; padding-bottom: 10px; }
+        h2 { color: #34495e; margin-top: 30px; }
+        h3 { color: #7f8c8d; }
+        table { border-collapse: collapse; width: 100%; margin: 20px 0; }
+        th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
+        th { background-color: #f2f2f2; }
+        code { background-color: #f4f4f4; padding: 2px 4px; border-radius: 3px; }
+        blockquote { border-left: 4px solid #3498db; margin: 20px 0; padding-left: 20px; }
+    </style>
+</head>
+<body>
+"""
+
+HTML_TAIL = """
+</body>
+</html>
+        """
+
+class ReportWriter:
+    """流式报告写入器"""
+
+    def __init__(self, stream: Optional[TextIO] = None, format_type: str = "markdown",
+                 on_section: Optional[Callable[[str], None]] = None):
+        """
+        初始化写入器
+
+        Args:
+            stream: 输出文件句柄，为None时只回调预览
+            format_type: 输出格式（markdown/html/txt）
+            on_section: 每完成一个二级章节时以该章节的Markdown文本回调（用于界面预览）
+        """
+        self.stream = stream
+        self.format_type = format_type.lower()
+        renderer = RENDERERS.get(self.format_type)
+        self.renderer = renderer() if renderer else None
+        self.on_section = on_section
+        self.section: List[str] = []
+        self.started = False
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def write(self, line: str):
+        """写入一行Markdown"""
+        if self.stream is not None:
+            if not self.started and self.format_type == 'html':
+                self.stream.write(HTML_HEAD)
+            if self.renderer is not None:
+                self.stream.write(self.renderer.feed(line))
+            else:
+                # Markdown原样输出，行之间换行
+                if self.started:
+                    self.stream.write("\n")
+                self.stream.write(line)
+        self.started = True
+
+        if self.on_section is not None:
+            if line.startswith('## ') and self.section:
+                self._flush_section()
+            self.section.append(line)
+
+    def write_lines(self, lines: Iterable[str]):
+        """逐行写入"""
+        for line in lines:
+            self.write(line)
+
+    def close(self):
+        """输出最后一个章节和HTML结尾（不关闭文件句柄）"""
+        if self.closed:
+            return
+        self.closed = True
+        if self.on_section is not None and self.section:
+            self._flush_section()
+        if self.stream is not None:
+            if self.format_type == 'html' and not self.started:
+                self.stream.write(HTML_HEAD)
+            if self.renderer is not None:
+                self.stream.write(self.renderer.close())
+            if self.format_type == 'html':
+                self.stream.write(HTML_TAIL)
+
+    def _flush_section(self):
+        self.on_section("\n".join(self.section))
+        self.section = []
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+请求合并模块
+相同键的并发调用只执行一次，其余调用方等待并共享同一结果
+"""
+
+import hashlib
+import json
+import threading
+from typing import Any, Callable, Dict
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class _InFlightCall:
+    """正在执行的调用"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """线程安全的请求合并器"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls: Dict[str, _InFlightCall] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        执行fn，若相同key的调用正在进行则等待其结果
+
+        Args:
+            key: 调用键
+            fn: 实际执行的函数
+
+        Returns:
+            fn的返回值（异常同样会传递给所有等待方）
+        """
+        with self.lock:
+            call = self.calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                leader = False
+            else:
+                call = _InFlightCall()
+                self.calls[key] = call
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+        finally:
+            with self.lock:
+                self.calls.pop(key, None)
+            call.done.set()
+
+        if call.waiters:
+            logger.info(f"合并了 {call.waiters} 个重复的并发请求")
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def in_flight(self) -> int:
+        """当前正在执行的调用数"""
+        with self.lock:
+            return len(self.calls)
+
+
+def make_request_key(*parts: Any) -> str:
+    """由请求参数生成稳定的键"""
+    raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+# 进程内共享的AI请求合并器
+ai_single_flight = SingleFlight()
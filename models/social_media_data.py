@@ -4,6 +4,8 @@ import random
 from datetime import datetime, timedelta
 import os
 
+from models.prompt_builder import PromptBuilder
+
 class SocialMediaData:
     def __init__(self):
         # 支持的社交媒体平台
@@ -361,21 +363,12 @@ class SocialMediaData:
         
     def prepare_for_ai(self, analysis, platform):
         """为AI分析准备数据"""
-        ai_data = f"平台: {platform}\n\n"
-        
-        # 添加基本统计
-        ai_data += "基本统计:\n"
-        for key, value in analysis['基本统计'].items():
-            ai_data += f"- {key}: {value}\n"
-        
-        # 添加增长分析
-        ai_data += "\n增长分析:\n"
-        for key, value in analysis['增长分析'].items():
-            ai_data += f"- {key}: {value}\n"
-        
-        # 添加相关性分析
-        ai_data += "\n相关性分析:\n"
-        for key, value in analysis['相关性分析'].items():
-            ai_data += f"- {key}: {value}\n"
+        builder = PromptBuilder()
+        builder.add_line(f"平台: {platform}")
+        builder.add_section("基本统计", analysis['基本统计'])
+        builder.add_section("增长分析", analysis['增长分析'])
+        builder.add_section("相关性分析", analysis['相关性分析'])
+        builder.add_section("趋势分析", analysis.get('趋势分析'))
         
-        return ai_data    
\ No newline at end of file
+        ai_data, _ = builder.build()
+        return ai_data
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+启动性能分析模块
+在全新的Python进程中测量模块导入耗时（解析 -X importtime 的输出）以及显示登录界面、主界面的耗时，
+并按预算检查，便于在发布前发现启动变慢
+"""
+
+import os
+import queue
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# 启动各阶段完成时子进程输出的标记
+STAGES = ['login_window', 'main_view']
+
+# -X importtime输出中的分隔标记，之前的导入不计入被测模块
+_IMPORT_MARKER = 'startup-profiler: start'
+
+# 子进程：与应用中一样先创建QApplication（界面模块导入时需要），再导入被测模块
+_IMPORT_SCRIPT = """
+import sys
+sys.path.insert(0, {root!r})
+from PyQt6.QtWidgets import QApplication
+app = QApplication([])
+sys.stderr.write({marker!r} + '\\n')
+import {module}
+"""
+
+# 子进程：创建控制器（显示登录界面），以测试用户打开主界面，每个阶段处理完事件后输出标记
+_STARTUP_SCRIPT = """
+import os, sys
+sys.path.insert(0, {root!r})
+from controllers.main_controller import MainController
+controller = MainController()
+controller.app.processEvents()
+print('login_window', flush=True)
+controller.current_user = (0, 'startup-profile', 'startup-profile@example.com')
+controller.show_main_view()
+controller.app.processEvents()
+print('main_view', flush=True)
+controller.job_queue.stop()
+os._exit(0)
+"""
+
+
+def _child_env() -> Dict[str, str]:
+    """子进程环境：没有显示器时使用Qt的offscreen平台"""
+    env = dict(os.environ)
+    if sys.platform.startswith('linux') and not env.get('DISPLAY') and not env.get('WAYLAND_DISPLAY'):
+        env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    return env
+
+
+def parse_importtime(output: str) -> List[Tuple[str, int, int]]:
+    """
+    解析 -X importtime 的输出
+
+    Args:
+        output: 子进程的stderr
+
+    Returns:
+        [(模块名, 自身耗时(us), 累计耗时(us))]，按导入完成的顺序
+    """
+    records = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            # 表头行
+            continue
+        records.append((parts[2].strip(), int(parts[0]), int(parts[1])))
+    return records
+
+
+def profile_import(module: str, top: int = 10, timeout: float = 120) -> Dict[str, Any]:
+    """
+    在新进程中导入模块并记录各子模块的导入耗时（Qt和创建QApplication的耗时不计入）
+
+    Args:
+        module: 模块名
+        top: 记录自身耗时最长的模块数
+        timeout: 导入超过该秒数时结束子进程，结果记为无法测量
+
+    Returns:
+        {'module', 'total_ms', 'slowest': [(模块名, 自身ms, 累计ms)], 'packages': {顶层包: 自身耗时合计ms}}，
+        导入失败时包含'error'
+    """
+    script = _IMPORT_SCRIPT.format(root=str(PROJECT_ROOT), marker=_IMPORT_MARKER, module=module)
+    try:
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', script],
+            cwd=tempfile.gettempdir(), env=_child_env(), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+            text=True, encoding='utf-8', errors='replace', timeout=timeout
+        )
+    except subprocess.TimeoutExpired:
+        # subprocess.run超时时已结束子进程
+        return {'module': module, 'total_ms': None, 'slowest': [], 'packages': {},
+                'error': f"导入超过{timeout}秒未完成"}
+    records = parse_importtime(result.stderr.partition(_IMPORT_MARKER)[2])
+    total = next((cumulative for name, _, cumulative in reversed(records) if name == module), None)
+
+    packages: Dict[str, int] = defaultdict(int)
+    for name, self_us, _ in records:
+        packages[name.split('.')[0]] += self_us
+    slowest = sorted(records, key=lambda record: record[1], reverse=True)[:top]
+
+    profile = {
+        'module': module,
+        'total_ms': None if total is None else total / 1000,
+        'slowest': [(name, self_us / 1000, cumulative / 1000) for name, self_us, cumulative in slowest],
+        'packages': {name: us / 1000 for name, us in sorted(packages.items(), key=lambda item: -item[1])[:top]}
+    }
+    if result.returncode != 0 or total is None:
+        lines = result.stderr.strip().splitlines()
+        profile['error'] = lines[-1] if lines else "导入失败"
+    return profile
+
+
+def _pipe_reader(stream, lines: "queue.Queue[Optional[str]]"):
+    """在线程中逐行读取子进程输出，读完后放入None"""
+    try:
+        for line in stream:
+            lines.put(line)
+    finally:
+        lines.put(None)
+
+
+def _drain(lines: "queue.Queue[Optional[str]]") -> str:
+    """取出已读到的全部输出"""
+    parts = []
+    while True:
+        try:
+            line = lines.get_nowait()
+        except queue.Empty:
+            break
+        if line is None:
+            break
+        parts.append(line)
+    return "".join(parts)
+
+
+def measure_startup(timeout: float = 120) -> Dict[str, Any]:
+    """
+    在新进程中启动应用，测量从启动进程到各阶段完成的耗时
+
+    数据库等相对路径的文件写到临时目录，不影响项目目录中的数据；
+    stdout和stderr由后台线程读取，子进程卡住或超过timeout秒时结束子进程
+
+    Returns:
+        {'login_window_ms', 'main_view_ms'}（未到达的阶段为None），失败时包含'error'
+    """
+    timings: Dict[str, Any] = {f"{stage}_ms": None for stage in STAGES}
+    script = _STARTUP_SCRIPT.format(root=str(PROJECT_ROOT))
+    with tempfile.TemporaryDirectory() as work_dir:
+        start = time.perf_counter()
+        deadline = time.monotonic() + timeout
+        process = subprocess.Popen([sys.executable, '-c', script], cwd=work_dir, env=_child_env(),
+                                   stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                   text=True, encoding='utf-8', errors='replace')
+        stdout_lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        stderr_lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        readers = [threading.Thread(target=_pipe_reader, args=(process.stdout, stdout_lines), daemon=True),
+                   threading.Thread(target=_pipe_reader, args=(process.stderr, stderr_lines), daemon=True)]
+        for reader in readers:
+            reader.start()
+
+        timed_out = False
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                timed_out = True
+                break
+            try:
+                line = stdout_lines.get(timeout=remaining)
+            except queue.Empty:
+                timed_out = True
+                break
+            if line is None:
+                break
+            stage = line.strip()
+            if stage in STAGES:
+                timings[f"{stage}_ms"] = (time.perf_counter() - start) * 1000
+
+        if not timed_out:
+            try:
+                process.wait(timeout=max(deadline - time.monotonic(), 0))
+            except subprocess.TimeoutExpired:
+                timed_out = True
+        if timed_out:
+            process.kill()
+            process.wait()
+        for reader in readers:
+            reader.join(timeout=5)
+
+    stderr = _drain(stderr_lines)
+    if timed_out:
+        timings['error'] = f"超过{timeout}秒未完成"
+    elif process.returncode != 0:
+        lines = stderr.strip().splitlines()
+        timings['error'] = lines[-1] if lines else f"退出码 {process.returncode}"
+    return timings
+
+
+def best_of(measure, repeat: int, keys: List[str]) -> Dict[str, Any]:
+    """
+    重复测量，各项取最小值（排除系统负载造成的波动）
+
+    Args:
+        measure: 无参数的测量函数，返回字典
+        repeat: 重复次数
+        keys: 取最小值的数值项，其余项取第一次的结果
+    """
+    runs = [measure() for _ in range(max(1, repeat))]
+    best = dict(runs[0])
+    for key in keys:
+        values = [run[key] for run in runs if run.get(key) is not None]
+        best[key] = min(values) if values else None
+    return best
+
+
+def check_budget(imports: List[Dict[str, Any]], startup: Dict[str, Any],
+                 budget: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+    """
+    按预算检查测量结果
+
+    Args:
+        imports: profile_import的结果
+        startup: measure_startup的结果
+        budget: {'login_window_ms', 'main_view_ms', 'imports_ms': {模块名: 毫秒}}
+
+    Returns:
+        (超出预算的项, 无法测量的项)
+    """
+    violations, unmeasured = [], []
+
+    def check(label: str, value: Optional[float], limit: Optional[float], error: Optional[str]):
+        if limit is None:
+            return
+        if value is None:
+            unmeasured.append(f"{label}: {error or '未测量'}")
+        elif value > limit:
+            violations.append(f"{label}: {value:.0f}ms > 预算 {limit:.0f}ms")
+
+    import_budget = budget.get('imports_ms', {})
+    for profile in imports:
+        check(f"导入 {profile['module']}", profile['total_ms'], import_budget.get(profile['module']),
+              profile.get('error'))
+    for stage in STAGES:
+        key = f"{stage}_ms"
+        check(f"启动 {stage}", startup.get(key), budget.get(key), startup.get('error'))
+    return violations, unmeasured
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+结构化输出模块
+定义AI返回的JSON结构（类型化记录），并提供预编译的快速校验器
+"""
+
+import json
+from dataclasses import dataclass, field, fields, asdict, MISSING
+from functools import lru_cache
+from typing import Dict, List, Any, Callable, Tuple, Type, get_type_hints
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AnalysisRecord:
+    """数据分析结果"""
+    summary: str
+    trends: List[str] = field(default_factory=list)
+    user_behavior: List[str] = field(default_factory=list)
+    content_performance: List[str] = field(default_factory=list)
+    opportunities: List[str] = field(default_factory=list)
+    risks: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ContentOptimizationRecord:
+    """内容优化结果"""
+    optimized_content: str
+    publish_time: str = ""
+    hashtags: List[str] = field(default_factory=list)
+    visual_elements: List[str] = field(default_factory=list)
+    expected_improvement: str = ""
+
+
+# 结构名称 -> 记录类型
+RECORD_TYPES = {
+    'analysis': AnalysisRecord,
+    'content_optimization': ContentOptimizationRecord
+}
+
+# 字段说明，用于提示模型
+FIELD_DESCRIPTIONS = {
+    'summary': '整体分析结论',
+    'trends': '数据趋势要点',
+    'user_behavior': '用户行为洞察',
+    'content_performance': '内容效果评估',
+    'opportunities': '机会点',
+    'risks': '挑战与风险',
+    'hashtags': '标签建议（不含#号）',
+    'publish_time': '建议发布时间',
+    'optimized_content': '优化后的完整内容文本',
+    'visual_elements': '视觉元素建议',
+    'expected_improvement': '预期互动率提升'
+}
+
+
+def _json_type(annotation) -> str:
+    """将类型注解映射为JSON类型名"""
+    if annotation is str:
+        return 'string'
+    if getattr(annotation, '__origin__', None) in (list, List):
+        return 'array'
+    raise TypeError(f"不支持的字段类型: {annotation}")
+
+
+def _make_checker(name: str, json_type: str, required: bool) -> Callable[[Dict[str, Any]], str]:
+    """为单个字段生成校验函数，返回错误信息或空字符串"""
+    if json_type == 'string':
+        def check(data):
+            if name not in data:
+                return f"缺少字段 {name}" if required else ""
+            return "" if isinstance(data[name], str) else f"字段 {name} 应为字符串"
+    else:
+        def check(data):
+            if name not in data:
+                return f"缺少字段 {name}" if required else ""
+            value = data[name]
+            if not isinstance(value, list):
+                return f"字段 {name} 应为数组"
+            if not all(isinstance(item, str) for item in value):
+                return f"字段 {name} 的元素应为字符串"
+            return ""
+    return check
+
+
+@lru_cache(maxsize=None)
+def _compile(schema_name: str) -> Tuple[Type, Tuple[Callable, ...]]:
+    """编译并缓存结构的校验器"""
+    record_type = RECORD_TYPES[schema_name]
+    hints = get_type_hints(record_type)
+    checkers = []
+    for f in fields(record_type):
+        required = f.default is MISSING and f.default_factory is MISSING
+        checkers.append(_make_checker(f.name, _json_type(hints[f.name]), required))
+    return record_type, tuple(checkers)
+
+
+def get_json_schema(schema_name: str) -> Dict[str, Any]:
+    """生成JSON Schema描述"""
+    record_type, _ = _compile(schema_name)
+    hints = get_type_hints(record_type)
+    properties = {}
+    for f in fields(record_type):
+        json_type = _json_type(hints[f.name])
+        prop = {'type': json_type, 'description': FIELD_DESCRIPTIONS.get(f.name, f.name)}
+        if json_type == 'array':
+            prop['items'] = {'type': 'string'}
+        properties[f.name] = prop
+    return {
+        'type': 'object',
+        'properties': properties,
+        'required': [f.name for f in fields(record_type)
+                     if f.default is MISSING and f.default_factory is MISSING]
+    }
+
+
+def build_json_instruction(schema_name: str) -> str:
+    """生成要求模型按结构输出JSON的提示"""
+    schema = get_json_schema(schema_name)
+    example = {}
+    for name, prop in schema['properties'].items():
+        example[name] = [prop['description']] if prop['type'] == 'array' else prop['description']
+    return (
+        "\n\n请严格以JSON格式输出，不要包含Markdown代码块或其他文字。"
+        "JSON对象必须包含以下字段（数组字段的元素为字符串）：\n"
+        f"{json.dumps(example, ensure_ascii=False, indent=2)}"
+    )
+
+
+def validate(schema_name: str, data: Any) -> List[str]:
+    """
+    校验数据是否符合结构
+
+    Returns:
+        错误信息列表，为空表示校验通过
+    """
+    if not isinstance(data, dict):
+        return ["响应不是JSON对象"]
+    _, checkers = _compile(schema_name)
+    return [error for error in (check(data) for check in checkers) if error]
+
+
+def parse_record(schema_name: str, content: str):
+    """
+    解析并校验模型输出，返回类型化记录
+
+    Raises:
+        ValueError: JSON格式错误或不符合结构
+    """
+    try:
+        data = json.loads(content)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"响应不是合法的JSON: {str(e)}")
+
+    errors = validate(schema_name, data)
+    if errors:
+        raise ValueError("; ".join(errors))
+
+    record_type, _ = _compile(schema_name)
+    return record_type(**{f.name: data[f.name] for f in fields(record_type) if f.name in data})
+
+
+def request_record(schema_name: str, prompt: str, send: Callable[[str], str], retries: int = 1):
+    """
+    请求结构化响应并校验，格式错误时把错误告诉模型后重试
+
+    Args:
+        schema_name: 结构名称（见RECORD_TYPES）
+        prompt: 提示词（不含JSON格式要求）
+        send: 发送提示词并返回模型输出文本的函数（应以JSON模式请求）
+        retries: 校验失败后的重试次数
+
+    Returns:
+        类型化记录
+
+    Raises:
+        ValueError: 重试后响应仍不符合结构
+    """
+    structured_prompt = prompt + build_json_instruction(schema_name)
+    error = None
+    for attempt in range(retries + 1):
+        if error is not None:
+            # 同时使请求体与上次不同，避免被合并或命中相同结果
+            structured_prompt = f"{prompt}{build_json_instruction(schema_name)}\n\n上次输出有误：{error}，请修正。"
+        try:
+            return parse_record(schema_name, send(structured_prompt))
+        except ValueError as e:
+            error = str(e)
+            logger.warning(f"结构化响应校验失败（第{attempt + 1}次）: {error}")
+    raise ValueError(f"结构化响应校验失败: {error}")
+
+
+def record_to_dict(record) -> Dict[str, Any]:
+    """将记录转换为字典"""
+    return asdict(record)
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+词云服务模块
+基于预先统计的关键词频率生成词云，按频率向量缓存排版结果，并自动选择中文字体
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Optional
+import logging
+
+import numpy as np
+
+from config import ANALYSIS_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# 常见系统中文字体路径（按优先级）
+_CJK_FONT_PATHS = [
+    'C:/Windows/Fonts/msyh.ttc',
+    'C:/Windows/Fonts/simhei.ttf',
+    'C:/Windows/Fonts/simsun.ttc',
+    '/System/Library/Fonts/PingFang.ttc',
+    '/System/Library/Fonts/STHeiti Medium.ttc',
+    '/Library/Fonts/Arial Unicode.ttf',
+    '/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc',
+    '/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc',
+    '/usr/share/fonts/truetype/wqy/wqy-microhei.ttc',
+    '/usr/share/fonts/truetype/wqy/wqy-zenhei.ttc'
+]
+
+# 通过matplotlib字体管理器查找的中文字体族
+_CJK_FONT_FAMILIES = ['Microsoft YaHei', 'SimHei', 'PingFang SC', 'Noto Sans CJK SC',
+                      'WenQuanYi Micro Hei', 'WenQuanYi Zen Hei', 'Arial Unicode MS']
+
+
+@lru_cache(maxsize=1)
+def find_cjk_font() -> Optional[str]:
+    """
+    查找可用的中文字体文件
+
+    Returns:
+        字体文件路径，找不到时返回None（使用wordcloud默认字体，中文会显示为方框）
+    """
+    configured = ANALYSIS_CONFIG.get('wordcloud_font_path')
+    if configured and os.path.exists(configured):
+        return configured
+
+    for path in _CJK_FONT_PATHS:
+        if os.path.exists(path):
+            return path
+
+    try:
+        from matplotlib import font_manager
+        for family in _CJK_FONT_FAMILIES:
+            path = font_manager.findfont(family, fallback_to_default=False)
+            if path and os.path.exists(path):
+                return path
+    except Exception:
+        pass
+
+    logger.warning("未找到中文字体，词云中的中文可能无法正常显示")
+    return None
+
+
+class WordCloudService:
+    """带排版缓存的词云生成服务"""
+
+    def __init__(self, max_words: int = 100, cache_size: int = 16):
+        """
+        初始化词云服务
+
+        Args:
+            max_words: 最多显示的词数
+            cache_size: 内存中缓存的排版数量
+        """
+        self.max_words = max_words
+        self.cache_size = cache_size
+        self.layouts = OrderedDict()
+        self.lock = threading.Lock()
+
+    def _layout_key(self, frequencies: Dict[str, float], width: int, height: int,
+                    font_path: Optional[str], background_color: str) -> str:
+        """由频率向量和渲染参数生成排版缓存键"""
+        top = sorted(frequencies.items(), key=lambda item: (-item[1], item[0]))[:self.max_words]
+        raw = json.dumps([top, width, height, font_path, background_color, self.max_words],
+                         ensure_ascii=False, default=str)
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def generate(self, frequencies: Dict[str, float], width: Optional[int] = None,
+                 height: Optional[int] = None, background_color: str = 'white'):
+        """
+        生成词云（命中缓存时直接复用排版）
+
+        Args:
+            frequencies: 关键词频率
+            width: 输出宽度（像素），默认读取ANALYSIS_CONFIG
+            height: 输出高度（像素）
+            background_color: 背景色
+
+        Returns:
+            已完成排版的WordCloud对象
+        """
+        from wordcloud import WordCloud
+
+        if not frequencies:
+            raise ValueError("关键词频率为空，无法生成词云")
+
+        width = width or ANALYSIS_CONFIG.get('wordcloud_width', 800)
+        height = height or ANALYSIS_CONFIG.get('wordcloud_height', 400)
+        font_path = find_cjk_font()
+        key = self._layout_key(frequencies, width, height, font_path, background_color)
+
+        with self.lock:
+            cloud = self.layouts.get(key)
+            if cloud is not None:
+                self.layouts.move_to_end(key)
+                return cloud
+
+        # 直接按目标分辨率排版（scale=1），固定随机种子使相同输入得到相同排版
+        cloud = WordCloud(
+            width=width,
+            height=height,
+            scale=1,
+            max_words=self.max_words,
+            background_color=background_color,
+            font_path=font_path,
+            random_state=42
+        ).generate_from_frequencies(frequencies)
+
+        with self.lock:
+            self.layouts[key] = cloud
+            while len(self.layouts) > self.cache_size:
+                self.layouts.popitem(last=False)
+        return cloud
+
+    def render(self, frequencies: Dict[str, float], width: Optional[int] = None,
+               height: Optional[int] = None, background_color: str = 'white') -> np.ndarray:
+        """
+        渲染词云图像
+
+        Returns:
+            RGB像素数组 (height, width, 3)
+        """
+        return self.generate(frequencies, width, height, background_color).to_array()
+
+
+# 进程内共享的词云服务
+_wordcloud_service = None
+
+
+def get_wordcloud_service() -> WordCloudService:
+    """获取进程内共享的词云服务"""
+    global _wordcloud_service
+    if _wordcloud_service is None:
+        _wordcloud_service = WordCloudService()
+    return _wordcloud_service
@@ -6,14 +6,24 @@
 
 import sys
 import os
+import importlib.util
+from importlib import metadata
 from pathlib import Path
 
 # 添加项目根目录到Python路径
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
+def is_package_installed(import_name, package_name):
+    """按包的安装元数据判断是否已安装，没有元数据时查找模块文件"""
+    try:
+        metadata.distribution(package_name)
+        return True
+    except metadata.PackageNotFoundError:
+        return importlib.util.find_spec(import_name) is not None
+
 def check_dependencies():
-    """检查依赖包"""
+    """检查依赖包（只查询安装信息，不导入包，启动时无需等待各个库加载）"""
     required_packages = [
         ('PyQt6', 'PyQt6'),
         ('pandas', 'pandas'),
@@ -31,9 +41,7 @@ def check_dependencies():
     
     missing_packages = []
     for import_name, package_name in required_packages:
-        try:
-            __import__(import_name)
-        except ImportError:
+        if not is_package_installed(import_name, package_name):
             missing_packages.append(package_name)
     
     if missing_packages:
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量报告生成脚本
+读取任务文件，在多个进程中并行生成报告，输出到reports目录并写出manifest.json
+
+任务文件为CSV（列: dataset,platform,template,format,name,plan,include_charts）或JSON任务数组，
+dataset 为数据文件路径或 sample:<平台>，template 为 analysis/combined/marketing，format 为 markdown/html/txt
+
+用法: python scripts/batch_reports.py jobs.csv [--output reports/2024_06] [--workers 8]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from models.batch_reports import load_jobs, run_batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description="批量生成社交媒体分析报告")
+    parser.add_argument('jobs', help="任务文件（CSV或JSON）")
+    parser.add_argument('--output', default=None, help="输出目录，默认 reports/batch_<时间戳>")
+    parser.add_argument('--workers', type=int, default=None, help="进程数，默认CPU核数")
+    args = parser.parse_args()
+
+    jobs = load_jobs(args.jobs)
+    print(f"共 {len(jobs)} 个报告任务")
+
+    def progress(done, total):
+        print(f"\r已完成 {done}/{total}", end='', flush=True)
+
+    manifest = run_batch(jobs, args.output, args.workers, progress=progress)
+    print()
+    print(f"成功 {manifest['succeeded']} 份，失败 {manifest['failed']} 份，"
+          f"耗时 {manifest['seconds']:.1f} 秒")
+    print(f"输出目录: {manifest['output_dir']}")
+    for entry in manifest['reports']:
+        if entry['status'] != 'success':
+            print(f"  [{entry['index']}] {entry['dataset']} / {entry['platform']}: {entry['error']}")
+    return 1 if manifest['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
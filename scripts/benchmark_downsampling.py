@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+时间序列降采样性能测试脚本
+构造千万级数据点的随机游走序列，测量各降采样方法的耗时，以及降采样后绘制并渲染为PNG的总耗时，
+与目标耗时比较
+
+用法: python scripts/benchmark_downsampling.py [--points 10000000] [--repeat 5] [--target-ms 50]
+"""
+
+import argparse
+import io
+import statistics
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from models import chart_backend
+from models.downsampling import DOWNSAMPLERS, POINTS_PER_PIXEL, downsample, plot_downsampled
+
+
+def build_series(points: int, seed: int = 0):
+    """生成单调递增横坐标的随机游走序列"""
+    rng = np.random.default_rng(seed)
+    x = np.arange(points, dtype=np.float64)
+    y = np.cumsum(rng.standard_normal(points))
+    return x, y
+
+
+def median_ms(repeat: int, func) -> float:
+    """重复执行取中位数耗时（毫秒）"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def render_png(x, y, method: str):
+    """与分析页相同尺寸的图表：降采样、绘制并渲染为PNG"""
+    fig, ax = chart_backend.subplots(figsize=(10, 6))
+    plot_downsampled(ax, x, y, method=method, linewidth=1)
+    fig.savefig(io.BytesIO(), format='png', dpi=100)
+    chart_backend.close_figure(fig)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="时间序列降采样性能测试")
+    parser.add_argument('--points', type=int, default=10_000_000, help='数据点数')
+    parser.add_argument('--width', type=int, default=800, help='坐标轴像素宽度')
+    parser.add_argument('--repeat', type=int, default=5, help="每项重复次数（取中位数）")
+    parser.add_argument('--target-ms', type=float, default=50.0, help='降采样耗时目标（毫秒）')
+    args = parser.parse_args()
+
+    # 缺少中文字体时matplotlib会对每个字形告警
+    warnings.filterwarnings('ignore', category=UserWarning)
+
+    x, y = build_series(args.points)
+    target = args.width * POINTS_PER_PIXEL
+    print(f"数据点: {args.points:,}, 目标点数: {target}（{args.width}像素 x {POINTS_PER_PIXEL}）")
+
+    failed = False
+    print(f"{'方法':<10}{'降采样(ms)':>12}{'绘制+PNG(ms)':>14}{'结果':>8}")
+    for method in DOWNSAMPLERS:
+        downsample(x, y, target, method)
+        reduce_ms = median_ms(args.repeat, lambda: downsample(x, y, target, method))
+        render_ms = median_ms(args.repeat, lambda: render_png(x, y, method))
+        passed = reduce_ms <= args.target_ms
+        failed = failed or not passed
+        print(f"{method:<10}{reduce_ms:>12.1f}{render_ms:>14.1f}{'通过' if passed else '超时':>8}")
+    print("注: 绘制+PNG包含坐标轴、刻度文字等固定开销，与数据点数无关")
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
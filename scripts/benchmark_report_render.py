@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+报告渲染性能测试脚本
+构造数MB的Markdown报告（大表格、列表、粗体等），对比旧的整串替换转换与逐行渲染的耗时和内存，
+并检查输出的HTML是否结构完整
+
+用法: python scripts/benchmark_report_render.py [--size-mb 8] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from models.markdown_renderer import render_markdown
+from models.report_writer import ReportWriter, HTML_HEAD, HTML_TAIL
+
+PLATFORMS = ['微信', '微博', '抖音', '小红书', 'B站']
+
+
+def build_report(size_mb: float):
+    """生成约size_mb大小的报告行（结构与ReportGenerator输出一致）"""
+    lines = ["# 多平台社交媒体数据分析报告", "", "**生成时间**: 2024年06月30日 12:00:00", ""]
+    size = 0
+    section = 0
+    while size < size_mb * 1024 * 1024:
+        section += 1
+        block = [f"## 📈 第{section}部分 统计信息", "", "### 平台分布统计", "",
+                 "| 平台 | 数据量 | 平均互动量 | 最高互动量 |",
+                 "|------|--------|------------|------------|"]
+        block += [f"| {PLATFORMS[i % 5]}账号{i} | {i * 7} | {i * 3.5:.0f} | {i * 11} |" for i in range(200)]
+        block += ["", "### 关键发现", ""]
+        block += [f"{i}. **{PLATFORMS[i % 5]}** 平台的互动量 *同比增长* {i}%，`engagement > {i * 10}`" for i in range(1, 50)]
+        block += ["", "### 建议", ""]
+        block += [f"- **建议{i}**: 优化发布节奏 & 内容结构 <{i}>" for i in range(50)]
+        block += ["", "本段为说明文字，描述数据来源和统计口径，", "用于衡量渲染普通段落的开销。", ""]
+        lines.extend(block)
+        size += sum(len(line.encode('utf-8')) + 1 for line in block)
+    return lines
+
+
+def legacy_html(content: str) -> str:
+    """旧版转换：整串多次替换"""
+    html_content = content.replace('# ', '<h1>').replace('## ', '<h2>').replace('### ', '<h3>')
+    return f"{HTML_HEAD}{html_content}{HTML_TAIL}"
+
+
+def legacy_text(content: str) -> str:
+    """旧版转换：整串多次替换"""
+    for old, new in (('# ', ''), ('## ', ''), ('### ', ''), ('**', ''), ('*', ''),
+                     ('|', ' '), ('- ', '• ')):
+        content = content.replace(old, new)
+    return content
+
+
+def best_time(repeat: int, func) -> float:
+    """多次运行取最快一次的耗时（秒）"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def peak_memory(func) -> float:
+    """单独运行一次测量峰值内存（MB），tracemalloc会拖慢运行，不与计时同时进行"""
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+def stream_to_devnull(lines, format_type):
+    with open(os.devnull, 'w', encoding='utf-8') as f:
+        with ReportWriter(f, format_type) as writer:
+            writer.write_lines(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="报告渲染性能测试")
+    parser.add_argument('--size-mb', type=float, default=8, help="报告大小（MB）")
+    parser.add_argument('--repeat', type=int, default=3, help="每项重复次数（取最快一次）")
+    args = parser.parse_args()
+
+    lines = build_report(args.size_mb)
+    content = "\n".join(lines)
+    size_mb = len(content.encode('utf-8')) / 1024 / 1024
+    print(f"报告: {len(lines)} 行, {size_mb:.1f} MB")
+
+    body = "".join(render_markdown(lines, 'html'))
+    ET.fromstring(f"<body>{body}</body>")
+    print("HTML结构检查: 通过（标签全部闭合，特殊字符已转义）")
+
+    cases = [
+        ("HTML 旧版整串替换", lambda: legacy_html(content)),
+        ("HTML 逐行渲染", lambda: "".join(render_markdown(lines, 'html'))),
+        ("HTML 流式写入文件", lambda: stream_to_devnull(lines, 'html')),
+        ("TXT  旧版整串替换", lambda: legacy_text(content)),
+        ("TXT  逐行渲染", lambda: "".join(render_markdown(lines, 'txt'))),
+        ("TXT  流式写入文件", lambda: stream_to_devnull(lines, 'txt')),
+    ]
+    print(f"{'方式':<20}{'耗时(s)':>10}{'MB/s':>10}{'峰值内存(MB)':>14}")
+    for name, func in cases:
+        elapsed = best_time(args.repeat, func)
+        peak = peak_memory(func)
+        print(f"{name:<20}{elapsed:>10.3f}{size_mb / elapsed:>10.1f}{peak:>14.1f}")
+    print("注: 旧版不生成表格、列表和段落，也不转义特殊字符，输出的HTML结构不完整")
+
+
+if __name__ == '__main__':
+    main()
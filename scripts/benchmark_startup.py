@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+启动性能测试脚本
+在全新的Python进程中分别测量依赖检查、导入主控制器和显示登录界面的耗时，
+并与启动时导入全部依赖和分析模块的旧方式对比（没有显示器时使用Qt的offscreen平台）
+
+用法: python scripts/benchmark_startup.py [--repeat 3]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+# 创建控制器（显示登录界面），事件循环处理完首次绘制后退出
+SHOW_LOGIN = (
+    "from config import APP_CONFIG\n"
+    "APP_CONFIG['startup_warm_up'] = False\n"
+    "from PyQt6.QtCore import QTimer\n"
+    "from controllers.main_controller import MainController\n"
+    "controller = MainController()\n"
+    "assert controller.login_view.isVisible()\n"
+    "QTimer.singleShot(0, controller.app.quit)\n"
+    "controller.app.exec()\n"
+    "controller.job_queue.stop()\n"
+    "os._exit(0)\n"
+)
+
+# 各测试项在子进程中执行的代码
+CASES = [
+    ("依赖检查 旧版（导入全部依赖）",
+     "import run\n"
+     "for name in ['PyQt6', 'pandas', 'numpy', 'matplotlib', 'seaborn', 'requests', 'openai',\n"
+     "             'plotly', 'wordcloud', 'sklearn', 'textblob', 'nltk']:\n"
+     "    try:\n"
+     "        __import__(name)\n"
+     "    except ImportError:\n"
+     "        pass\n"),
+    ("依赖检查 元数据", "import run; run.check_dependencies()"),
+    ("导入主控制器", "import controllers.main_controller"),
+    ("显示登录界面 启动时加载全部模块",
+     "from controllers import main_controller\n"
+     "main_controller.warm_up_modules()\n" + SHOW_LOGIN),
+    ("显示登录界面 按需加载", SHOW_LOGIN),
+]
+
+
+def run_case(code: str) -> float:
+    """
+    在新进程中执行代码，返回从启动进程到退出的耗时（秒）
+
+    子进程在临时目录中运行：数据库等相对路径的文件不会打开项目目录中的真实数据，
+    任务队列也不会接管正在运行的应用的AI任务
+    """
+    env = dict(os.environ)
+    if sys.platform.startswith('linux') and not env.get('DISPLAY') and not env.get('WAYLAND_DISPLAY'):
+        env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    script = f"import os, sys\nsys.path.insert(0, {str(PROJECT_ROOT)!r})\n" + code
+    with tempfile.TemporaryDirectory() as work_dir:
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, '-c', script], cwd=work_dir, env=env,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "子进程失败")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="启动性能测试")
+    parser.add_argument('--repeat', type=int, default=3, help="每项重复次数（取最快一次）")
+    args = parser.parse_args()
+
+    baseline = min(run_case("pass") for _ in range(args.repeat))
+    print(f"Python解释器启动: {baseline:.3f}s（以下耗时均包含解释器启动）")
+    print(f"{'测试项':<32}{'耗时(s)':>10}")
+    for name, code in CASES:
+        try:
+            elapsed = min(run_case(code) for _ in range(args.repeat))
+            print(f"{name:<32}{elapsed:>10.3f}")
+        except RuntimeError as e:
+            print(f"{name:<32}{'失败':>10}  {e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+仪表盘图表内存泄漏检查脚本
+使用离屏画布连续刷新仪表盘图表，检查Figure数量、图元数量和内存是否稳定增长
+
+用法: python scripts/check_dashboard_leak.py [--iterations 1000] [--max-growth-kb 512]
+"""
+
+import argparse
+import gc
+import random
+import sys
+import tracemalloc
+import warnings
+from pathlib import Path
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from models.chart_manager import DashboardChartManager
+
+PLATFORMS = ['微信', '微博', '抖音', '小红书', 'B站']
+
+
+def make_canvas():
+    """创建与主界面相同尺寸的离屏画布"""
+    fig, _ = plt.subplots(figsize=(5, 4))
+    return FigureCanvasAgg(fig)
+
+
+# 刷新数据按周期重复，预热阶段即可填满matplotlib内部的有界缓存（如文字尺寸缓存），
+# 之后的内存增长才反映真实泄漏
+CYCLE = 60
+
+
+def refresh(manager, step: int):
+    """模拟一次仪表盘刷新：多数刷新只改数值，每20次变化一次日期和平台，每周期一次空数据"""
+    variant = step % CYCLE
+    if variant == CYCLE - 1:
+        manager.show_empty()
+        return
+
+    rng = random.Random(variant)
+    days = 7 + (variant // 20) % 3
+    dates = [f"2024-01-{day:02d}" for day in range(1, days + 1)]
+    manager.update_trends(dates, [rng.randint(1, 20) for _ in dates])
+
+    platforms = PLATFORMS[:3 + (variant // 20) % 3]
+    manager.update_platforms(platforms, [rng.randint(1, 50) for _ in platforms])
+
+
+def count_artists(canvas) -> int:
+    """统计Figure中的图元数量"""
+    return sum(len(ax.get_children()) for ax in canvas.figure.axes)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="仪表盘图表内存泄漏检查")
+    parser.add_argument('--iterations', type=int, default=1000, help='刷新次数')
+    parser.add_argument('--warmup', type=int, default=CYCLE * 4, help='预热次数（不计入内存增长）')
+    parser.add_argument('--max-growth-kb', type=int, default=512, help='允许的内存增长上限（KB）')
+    args = parser.parse_args()
+
+    # 缺少中文字体时matplotlib会对每个字形告警，告警注册表本身也会占用内存
+    warnings.filterwarnings('ignore', category=UserWarning)
+
+    # 在预热前开始跟踪，否则有界缓存淘汰跟踪前分配的条目时只计入新分配，表现为虚假增长
+    tracemalloc.start()
+
+    trends_canvas = make_canvas()
+    platform_canvas = make_canvas()
+    manager = DashboardChartManager(trends_canvas, platform_canvas)
+
+    # 预热阶段记录各种数据形态下的最大图元数量
+    max_artists = 0
+    for step in range(args.warmup):
+        refresh(manager, step)
+        max_artists = max(max_artists, count_artists(trends_canvas), count_artists(platform_canvas))
+
+    figure_count = len(plt.get_fignums())
+    artist_limit = max_artists
+
+    gc.collect()
+    baseline, _ = tracemalloc.get_traced_memory()
+
+    failures = []
+    for step in range(args.warmup, args.warmup + args.iterations):
+        refresh(manager, step)
+        if len(plt.get_fignums()) != figure_count:
+            failures.append(f"第{step}次刷新后Figure数量变为 {len(plt.get_fignums())}（初始 {figure_count}）")
+            break
+        if max(count_artists(trends_canvas), count_artists(platform_canvas)) > artist_limit:
+            failures.append(f"第{step}次刷新后图元数量超过预热阶段的最大值 {artist_limit}")
+            break
+
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    growth_kb = (current - baseline) / 1024
+    if growth_kb > args.max_growth_kb:
+        failures.append(f"内存增长 {growth_kb:.1f}KB，超过上限 {args.max_growth_kb}KB")
+
+    print(f"刷新 {args.iterations} 次: Figure {len(plt.get_fignums())} 个, "
+          f"内存增长 {growth_kb:.1f}KB, 峰值 {peak / 1024:.1f}KB")
+
+    if failures:
+        for failure in failures:
+            print(f"[失败] {failure}")
+        return 1
+
+    print("[通过] 未发现内存泄漏")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+启动耗时分析与预算检查脚本
+逐个模块在新进程中以 -X importtime 导入，列出耗时最多的模块和第三方包，
+再测量显示登录界面和主界面的耗时；任一项超出 config.STARTUP_BUDGET 时退出码为1
+
+用法: python scripts/profile_startup.py [--repeat 3] [--budget budget.json] [--json result.json] [--strict]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from config import STARTUP_BUDGET
+from models.startup_profiler import STAGES, best_of, check_budget, measure_startup, profile_import
+
+
+def load_budget(file_path=None):
+    """读取预算：默认使用config中的STARTUP_BUDGET，JSON文件中的项覆盖默认值"""
+    budget = {key: (dict(value) if isinstance(value, dict) else value) for key, value in STARTUP_BUDGET.items()}
+    if file_path:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            override = json.load(f)
+        budget.setdefault('imports_ms', {}).update(override.pop('imports_ms', {}))
+        budget.update(override)
+    return budget
+
+
+def print_import_profile(profile, top):
+    total = "失败" if profile['total_ms'] is None else f"{profile['total_ms']:.0f}ms"
+    print(f"\n== {profile['module']}: {total}")
+    if profile.get('error'):
+        print(f"   错误: {profile['error']}")
+    print(f"   {'耗时最多的模块':<48}{'自身(ms)':>10}{'累计(ms)':>10}")
+    for name, self_ms, cumulative_ms in profile['slowest'][:top]:
+        print(f"   {name:<48}{self_ms:>10.1f}{cumulative_ms:>10.1f}")
+    packages = ", ".join(f"{name} {ms:.0f}ms" for name, ms in list(profile['packages'].items())[:top])
+    print(f"   按顶层包: {packages}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="启动耗时分析与预算检查")
+    parser.add_argument('--repeat', type=int, default=3, help="每项重复次数（取最快一次）")
+    parser.add_argument('--budget', help="预算JSON文件（覆盖config中的STARTUP_BUDGET）")
+    parser.add_argument('--modules', nargs='*', help="要分析的模块（默认为预算中列出的模块）")
+    parser.add_argument('--top', type=int, default=8, help="每个模块列出的最慢子模块数")
+    parser.add_argument('--json', dest='json_path', help="把测量结果写入JSON文件")
+    parser.add_argument('--strict', action='store_true', help="无法测量的项也视为失败")
+    args = parser.parse_args()
+
+    budget = load_budget(args.budget)
+    modules = args.modules or list(budget.get('imports_ms', {}))
+
+    imports = []
+    for module in modules:
+        profile = best_of(lambda: profile_import(module, top=max(args.top, 10)), args.repeat, ['total_ms'])
+        imports.append(profile)
+        print_import_profile(profile, args.top)
+
+    startup = best_of(measure_startup, args.repeat, [f"{stage}_ms" for stage in STAGES])
+    print("\n== 启动耗时（含解释器启动）")
+    for stage in STAGES:
+        value = startup[f"{stage}_ms"]
+        limit = budget.get(f"{stage}_ms")
+        shown = "未到达" if value is None else f"{value:.0f}ms"
+        print(f"   {stage:<16}{shown:>10}" + (f"   预算 {limit}ms" if limit is not None else ""))
+    if startup.get('error'):
+        print(f"   错误: {startup['error']}")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({'imports': imports, 'startup': startup, 'budget': budget}, f, ensure_ascii=False, indent=2)
+
+    violations, unmeasured = check_budget(imports, startup, budget)
+    print()
+    for item in unmeasured:
+        print(f"无法测量 {item}")
+    for item in violations:
+        print(f"超出预算 {item}")
+    failed = bool(violations) or (args.strict and bool(unmeasured))
+    print("启动预算检查: " + ("未通过" if failed else "通过"))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
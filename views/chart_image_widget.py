@@ -0,0 +1,78 @@
+from PyQt6.QtWidgets import QLabel, QSizePolicy
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QPixmap
+
+
+class ChartImageWidget(QLabel):
+    """显示已渲染图表图片的控件，按宽度等比缩放；图片未加载或位图已释放时保持占位高度"""
+
+    def __init__(self, image_data: bytes = None, aspect: float = 0.6, parent=None):
+        """
+        Args:
+            image_data: PNG/JPEG图片数据，为空时先显示占位
+            aspect: 图片加载前占位使用的高宽比
+        """
+        super().__init__(parent)
+        self.pixmap_source = QPixmap()
+        self.image_data = None
+        self.aspect = aspect
+        self.natural_width = None
+        self.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
+        self.setMinimumWidth(200)
+        self.setStyleSheet("color: #95a5a6;")
+        if image_data:
+            self.set_image_data(image_data)
+        else:
+            self.setText("图表加载中...")
+
+    @property
+    def is_decoded(self):
+        """位图是否已解码"""
+        return not self.pixmap_source.isNull()
+
+    def set_image_data(self, image_data: bytes):
+        """设置PNG/JPEG图片数据并解码显示"""
+        self.image_data = image_data
+        self.pixmap_source = QPixmap()
+        self.decode()
+
+    def decode(self):
+        """从压缩的图片数据解码位图"""
+        if self.image_data is None or self.is_decoded:
+            return
+        self.pixmap_source.loadFromData(self.image_data)
+        if self.is_decoded:
+            self.natural_width = self.pixmap_source.width()
+            self.aspect = self.pixmap_source.height() / self.pixmap_source.width()
+            self.setText("")
+        self._update_scaled()
+
+    def release(self):
+        """释放解码后的位图，只保留压缩的图片数据（控件高度不变）"""
+        if not self.is_decoded:
+            return
+        self.pixmap_source = QPixmap()
+        self.clear()
+
+    def hasHeightForWidth(self):
+        return True
+
+    def heightForWidth(self, width):
+        if self.natural_width:
+            width = min(width, self.natural_width)
+        return int(width * self.aspect)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._update_scaled()
+
+    def _update_scaled(self):
+        """按当前宽度缩放图片（不放大超过原始尺寸），未解码时只更新占位高度"""
+        if not self.is_decoded:
+            self.setMinimumHeight(self.heightForWidth(self.width()))
+            return
+        width = min(self.width(), self.pixmap_source.width())
+        scaled = self.pixmap_source.scaledToWidth(max(width, 1), Qt.TransformationMode.SmoothTransformation)
+        self.setPixmap(scaled)
+        self.setMinimumHeight(scaled.height())
@@ -1,7 +1,6 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                              QPushButton, QTextEdit, QComboBox, QTabWidget,
-                             QTableWidget, QTableWidgetItem, QProgressBar,
-                             QMessageBox, QGroupBox, QGridLayout, QSplitter,
+                             QProgressBar, QMessageBox, QGroupBox, QGridLayout, QSplitter,
                              QScrollArea, QFrame)
 from PyQt6.QtCore import Qt, QThread, pyqtSignal
 from PyQt6.QtGui import QFont, QIcon
@@ -15,6 +14,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from models.data_analyzer import DataAnalyzer
 from models.ai_service import AIService
+from views.dataframe_model import DataFrameTableView
 
 class AnalysisWorker(QThread):
     """分析工作线程"""
@@ -238,7 +238,7 @@ class DataAnalysisView(QWidget):
         self.table_result_tab = QWidget()
         table_layout = QVBoxLayout()
         
-        self.result_table = QTableWidget()
+        self.result_table = DataFrameTableView()
         table_layout.addWidget(self.result_table)
         
         self.table_result_tab.setLayout(table_layout)
@@ -346,7 +346,7 @@ class DataAnalysisView(QWidget):
         """显示分析结果"""
         # 显示文本结果
         if analysis_type == "ai_analysis":
-            text_content = result.get("analysis", "无分析结果")
+            text_content = self.format_ai_analysis(result.get("record", {}))
         else:
             text_content = json.dumps(result, ensure_ascii=False, indent=2)
             
@@ -359,6 +359,19 @@ class DataAnalysisView(QWidget):
         # 切换到文本结果标签页
         self.tab_widget.setCurrentIndex(0)
         
+    def format_ai_analysis(self, record):
+        """按字段显示AI分析记录"""
+        sections = [("整体结论", "summary"), ("数据趋势", "trends"), ("用户行为", "user_behavior"),
+                    ("内容表现", "content_performance"), ("机会点", "opportunities"), ("挑战与风险", "risks")]
+        parts = []
+        for title, key in sections:
+            value = record.get(key)
+            if not value:
+                continue
+            body = value if isinstance(value, str) else "\n".join(f"- {item}" for item in value)
+            parts.append(f"【{title}】\n{body}")
+        return "\n\n".join(parts) or "无分析结果"
+        
     def display_table_result(self, result):
         """显示表格结果"""
         # 找到可以显示为表格的数据
@@ -369,21 +382,8 @@ class DataAnalysisView(QWidget):
                 break
                 
         if table_data is not None:
-            if isinstance(table_data, pd.Series):
-                df = pd.DataFrame(table_data)
-            else:
-                df = pd.DataFrame(table_data)
-                
-            self.result_table.setRowCount(len(df))
-            self.result_table.setColumnCount(len(df.columns))
-            self.result_table.setHorizontalHeaderLabels(df.columns)
-            
-            for i in range(len(df)):
-                for j in range(len(df.columns)):
-                    item = QTableWidgetItem(str(df.iloc[i, j]))
-                    self.result_table.setItem(i, j, item)
-                    
-            self.result_table.resizeColumnsToContents()
+            # 表格模型按需格式化可见的单元格，结果行数不受限制
+            self.result_table.set_dataframe(pd.DataFrame(table_data))
             
     def generate_chart(self):
         """生成图表"""
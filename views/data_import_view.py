@@ -1,13 +1,14 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                              QPushButton, QFileDialog, QTextEdit, QComboBox,
-                             QTableWidget, QTableWidgetItem, QProgressBar,
-                             QMessageBox, QGroupBox, QGridLayout, QSpinBox)
+                             QProgressBar, QMessageBox, QGroupBox, QGridLayout, QSpinBox)
 from PyQt6.QtCore import Qt, QThread, pyqtSignal
 from PyQt6.QtGui import QFont, QIcon
 import pandas as pd
 import os
 from datetime import datetime
 
+from views.dataframe_model import DataFrameTableView
+
 class DataImportView(QWidget):
     """数据导入界面"""
     
@@ -56,7 +57,7 @@ class DataImportView(QWidget):
         preview_group = QGroupBox("数据预览")
         preview_layout = QVBoxLayout()
         
-        self.preview_table = QTableWidget()
+        self.preview_table = DataFrameTableView()
         self.preview_table.setMaximumHeight(200)
         preview_layout.addWidget(self.preview_table)
         
@@ -172,21 +173,8 @@ class DataImportView(QWidget):
             QMessageBox.warning(self, "错误", f"文件预览失败: {str(e)}")
             
     def display_preview(self, data):
-        """显示数据预览"""
-        self.preview_table.setRowCount(min(len(data), 100))
-        self.preview_table.setColumnCount(len(data.columns))
-        
-        # 设置表头
-        self.preview_table.setHorizontalHeaderLabels(data.columns)
-        
-        # 填充数据
-        for i in range(min(len(data), 100)):
-            for j in range(len(data.columns)):
-                item = QTableWidgetItem(str(data.iloc[i, j]))
-                self.preview_table.setItem(i, j, item)
-                
-        # 调整列宽
-        self.preview_table.resizeColumnsToContents()
+        """显示数据预览（表格模型直接读取数据，只格式化可见的单元格，可预览全部数据）"""
+        self.preview_table.set_dataframe(data)
         
     def import_data(self):
         """导入数据"""
@@ -258,8 +246,7 @@ class DataImportView(QWidget):
         """清空数据"""
         self.data = None
         self.file_path_label.setText("未选择文件")
-        self.preview_table.setRowCount(0)
-        self.preview_table.setColumnCount(0)
+        self.preview_table.set_dataframe(None)
         self.import_btn.setEnabled(False)
         
     def go_back(self):
@@ -0,0 +1,147 @@
+import numpy as np
+import pandas as pd
+from PyQt6.QtWidgets import QTableView, QHeaderView
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+# 单元格最多显示的字符数（完整内容在提示中显示）
+MAX_DISPLAY_CHARS = 200
+MAX_TOOLTIP_CHARS = 2000
+
+
+def _format_float(value):
+    return "" if value != value else str(value)
+
+
+def _format_datetime(value):
+    return "" if np.isnat(value) else str(pd.Timestamp(value))
+
+
+def _format_timedelta(value):
+    return "" if np.isnat(value) else str(pd.Timedelta(value))
+
+
+def _format_object(value):
+    if value is None or (isinstance(value, float) and value != value) or value is pd.NaT:
+        return ""
+    return str(value)
+
+
+# 按列的dtype选择格式化函数
+_FORMATTERS = {'f': _format_float, 'c': str, 'i': str, 'u': str, 'b': str,
+               'M': _format_datetime, 'm': _format_timedelta}
+
+
+class DataFrameModel(QAbstractTableModel):
+    """
+    直接读取DataFrame各列numpy数组的表格模型
+
+    只在视图请求时格式化可见的单元格，不为每个单元格创建对象，百万行数据也能立即显示；
+    排序只重排行号数组，不复制数据
+    """
+
+    def __init__(self, df: pd.DataFrame = None, parent=None):
+        super().__init__(parent)
+        self.columns = []
+        self.headers = []
+        self.formatters = []
+        self.numeric = []
+        self.row_count = 0
+        self.order = None
+        if df is not None:
+            self.set_dataframe(df)
+
+    def set_dataframe(self, df: pd.DataFrame = None):
+        """替换显示的数据（为空时清空表格），恢复原始行顺序"""
+        self.beginResetModel()
+        if df is None:
+            df = pd.DataFrame()
+        # 按列取出numpy数组：数值列不复制，文本列只引用原有对象
+        self.columns = [df.iloc[:, j].to_numpy() for j in range(df.shape[1])]
+        self.headers = [str(column) for column in df.columns]
+        self.formatters = [_FORMATTERS.get(values.dtype.kind, _format_object) for values in self.columns]
+        self.numeric = [values.dtype.kind in 'iufc' for values in self.columns]
+        self.row_count = len(df)
+        self.order = None
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def _row(self, row: int) -> int:
+        """视图中的行对应的数据行"""
+        return row if self.order is None else int(self.order[row])
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            text = self.formatters[column](self.columns[column][self._row(index.row())])
+            return text if len(text) <= MAX_DISPLAY_CHARS else text[:MAX_DISPLAY_CHARS] + "…"
+        if role == Qt.ItemDataRole.ToolTipRole:
+            text = self.formatters[column](self.columns[column][self._row(index.row())])
+            return text[:MAX_TOOLTIP_CHARS] if len(text) > MAX_DISPLAY_CHARS else None
+        if role == Qt.ItemDataRole.TextAlignmentRole and self.numeric[column]:
+            return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.headers[section] if section < len(self.headers) else None
+        # 行号显示数据中的原始行号，排序后仍可对应
+        return str(self._row(section) + 1)
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        """按列排序（稳定排序，空值排在最后），column为-1时恢复原始顺序"""
+        if column < 0 or column >= len(self.columns):
+            new_order = None
+        else:
+            ascending = order == Qt.SortOrder.AscendingOrder
+            values = pd.Series(self.columns[column], copy=False)
+            try:
+                sorted_values = values.sort_values(ascending=ascending, kind='stable', na_position='last')
+            except TypeError:
+                # 混合类型的列按文本排序
+                sorted_values = values.astype(str).where(values.notna()).sort_values(
+                    ascending=ascending, kind='stable', na_position='last')
+            new_order = sorted_values.index.to_numpy()
+
+        self.layoutAboutToBeChanged.emit()
+        # 选中的单元格等持久索引跟随数据行移动
+        persistent = self.persistentIndexList()
+        data_rows = [self._row(index.row()) for index in persistent]
+        self.order = new_order
+        if persistent:
+            positions = np.arange(self.row_count)
+            if new_order is not None:
+                positions[new_order] = np.arange(self.row_count)
+            self.changePersistentIndexList(
+                persistent, [self.index(int(positions[row]), index.column()) for row, index in zip(data_rows, persistent)])
+        self.layoutChanged.emit()
+
+
+class DataFrameTableView(QTableView):
+    """显示DataFrame的表格视图（固定行高，点击表头排序）"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.dataframe_model = DataFrameModel(parent=self)
+        self.setModel(self.dataframe_model)
+        self.setSortingEnabled(True)
+        self.setAlternatingRowColors(True)
+        # 固定行高，行数很多时不需要逐行计算高度
+        vertical_header = self.verticalHeader()
+        vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical_header.setDefaultSectionSize(self.fontMetrics().height() + 8)
+        self.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+
+    def set_dataframe(self, df: pd.DataFrame = None):
+        """显示数据并按可见行调整列宽"""
+        self.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.dataframe_model.set_dataframe(df)
+        self.resizeColumnsToContents()
@@ -0,0 +1,139 @@
+import queue
+
+from PyQt6.QtWidgets import QScrollArea
+from PyQt6.QtCore import QObject, QThread, QTimer, QEvent, QPoint, pyqtSignal
+
+
+class ChartRenderWorker(QThread):
+    """在后台按顺序渲染图表（render需在绘图时持有chart_backend.draw_lock，与主线程的仪表盘重绘互斥）"""
+    chart_ready = pyqtSignal(int, object, str)
+
+    def __init__(self, render, parent=None):
+        """
+        Args:
+            render: 渲染函数 render(builder, *args) -> 图片字节
+        """
+        super().__init__(parent)
+        self.render = render
+        self.jobs = queue.Queue()
+
+    def submit(self, token, builder, args):
+        """提交渲染任务"""
+        self.jobs.put((token, builder, args))
+
+    def cancel_pending(self):
+        """丢弃尚未开始的任务"""
+        try:
+            while True:
+                self.jobs.get_nowait()
+        except queue.Empty:
+            pass
+
+    def stop(self):
+        """结束线程"""
+        self.cancel_pending()
+        self.jobs.put(None)
+        self.wait()
+
+    def run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            token, builder, args = job
+            try:
+                data = self.render(builder, *args)
+                error = "" if data is not None else "无可用数据"
+            except Exception as e:
+                data, error = None, str(e)
+            self.chart_ready.emit(token, data, error)
+
+
+class LazyChartLoader(QObject):
+    """滚动区域中的图表按可见性加载：进入视口附近才渲染，远离视口后释放位图"""
+
+    def __init__(self, scroll_area: QScrollArea, render, prefetch: float = 0.5,
+                 release_distance: float = 2.0, parent=None):
+        """
+        Args:
+            scroll_area: 图表所在的滚动区域
+            render: 渲染函数 render(builder, *args) -> 图片字节
+            prefetch: 视口上下预加载的距离（视口高度的倍数）
+            release_distance: 超出视口多远后释放位图（视口高度的倍数）
+        """
+        super().__init__(parent)
+        self.scroll_area = scroll_area
+        self.prefetch = prefetch
+        self.release_distance = release_distance
+        self.charts = {}
+        self.requested = set()
+        self.next_token = 0
+
+        self.worker = ChartRenderWorker(render)
+        self.worker.chart_ready.connect(self._on_chart_ready)
+        self.worker.start()
+
+        # 滚动和缩放事件合并处理
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(30)
+        self.timer.timeout.connect(self.update_visibility)
+
+        scroll_area.verticalScrollBar().valueChanged.connect(self.schedule_update)
+        scroll_area.viewport().installEventFilter(self)
+
+    def add_chart(self, widget, builder, args):
+        """登记一个待加载的图表控件"""
+        self.charts[self.next_token] = (widget, builder, args)
+        self.next_token += 1
+        self.schedule_update()
+
+    def reset(self):
+        """移除所有已登记的图表（控件由调用方销毁），丢弃未开始的渲染"""
+        self.worker.cancel_pending()
+        self.charts.clear()
+        self.requested.clear()
+
+    def close(self):
+        """停止后台渲染线程"""
+        self.reset()
+        self.worker.stop()
+
+    def schedule_update(self, *args):
+        self.timer.start()
+
+    def eventFilter(self, obj, event):
+        if event.type() in (QEvent.Type.Resize, QEvent.Type.Show):
+            self.schedule_update()
+        return False
+
+    def update_visibility(self):
+        """渲染或解码视口附近的图表，释放远离视口的位图"""
+        viewport = self.scroll_area.viewport()
+        height = viewport.height()
+        load_top, load_bottom = -self.prefetch * height, (1 + self.prefetch) * height
+        keep_top, keep_bottom = -self.release_distance * height, (1 + self.release_distance) * height
+
+        for token, (widget, builder, args) in self.charts.items():
+            top = widget.mapTo(viewport, QPoint(0, 0)).y()
+            bottom = top + widget.height()
+            if bottom >= load_top and top <= load_bottom:
+                if widget.image_data is not None:
+                    widget.decode()
+                elif token not in self.requested:
+                    self.requested.add(token)
+                    self.worker.submit(token, builder, args)
+            elif bottom < keep_top or top > keep_bottom:
+                widget.release()
+
+    def _on_chart_ready(self, token, data, error):
+        entry = self.charts.get(token)
+        if entry is None:
+            return
+        widget = entry[0]
+        if data is None:
+            widget.setText(f"图表生成失败: {error}")
+            return
+        widget.set_image_data(data)
+        # 图片高度可能与占位不同，重新检查可见性
+        self.schedule_update()
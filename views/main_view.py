@@ -10,7 +10,7 @@ from PyQt6.QtGui import QFont, QIcon, QAction
 import matplotlib.pyplot as plt
 import matplotlib
 matplotlib.use('qtagg')
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from models.chart_backend import canvas_class
 import numpy as np
 import json
 import datetime
@@ -794,7 +794,8 @@ class MainView(QMainWindow):
     def create_chart(self):
         """创建图表画布"""
         fig, ax = plt.subplots(figsize=(5, 4))
-        canvas = FigureCanvas(fig)
+        # 重绘时持有绘图锁，与后台线程的图表渲染互斥
+        canvas = canvas_class()(fig)
         return canvas
         
     def update_data_source_options(self, index):
@@ -13,6 +13,9 @@ class ReportManagementView(QWidget):
     report_generated_signal = pyqtSignal(dict)
     report_exported_signal = pyqtSignal(str)
     
+    # AI成本表格的列（与MainController.get_token_cost_summary的字段一致）
+    COST_COLUMNS = ["任务", "调用次数", "输入tokens", "输出tokens", "总tokens", "估算费用(元)"]
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.reports = []
@@ -245,6 +248,20 @@ class ReportManagementView(QWidget):
         
         self.tab_widget.addTab(self.stats_tab, "报告统计")
         
+        # AI成本标签页（按分析任务汇总token用量和估算费用）
+        self.cost_tab = QWidget()
+        cost_layout = QVBoxLayout(self.cost_tab)
+        
+        self.cost_table = QTableWidget()
+        self.cost_table.setColumnCount(len(self.COST_COLUMNS))
+        self.cost_table.setHorizontalHeaderLabels(self.COST_COLUMNS)
+        cost_layout.addWidget(self.cost_table)
+        
+        self.cost_total_label = QLabel("暂无AI调用记录")
+        cost_layout.addWidget(self.cost_total_label)
+        
+        self.tab_widget.addTab(self.cost_tab, "AI成本")
+        
         layout.addWidget(self.tab_widget)
         
         panel.setLayout(layout)
@@ -374,6 +391,21 @@ class ReportManagementView(QWidget):
             self.reports_table.setItem(i, 4, QTableWidgetItem(report['size']))
             self.reports_table.setItem(i, 5, QTableWidgetItem(report['status']))
             
+    def set_token_costs(self, costs):
+        """显示按任务汇总的AI token用量和估算费用"""
+        self.cost_table.setRowCount(len(costs))
+        for i, cost in enumerate(costs):
+            for j, column in enumerate(self.COST_COLUMNS):
+                self.cost_table.setItem(i, j, QTableWidgetItem(str(cost[column])))
+        self.cost_table.resizeColumnsToContents()
+        
+        if costs:
+            total_tokens = sum(cost["总tokens"] for cost in costs)
+            total_cost = sum(cost["估算费用(元)"] for cost in costs)
+            self.cost_total_label.setText(f"合计: {total_tokens} tokens，估算费用 {total_cost:.4f} 元")
+        else:
+            self.cost_total_label.setText("暂无AI调用记录")
+            
     def load_report(self, item):
         """加载报告"""
         row = item.row()